@@ -1,13 +1,17 @@
 import os
 from typing import Optional, List
 from contextlib import contextmanager
-from sqlalchemy import create_engine, text, MetaData
+from sqlalchemy import create_engine, text, MetaData, inspect
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Engines compartidos por proceso: todas las instancias de DatabaseConnection con la
+# misma URL reutilizan un solo engine y su pool, en lugar de abrir conexiones nuevas
+_ENGINES = {}
+
 
 class DatabaseConnection:
     def __init__(self):
@@ -25,11 +29,29 @@ class DatabaseConnection:
         
     def init_engine(self, echo: bool = False):
         if not self.engine:
-            self.engine = create_engine(
-                self.connection_string,
-                echo=echo,
-                poolclass=NullPool
-            )
+            key = (self.connection_string, echo)
+            if key not in _ENGINES:
+                _ENGINES[key] = create_engine(
+                    self.connection_string,
+                    echo=echo,
+                    # Pool dimensionado para los scripts ETL concurrentes; pre_ping
+                    # descarta conexiones caídas y recycle evita timeouts del servidor
+                    poolclass=QueuePool,
+                    pool_size=20,
+                    max_overflow=10,
+                    pool_pre_ping=True,
+                    pool_recycle=3600,
+                    # Agrupar executemany en INSERT ... VALUES multi-fila y lotes de psycopg2.
+                    # En SQLAlchemy 2.x el tamaño de página de los VALUES es
+                    # insertmanyvalues_page_size (antes executemany_values_page_size).
+                    # psycopg2 no tiene sentencias preparadas del lado del servidor
+                    # (prepare_threshold es de psycopg 3), así que no hay caché de
+                    # planes que configurar aunque el pool reutilice conexiones.
+                    executemany_mode="values_plus_batch",
+                    insertmanyvalues_page_size=10_000,
+                    executemany_batch_page_size=500
+                )
+            self.engine = _ENGINES[key]
             self.SessionLocal = sessionmaker(
                 autocommit=False,
                 autoflush=False,
@@ -84,15 +106,15 @@ class DatabaseConnection:
         if not self.engine:
             self.init_engine()
         
-        with self.engine.connect() as conn:
+        # Un solo DDL multi-sentencia en una transacción: un viaje al servidor
+        ddl = '; '.join(f'CREATE SCHEMA IF NOT EXISTS "{schema}"' for schema in schemas)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text(ddl))
             for schema in schemas:
-                try:
-                    conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema}"'))
-                    conn.commit()
-                    print(f"✓ Schema '{schema}' creado o ya existe")
-                except Exception as e:
-                    print(f"✗ Error creando schema '{schema}': {str(e)}")
-                    conn.rollback()
+                print(f"✓ Schema '{schema}' creado o ya existe")
+        except Exception as e:
+            print(f"✗ Error creando schemas {schemas}: {str(e)}")
     
     def create_all_tables(self, base):
         """Create all tables from SQLAlchemy models."""
@@ -102,9 +124,27 @@ class DatabaseConnection:
         # Primero crear los schemas
         self.create_schemas()
         
-        # Luego crear las tablas
-        base.metadata.create_all(bind=self.engine)
-        print("✓ Todas las tablas han sido creadas")
+        # Luego crear las tablas. Las tablas de cada schema se listan una sola vez y
+        # solo se pasan a create_all las que faltan
+        inspector = inspect(self.engine)
+        schemas = {table.schema for table in base.metadata.sorted_tables}
+        existing = {
+            (schema, name)
+            for schema in schemas
+            for name in inspector.get_table_names(schema=schema)
+        }
+        missing = [
+            table for table in base.metadata.sorted_tables
+            if (table.schema, table.name) not in existing
+        ]
+        if not missing:
+            # Arranque en caliente: el schema ya está completo, no se emite DDL
+            print("✓ Todas las tablas ya existen")
+            return
+        # checkfirst sigue activo: además de las tablas cubre los tipos ENUM e índices
+        # asociados, que pueden existir aunque su tabla no (p. ej. tras un DROP TABLE)
+        base.metadata.create_all(bind=self.engine, tables=missing, checkfirst=True)
+        print(f"✓ Todas las tablas han sido creadas ({len(missing)} nuevas)")
     
     def get_table_info(self, schema: str = None):
         """Get information about tables in a specific schema or all schemas."""
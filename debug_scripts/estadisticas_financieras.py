@@ -1,269 +1,365 @@
 #!/usr/bin/env python3
-"""Analyze financial statistics for semillas and fertilizantes."""
+"""Analyze financial statistics for semillas and fertilizantes.
+
+Las secciones se leen de la vista materializada analytics.mv_fin_stats, que se
+crea y refresca con scripts/create_mv_fin_stats.py después de cada carga. Si la
+vista no existe, las mismas consultas se ejecutan en vivo.
+"""
 
 import sys
 import os
+import io
+import contextlib
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
 from config.connections.database import db_connection
 import pandas as pd
 
+MV_NAME = 'analytics.mv_fin_stats'
+
+# Cada sección produce filas (section, sort_key, fila JSON): la vista es su
+# UNION ALL y el reporte las ejecuta en vivo cuando la vista no existe
+# 1. Resumen general por tipo de beneficio
+SECTION_1_SQL = """
+    SELECT 1 AS section, ROW_NUMBER() OVER (ORDER BY s.tipo_beneficio) AS sort_key, TO_JSON(s) AS fila
+    FROM (
+        SELECT
+            UPPER(tipo_beneficio) as tipo_beneficio,
+            COUNT(*) as total_beneficios,
+            COUNT(DISTINCT persona_id) as total_beneficiarios,
+            SUM(valor_monetario) as valor_total,
+            AVG(valor_monetario) as valor_promedio,
+            MIN(valor_monetario) as valor_minimo,
+            MAX(valor_monetario) as valor_maximo
+        FROM operational.beneficio_base
+        WHERE tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
+        GROUP BY UPPER(tipo_beneficio)
+    ) s
+"""
+
+# 2. Distribución por tipo de cultivo (una sola pasada sobre beneficio_base)
+SECTION_2_SQL = """
+    SELECT 2 AS section, ROW_NUMBER() OVER (ORDER BY s.tipo_beneficio, s.valor_total DESC) AS sort_key, TO_JSON(s) AS fila
+    FROM (
+        WITH spec AS (
+            SELECT id, tipo_cultivo, 'SEMILLAS' as tipo_beneficio, 'SEMILLAS' as tipo_origen
+            FROM operational.beneficio_semillas
+            UNION ALL
+            SELECT id, tipo_cultivo, 'FERTILIZANTES' as tipo_beneficio, 'fertilizantes' as tipo_origen
+            FROM operational.beneficio_fertilizantes
+        )
+        SELECT
+            spec.tipo_beneficio,
+            spec.tipo_cultivo,
+            COUNT(*) as total_beneficios,
+            COUNT(DISTINCT bb.persona_id) as total_beneficiarios,
+            SUM(bb.valor_monetario) as valor_total,
+            AVG(bb.valor_monetario) as valor_promedio,
+            SUM(bb.hectarias_beneficiadas) as total_hectarias
+        FROM operational.beneficio_base bb
+        JOIN spec ON bb.id = spec.id AND bb.tipo_beneficio = spec.tipo_origen
+        WHERE bb.tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
+        AND spec.tipo_cultivo IS NOT NULL
+        GROUP BY spec.tipo_beneficio, spec.tipo_cultivo
+    ) s
+"""
+
+# 3. Top beneficiarios por valor total recibido
+# Se agrega y recorta a 10 por persona_id antes de unir con persona_base, así el
+# JOIN solo toca las 10 personas sobrevivientes. El EXISTS descarta antes del
+# LIMIT a las personas sin fila en persona_base, que el JOIN eliminaría después
+# dejando la sección con menos de 10 filas.
+SECTION_3_SQL = """
+    SELECT 3 AS section, ROW_NUMBER() OVER (ORDER BY s.valor_total_recibido DESC) AS sort_key, TO_JSON(s) AS fila
+    FROM (
+        SELECT
+            p.cedula,
+            p.nombres_apellidos,
+            agg.total_beneficios,
+            agg.valor_total_recibido,
+            agg.valor_promedio,
+            agg.tipos_beneficio
+        FROM (
+            SELECT
+                persona_id,
+                COUNT(*) as total_beneficios,
+                SUM(valor_monetario) as valor_total_recibido,
+                AVG(valor_monetario) as valor_promedio,
+                STRING_AGG(DISTINCT tipo_beneficio, ', ') as tipos_beneficio
+            FROM operational.beneficio_base bb
+            WHERE tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
+            AND EXISTS (SELECT 1 FROM operational.persona_base p WHERE p.id = bb.persona_id)
+            GROUP BY persona_id
+            ORDER BY valor_total_recibido DESC
+            LIMIT 10
+        ) agg
+        JOIN operational.persona_base p ON p.id = agg.persona_id
+    ) s
+"""
+
+# 4. Distribución geográfica
+SECTION_4_SQL = """
+    SELECT 4 AS section, ROW_NUMBER() OVER (ORDER BY s.valor_total DESC) AS sort_key, TO_JSON(s) AS fila
+    FROM (
+        SELECT
+            u.canton,
+            COUNT(*) as total_beneficios,
+            COUNT(DISTINCT bb.persona_id) as total_beneficiarios,
+            SUM(bb.valor_monetario) as valor_total,
+            AVG(bb.valor_monetario) as valor_promedio,
+            SUM(bb.hectarias_beneficiadas) as total_hectarias
+        FROM operational.beneficio_base bb
+        JOIN operational.ubicacion u ON bb.ubicacion_id = u.id
+        WHERE bb.tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
+        GROUP BY u.canton
+        ORDER BY valor_total DESC
+        LIMIT 15
+    ) s
+"""
+
+# 5. Estadísticas por hectáreas
+SECTION_5_SQL = """
+    SELECT 5 AS section, ROW_NUMBER() OVER (ORDER BY s.tipo_beneficio) AS sort_key, TO_JSON(s) AS fila
+    FROM (
+        SELECT
+            UPPER(tipo_beneficio) as tipo_beneficio,
+            COUNT(*) as total_registros,
+            COUNT(hectarias_beneficiadas) as registros_con_hectarias,
+            SUM(hectarias_beneficiadas) as total_hectarias,
+            AVG(hectarias_beneficiadas) as promedio_hectarias,
+            MIN(hectarias_beneficiadas) as min_hectarias,
+            MAX(hectarias_beneficiadas) as max_hectarias,
+            SUM(valor_monetario) / NULLIF(SUM(hectarias_beneficiadas), 0) as valor_por_hectarea
+        FROM operational.beneficio_base
+        WHERE tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
+        GROUP BY UPPER(tipo_beneficio)
+    ) s
+"""
+
+# 6. Organizaciones con mayor inversión (una sola pasada sobre beneficio_base)
+SECTION_6_SQL = """
+    SELECT 6 AS section, ROW_NUMBER() OVER (ORDER BY s.valor_total_invertido DESC) AS sort_key, TO_JSON(s) AS fila
+    FROM (
+        WITH beneficiarios AS (
+            SELECT persona_id, organizacion_id, 'SEMILLAS' as tipo_origen
+            FROM operational.beneficiario_semillas
+            UNION ALL
+            SELECT persona_id, organizacion_id, 'fertilizantes' as tipo_origen
+            FROM operational.beneficiario_fertilizantes
+        ),
+        org_stats AS (
+            SELECT
+                o.nombre as organizacion,
+                ben.tipo_origen,
+                COUNT(DISTINCT bb.persona_id) as total_beneficiarios,
+                COUNT(*) as total_beneficios,
+                SUM(bb.valor_monetario) as valor_total
+            FROM operational.beneficio_base bb
+            JOIN beneficiarios ben ON bb.persona_id = ben.persona_id AND bb.tipo_beneficio = ben.tipo_origen
+            JOIN operational.organizacion o ON ben.organizacion_id = o.id
+            WHERE bb.tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
+            GROUP BY o.id, o.nombre, ben.tipo_origen
+        )
+        SELECT
+            organizacion,
+            SUM(total_beneficiarios) as total_beneficiarios,
+            SUM(total_beneficios) as total_beneficios,
+            SUM(valor_total) as valor_total_invertido,
+            SUM(valor_total) / NULLIF(SUM(total_beneficiarios), 0) as promedio_por_beneficiario
+        FROM org_stats
+        WHERE organizacion IS NOT NULL
+        GROUP BY organizacion
+        ORDER BY valor_total_invertido DESC
+        LIMIT 10
+    ) s
+"""
+
+# 7. Resumen ejecutivo
+# Las organizaciones se cuentan aparte sobre la unión de las dos tablas de
+# beneficiarios (con EXISTS para exigir al menos un beneficio), en lugar de hacer
+# LEFT JOIN a ambas, que multiplica las filas de beneficio_base antes del
+# COUNT DISTINCT.
+SECTION_7_SQL = """
+    SELECT 7 AS section, 1::bigint AS sort_key, TO_JSON(s) AS fila
+    FROM (
+        SELECT
+            COUNT(DISTINCT bb.persona_id) as beneficiarios_totales,
+            COUNT(*) as beneficios_totales,
+            SUM(bb.valor_monetario) as inversion_total,
+            AVG(bb.valor_monetario) as promedio_por_beneficio,
+            COUNT(DISTINCT bb.ubicacion_id) as ubicaciones_atendidas,
+            (
+                SELECT COUNT(DISTINCT organizacion_id)
+                FROM (
+                    SELECT organizacion_id FROM operational.beneficiario_semillas
+                    UNION
+                    SELECT organizacion_id FROM operational.beneficiario_fertilizantes
+                ) u
+                WHERE EXISTS (
+                    SELECT 1
+                    FROM operational.beneficiario_semillas bs
+                    JOIN operational.beneficio_base b ON b.persona_id = bs.persona_id
+                    WHERE bs.organizacion_id = u.organizacion_id
+                    AND b.tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
+                    UNION ALL
+                    SELECT 1
+                    FROM operational.beneficiario_fertilizantes bf
+                    JOIN operational.beneficio_base b ON b.persona_id = bf.persona_id
+                    WHERE bf.organizacion_id = u.organizacion_id
+                    AND b.tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
+                )
+            ) as organizaciones_participantes
+        FROM operational.beneficio_base bb
+        WHERE bb.tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
+    ) s
+"""
+
+SECTIONS_SQL = (
+    SECTION_1_SQL, SECTION_2_SQL, SECTION_3_SQL, SECTION_4_SQL,
+    SECTION_5_SQL, SECTION_6_SQL, SECTION_7_SQL,
+)
+
+MV_EXISTS_QUERY = text("""
+    SELECT EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'analytics' AND matviewname = 'mv_fin_stats'
+    )
+""")
+
+SECTION_QUERY = text(f"""
+    SELECT fila
+    FROM {MV_NAME}
+    WHERE section = :section
+    ORDER BY sort_key
+""")
+
+# Consultas cortas sobre tablas pequeñas: el JIT de PostgreSQL cuesta más de lo que ahorra
+DISABLE_JIT = text("SET LOCAL jit = off")
+
+_CUR_FMT = "${:,.2f}".format
+_NUM_FMT = "{:,.2f}".format
+
 def format_currency(value):
     """Format currency values with proper formatting."""
-    if pd.isna(value):
+    # value != value solo es cierto para NaN
+    if value is None or value != value:
         return "N/A"
-    return f"${value:,.2f}"
+    return _CUR_FMT(value)
+
+def format_number_series(series, fmt=_NUM_FMT):
+    """Format a numeric column in one pass, using "N/A" for missing values."""
+    return series.map(fmt, na_action='ignore').fillna("N/A")
+
+def fetch_section(conn, section, from_mv=True):
+    """Read the rows of one report section as a DataFrame, precomputed or live."""
+    if from_mv:
+        filas = conn.execute(SECTION_QUERY, {"section": section}).scalars().all()
+    else:
+        live = text(f"SELECT fila FROM ({SECTIONS_SQL[section - 1]}) s ORDER BY sort_key")
+        filas = conn.execute(live).scalars().all()
+    return pd.DataFrame(filas)
+
+def format_section_1(df):
+    """1. Resumen general por tipo de beneficio."""
+    # Format currency columns
+    currency_cols = ['valor_total', 'valor_promedio', 'valor_minimo', 'valor_maximo']
+    for col in currency_cols:
+        df[col] = df[col].apply(format_currency)
+
+    return df.to_string(index=False)
+
+def format_section_2(df):
+    """2. Distribución por tipo de cultivo."""
+    # Format currency and numeric columns
+    df['valor_total'] = df['valor_total'].apply(format_currency)
+    df['valor_promedio'] = df['valor_promedio'].apply(format_currency)
+    df['total_hectarias'] = format_number_series(df['total_hectarias'])
+
+    return df.to_string(index=False)
+
+def format_section_3(df):
+    """3. Top beneficiarios por valor total recibido."""
+    df['valor_total_recibido'] = df['valor_total_recibido'].apply(format_currency)
+    df['valor_promedio'] = df['valor_promedio'].apply(format_currency)
+
+    return df.to_string(index=False)
+
+def format_section_4(df):
+    """4. Distribución geográfica."""
+    df['valor_total'] = df['valor_total'].apply(format_currency)
+    df['valor_promedio'] = df['valor_promedio'].apply(format_currency)
+    df['total_hectarias'] = format_number_series(df['total_hectarias'])
+
+    return df.to_string(index=False)
+
+def format_section_5(df):
+    """5. Estadísticas por hectáreas."""
+    # Format numeric columns
+    numeric_cols = ['total_hectarias', 'promedio_hectarias', 'min_hectarias', 'max_hectarias']
+    for col in numeric_cols:
+        df[col] = format_number_series(df[col])
+    df['valor_por_hectarea'] = format_number_series(df['valor_por_hectarea'], _CUR_FMT)
+
+    return df.to_string(index=False)
+
+def format_section_6(df):
+    """6. Organizaciones con mayor inversión."""
+    df['valor_total_invertido'] = df['valor_total_invertido'].apply(format_currency)
+    df['promedio_por_beneficiario'] = df['promedio_por_beneficiario'].apply(format_currency)
+
+    return df.to_string(index=False)
+
+def format_section_7(df):
+    """7. Resumen ejecutivo."""
+    row = df.iloc[0]
+
+    lineas = [
+        f"Beneficiarios totales: {row['beneficiarios_totales']:,}",
+        f"Beneficios entregados: {row['beneficios_totales']:,}",
+        f"Inversión total: {format_currency(row['inversion_total'])}",
+        f"Promedio por beneficio: {format_currency(row['promedio_por_beneficio'])}",
+        f"Ubicaciones atendidas: {row['ubicaciones_atendidas']:,}",
+        f"Organizaciones participantes: {row['organizaciones_participantes']:,}",
+    ]
+    return "\n".join(lineas)
+
+# (número de sección, título, formateador, mensaje si la sección no tiene filas)
+SECTIONS = (
+    (1, "1. RESUMEN GENERAL POR TIPO DE BENEFICIO", format_section_1, "No hay datos disponibles"),
+    (2, "2. DISTRIBUCIÓN POR TIPO DE CULTIVO", format_section_2, "No hay datos disponibles"),
+    (3, "3. TOP 10 BENEFICIARIOS CON MAYOR INVERSIÓN TOTAL", format_section_3, "No hay datos disponibles"),
+    (4, "4. DISTRIBUCIÓN GEOGRÁFICA POR CANTÓN (TOP 15)", format_section_4, "No hay datos disponibles"),
+    (5, "5. ANÁLISIS POR HECTÁREAS BENEFICIADAS", format_section_5, "No hay datos disponibles"),
+    (6, "6. ORGANIZACIONES CON MAYOR INVERSIÓN", format_section_6, "No hay datos de organizaciones disponibles"),
+    (7, "7. RESUMEN EJECUTIVO", format_section_7, "No hay datos disponibles"),
+)
 
 def get_financial_statistics():
     """Get financial statistics from operational and analytical data."""
     if not db_connection.engine:
         db_connection.init_engine()
     engine = db_connection.engine
-    
+
     with engine.connect() as conn:
+        conn.execute(DISABLE_JIT)
+        from_mv = conn.execute(MV_EXISTS_QUERY).scalar()
+
         print("\n" + "="*80)
         print("ESTADÍSTICAS FINANCIERAS - SEMILLAS Y FERTILIZANTES")
         print("="*80)
-        
-        # 1. Resumen general por tipo de beneficio
-        print("\n1. RESUMEN GENERAL POR TIPO DE BENEFICIO")
-        print("-" * 80)
-        query = text("""
-            SELECT 
-                UPPER(tipo_beneficio) as tipo_beneficio,
-                COUNT(*) as total_beneficios,
-                COUNT(DISTINCT persona_id) as total_beneficiarios,
-                SUM(valor_monetario) as valor_total,
-                AVG(valor_monetario) as valor_promedio,
-                MIN(valor_monetario) as valor_minimo,
-                MAX(valor_monetario) as valor_maximo
-            FROM operational.beneficio_base
-            WHERE tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
-            GROUP BY UPPER(tipo_beneficio)
-            ORDER BY tipo_beneficio;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        
-        # Format currency columns
-        currency_cols = ['valor_total', 'valor_promedio', 'valor_minimo', 'valor_maximo']
-        for col in currency_cols:
-            df[col] = df[col].apply(format_currency)
-        
-        print(df.to_string(index=False))
-        
-        # 2. Distribución por tipo de cultivo
-        print("\n2. DISTRIBUCIÓN POR TIPO DE CULTIVO")
-        print("-" * 80)
-        query = text("""
-            WITH cultivo_stats AS (
-                SELECT 
-                    'SEMILLAS' as tipo_beneficio,
-                    bs.tipo_cultivo,
-                    COUNT(*) as total_beneficios,
-                    COUNT(DISTINCT bb.persona_id) as total_beneficiarios,
-                    SUM(bb.valor_monetario) as valor_total,
-                    AVG(bb.valor_monetario) as valor_promedio,
-                    SUM(bb.hectarias_beneficiadas) as total_hectarias
-                FROM operational.beneficio_base bb
-                JOIN operational.beneficio_semillas bs ON bb.id = bs.id
-                WHERE bb.tipo_beneficio = 'SEMILLAS'
-                AND bs.tipo_cultivo IS NOT NULL
-                GROUP BY bs.tipo_cultivo
-                
-                UNION ALL
-                
-                SELECT 
-                    'FERTILIZANTES' as tipo_beneficio,
-                    bf.tipo_cultivo,
-                    COUNT(*) as total_beneficios,
-                    COUNT(DISTINCT bb.persona_id) as total_beneficiarios,
-                    SUM(bb.valor_monetario) as valor_total,
-                    AVG(bb.valor_monetario) as valor_promedio,
-                    SUM(bb.hectarias_beneficiadas) as total_hectarias
-                FROM operational.beneficio_base bb
-                JOIN operational.beneficio_fertilizantes bf ON bb.id = bf.id
-                WHERE bb.tipo_beneficio = 'fertilizantes'
-                AND bf.tipo_cultivo IS NOT NULL
-                GROUP BY bf.tipo_cultivo
-            )
-            SELECT * FROM cultivo_stats
-            ORDER BY tipo_beneficio, valor_total DESC;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        
-        # Format currency and numeric columns
-        df['valor_total'] = df['valor_total'].apply(format_currency)
-        df['valor_promedio'] = df['valor_promedio'].apply(format_currency)
-        df['total_hectarias'] = df['total_hectarias'].apply(lambda x: f"{x:,.2f}" if pd.notna(x) else "N/A")
-        
-        print(df.to_string(index=False))
-        
-        # 3. Top beneficiarios por valor total recibido
-        print("\n3. TOP 10 BENEFICIARIOS CON MAYOR INVERSIÓN TOTAL")
-        print("-" * 80)
-        query = text("""
-            SELECT 
-                p.cedula,
-                p.nombres_apellidos,
-                COUNT(*) as total_beneficios,
-                SUM(bb.valor_monetario) as valor_total_recibido,
-                AVG(bb.valor_monetario) as valor_promedio,
-                STRING_AGG(DISTINCT bb.tipo_beneficio, ', ') as tipos_beneficio
-            FROM operational.beneficio_base bb
-            JOIN operational.persona_base p ON bb.persona_id = p.id
-            WHERE bb.tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
-            GROUP BY p.id, p.cedula, p.nombres_apellidos
-            ORDER BY valor_total_recibido DESC
-            LIMIT 10;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        
-        df['valor_total_recibido'] = df['valor_total_recibido'].apply(format_currency)
-        df['valor_promedio'] = df['valor_promedio'].apply(format_currency)
-        
-        print(df.to_string(index=False))
-        
-        # 4. Distribución geográfica
-        print("\n4. DISTRIBUCIÓN GEOGRÁFICA POR CANTÓN (TOP 15)")
-        print("-" * 80)
-        query = text("""
-            SELECT 
-                u.canton,
-                COUNT(*) as total_beneficios,
-                COUNT(DISTINCT bb.persona_id) as total_beneficiarios,
-                SUM(bb.valor_monetario) as valor_total,
-                AVG(bb.valor_monetario) as valor_promedio,
-                SUM(bb.hectarias_beneficiadas) as total_hectarias
-            FROM operational.beneficio_base bb
-            JOIN operational.ubicacion u ON bb.ubicacion_id = u.id
-            WHERE bb.tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
-            GROUP BY u.canton
-            ORDER BY valor_total DESC
-            LIMIT 15;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        
-        df['valor_total'] = df['valor_total'].apply(format_currency)
-        df['valor_promedio'] = df['valor_promedio'].apply(format_currency)
-        df['total_hectarias'] = df['total_hectarias'].apply(lambda x: f"{x:,.2f}" if pd.notna(x) else "N/A")
-        
-        print(df.to_string(index=False))
-        
-        # 5. Estadísticas por hectáreas
-        print("\n5. ANÁLISIS POR HECTÁREAS BENEFICIADAS")
-        print("-" * 80)
-        query = text("""
-            SELECT 
-                UPPER(tipo_beneficio) as tipo_beneficio,
-                COUNT(*) as total_registros,
-                COUNT(hectarias_beneficiadas) as registros_con_hectarias,
-                SUM(hectarias_beneficiadas) as total_hectarias,
-                AVG(hectarias_beneficiadas) as promedio_hectarias,
-                MIN(hectarias_beneficiadas) as min_hectarias,
-                MAX(hectarias_beneficiadas) as max_hectarias,
-                SUM(valor_monetario) / NULLIF(SUM(hectarias_beneficiadas), 0) as valor_por_hectarea
-            FROM operational.beneficio_base
-            WHERE tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
-            GROUP BY UPPER(tipo_beneficio)
-            ORDER BY tipo_beneficio;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        
-        # Format numeric columns
-        numeric_cols = ['total_hectarias', 'promedio_hectarias', 'min_hectarias', 'max_hectarias']
-        for col in numeric_cols:
-            df[col] = df[col].apply(lambda x: f"{x:,.2f}" if pd.notna(x) else "N/A")
-        df['valor_por_hectarea'] = df['valor_por_hectarea'].apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "N/A")
-        
-        print(df.to_string(index=False))
-        
-        # 6. Organizaciones con mayor inversión
-        print("\n6. ORGANIZACIONES CON MAYOR INVERSIÓN")
-        print("-" * 80)
-        query = text("""
-            WITH org_stats AS (
-                SELECT 
-                    o.nombre as organizacion,
-                    'SEMILLAS' as tipo_beneficio,
-                    COUNT(DISTINCT bb.persona_id) as total_beneficiarios,
-                    COUNT(*) as total_beneficios,
-                    SUM(bb.valor_monetario) as valor_total
-                FROM operational.beneficio_base bb
-                JOIN operational.beneficiario_semillas bs ON bb.persona_id = bs.persona_id
-                JOIN operational.organizacion o ON bs.organizacion_id = o.id
-                WHERE bb.tipo_beneficio = 'SEMILLAS'
-                GROUP BY o.id, o.nombre
-                
-                UNION ALL
-                
-                SELECT 
-                    o.nombre as organizacion,
-                    'FERTILIZANTES' as tipo_beneficio,
-                    COUNT(DISTINCT bb.persona_id) as total_beneficiarios,
-                    COUNT(*) as total_beneficios,
-                    SUM(bb.valor_monetario) as valor_total
-                FROM operational.beneficio_base bb
-                JOIN operational.beneficiario_fertilizantes bf ON bb.persona_id = bf.persona_id
-                JOIN operational.organizacion o ON bf.organizacion_id = o.id
-                WHERE bb.tipo_beneficio = 'fertilizantes'
-                GROUP BY o.id, o.nombre
-            )
-            SELECT 
-                organizacion,
-                SUM(total_beneficiarios) as total_beneficiarios,
-                SUM(total_beneficios) as total_beneficios,
-                SUM(valor_total) as valor_total_invertido,
-                SUM(valor_total) / NULLIF(SUM(total_beneficiarios), 0) as promedio_por_beneficiario
-            FROM org_stats
-            WHERE organizacion IS NOT NULL
-            GROUP BY organizacion
-            ORDER BY valor_total_invertido DESC
-            LIMIT 10;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        
-        if not df.empty:
-            df['valor_total_invertido'] = df['valor_total_invertido'].apply(format_currency)
-            df['promedio_por_beneficiario'] = df['promedio_por_beneficiario'].apply(format_currency)
-            print(df.to_string(index=False))
-        else:
-            print("No hay datos de organizaciones disponibles")
-        
-        # 7. Resumen ejecutivo
-        print("\n7. RESUMEN EJECUTIVO")
-        print("-" * 80)
-        query = text("""
-            SELECT 
-                COUNT(DISTINCT bb.persona_id) as beneficiarios_totales,
-                COUNT(*) as beneficios_totales,
-                SUM(bb.valor_monetario) as inversion_total,
-                AVG(bb.valor_monetario) as promedio_por_beneficio,
-                COUNT(DISTINCT bb.ubicacion_id) as ubicaciones_atendidas,
-                COUNT(DISTINCT CASE WHEN bs.organizacion_id IS NOT NULL THEN bs.organizacion_id 
-                                   WHEN bf.organizacion_id IS NOT NULL THEN bf.organizacion_id 
-                              END) as organizaciones_participantes
-            FROM operational.beneficio_base bb
-            LEFT JOIN operational.beneficiario_semillas bs ON bb.persona_id = bs.persona_id
-            LEFT JOIN operational.beneficiario_fertilizantes bf ON bb.persona_id = bf.persona_id
-            WHERE bb.tipo_beneficio IN ('SEMILLAS', 'fertilizantes');
-        """)
-        result = conn.execute(query)
-        row = result.fetchone()
-        
-        print(f"Beneficiarios totales: {row[0]:,}")
-        print(f"Beneficios entregados: {row[1]:,}")
-        print(f"Inversión total: {format_currency(row[2])}")
-        print(f"Promedio por beneficio: {format_currency(row[3])}")
-        print(f"Ubicaciones atendidas: {row[4]:,}")
-        print(f"Organizaciones participantes: {row[5]:,}")
+
+        for section, titulo, formatter, sin_datos in SECTIONS:
+            df = fetch_section(conn, section, from_mv)
+            print(f"\n{titulo}")
+            print("-" * 80)
+            print(formatter(df) if not df.empty else sin_datos)
 
 if __name__ == "__main__":
-    get_financial_statistics()
\ No newline at end of file
+    # Acumular el reporte y emitirlo con una sola escritura a stdout
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            get_financial_statistics()
+    finally:
+        sys.stdout.write(buffer.getvalue())
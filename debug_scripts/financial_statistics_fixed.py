@@ -1,15 +1,589 @@
 #!/usr/bin/env python3
-"""Analyze financial statistics for semillas and fertilizantes."""
+"""Analyze financial statistics for semillas and fertilizantes.
+
+Si existe la vista materializada analytics.mv_financial_statistics (creada y
+refrescada por scripts/create_mv_financial_statistics.py) el reporte completo se
+lee de ella en una sola fila JSON; si no, las secciones se consultan en vivo.
+"""
 
 import sys
 import os
+import itertools
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
 from config.connections.database import db_connection
 import pandas as pd
 
+try:
+    # Opcional: lee Postgres → Arrow → pandas sin materializar tuplas en Python
+    import connectorx as cx
+except ImportError:
+    cx = None
+
+# Filas por FETCH del cursor del lado del servidor
+STREAM_ITERSIZE = 4096
+
+# Valores de tipo_beneficio y columna geográfica por defecto. Según la carga
+# la base usa 'SEMILLAS'/'fertilizantes' o 'SEMILLA'/'FERTILIZANTE', y la
+# ubicación se agrupa por canton o por estado: se detectan al iniciar.
+SEMILLA_LABEL = 'SEMILLAS'
+FERT_LABEL = 'fertilizantes'
+GEO_COL = 'canton'
+
+TIPOS_QUERY = "SELECT DISTINCT tipo_beneficio FROM operational.beneficio_base"
+
+GEO_COLS_QUERY = """
+    SELECT column_name FROM information_schema.columns
+    WHERE table_schema = 'operational' AND table_name = 'ubicacion'
+    AND column_name IN ('canton', 'estado')
+"""
+
+def run_query(conn, sql, params=None, stream=False):
+    """Run raw SQL and return a DataFrame, via connectorx when installed or the DBAPI cursor.
+
+    Con stream=True (consultas sin LIMIT) se usa un cursor con nombre del lado
+    del servidor, que trae las filas en bloques de STREAM_ITERSIZE en lugar de
+    cargar el resultado completo en el cliente antes de construir el DataFrame.
+    """
+    if cx is not None:
+        # connectorx no acepta parámetros: psycopg2 los interpola antes de enviar
+        if params is not None:
+            cursor = conn.connection.cursor()
+            try:
+                sql = cursor.mogrify(sql, params).decode()
+            finally:
+                cursor.close()
+        dsn = conn.engine.url.render_as_string(hide_password=False)
+        return cx.read_sql(dsn, sql.strip().rstrip(';'))
+
+    if stream:
+        cursor = conn.connection.cursor(name="financial_statistics_stream")
+        cursor.itersize = STREAM_ITERSIZE
+    else:
+        cursor = conn.connection.cursor()
+    try:
+        cursor.execute(sql.strip().rstrip(';'), params)
+        filas = cursor.fetchmany(STREAM_ITERSIZE) if stream else cursor.fetchall()
+        columnas = [d[0] for d in cursor.description]
+        if stream:
+            filas = itertools.chain(filas, cursor)
+        return pd.DataFrame.from_records(filas, columns=columnas)
+    finally:
+        cursor.close()
+
+def detect_labels(conn):
+    """Return the tipo_beneficio query params and geographic column of this database."""
+    tipos = run_query(conn, TIPOS_QUERY)['tipo_beneficio'].dropna()
+    labels = {tipo.upper(): tipo for tipo in tipos}
+    semillas = labels.get('SEMILLAS', labels.get('SEMILLA', SEMILLA_LABEL))
+    fertilizantes = labels.get('FERTILIZANTES', labels.get('FERTILIZANTE', FERT_LABEL))
+
+    geo_cols = set(run_query(conn, GEO_COLS_QUERY)['column_name'])
+    geo_col = GEO_COL if GEO_COL in geo_cols or not geo_cols else geo_cols.pop()
+
+    params = {
+        'semillas': semillas,
+        'fertilizantes': fertilizantes,
+        'tipos': [semillas, fertilizantes],
+    }
+    return params, geo_col
+
+# Corte de beneficio_base que comparten casi todas las secciones. En la sentencia
+# consolidada (vista materializada) se materializa una sola vez; en las consultas
+# en vivo cada una lo recibe como CTE y PostgreSQL lo integra en la consulta.
+BB_SLICE_SELECT = """
+    SELECT id, persona_id, ubicacion_id, tipo_beneficio, valor_monetario, hectarias_beneficiadas
+    FROM operational.beneficio_base
+    WHERE tipo_beneficio = ANY(%(tipos)s)
+"""
+
+def with_slice(sql):
+    """Prefix a report query with the bb_slice CTE, merging it into the query's own WITH."""
+    cuerpo = sql.strip()
+    if cuerpo[:4].upper() == 'WITH':
+        return f"WITH bb_slice AS ({BB_SLICE_SELECT}),{cuerpo[4:]}"
+    return f"WITH bb_slice AS ({BB_SLICE_SELECT}) {cuerpo}"
+
+# Formateador de flotantes fijo: str.format enlazado una sola vez, en lugar de
+# que pandas infiera la precisión de cada columna al imprimir
+FLOAT_FMT = "{:,.2f}".format
+
+def format_df(df):
+    """Render a report DataFrame as text without the index."""
+    return df.to_string(index=False, float_format=FLOAT_FMT)
+
+def fetch_rows(conn, sql, params=None):
+    """Run a small (LIMIT) query on the DBAPI cursor and return (columnas, filas) without pandas."""
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(sql.strip().rstrip(';'), params)
+        return [d[0] for d in cursor.description], cursor.fetchall()
+    finally:
+        cursor.close()
+
+def format_cell(value):
+    """Render one value the way format_df renders floats."""
+    if isinstance(value, (float, Decimal)):
+        return FLOAT_FMT(value)
+    return str(value)
+
+def format_rows(columnas, filas):
+    """Format a handful of rows as a right-aligned text table.
+
+    Para resultados de 10-15 filas construir un DataFrame cuesta más que
+    formatear las tuplas directamente.
+    """
+    celdas = [[format_cell(valor) for valor in fila] for fila in filas]
+    anchos = [
+        max([len(col)] + [len(fila[j]) for fila in celdas])
+        for j, col in enumerate(columnas)
+    ]
+    lineas = [" ".join(col.rjust(w) for col, w in zip(columnas, anchos))]
+    lineas += [" ".join(c.rjust(w) for c, w in zip(fila, anchos)) for fila in celdas]
+    return "\n".join(lineas)
+
+# Conteo de beneficiarios distintos: aproximado con HyperLogLog si la extensión
+# hll está instalada (memoria constante por grupo), exacto en caso contrario.
+HLL_DISTINCT_PERSONAS = "hll_cardinality(hll_add_agg(hll_hash_bigint(bb.persona_id)))::bigint"
+EXACT_DISTINCT_PERSONAS = "COUNT(DISTINCT bb.persona_id)"
+
+HLL_AVAILABLE_QUERY = "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'hll')"
+
+def distinct_personas_expr(conn):
+    """Pick the distinct-persona aggregate supported by the connected database."""
+    hll = run_query(conn, HLL_AVAILABLE_QUERY).iat[0, 0]
+    return HLL_DISTINCT_PERSONAS if hll else EXACT_DISTINCT_PERSONAS
+
+# Una sola pasada sobre beneficio_base agrupada por (persona_id, tipo_beneficio).
+# De ahí salen el resumen por tipo (sección 1 y 9) y el top 10 por tipo (4 y 5).
+BENEFICIO_STATS_QUERY = """
+    WITH per_person AS (
+        SELECT
+            persona_id,
+            tipo_beneficio,
+            COUNT(*) as c,
+            COUNT(valor_monetario) as cv,
+            SUM(valor_monetario) as s,
+            AVG(valor_monetario) as a,
+            MIN(valor_monetario) as mn,
+            MAX(valor_monetario) as mx
+        FROM bb_slice
+        GROUP BY persona_id, tipo_beneficio
+    ),
+    top10 AS (
+        -- ORDER BY ... LIMIT por tipo: top-N heapsort sobre per_person, sin
+        -- ordenar a todas las personas; solo estas 20 filas se unen a persona_base
+        SELECT t.*
+        FROM unnest(%(tipos)s) tipos(tipo_beneficio)
+        CROSS JOIN LATERAL (
+            SELECT *
+            FROM per_person pp
+            WHERE pp.tipo_beneficio = tipos.tipo_beneficio
+            ORDER BY pp.s DESC NULLS LAST
+            LIMIT 10
+        ) t
+    )
+    SELECT
+        'resumen' as seccion,
+        tipo_beneficio,
+        NULL as cedula,
+        NULL as nombre_completo,
+        SUM(c) as total_beneficios,
+        COUNT(persona_id) as total_beneficiarios,
+        SUM(s) as valor_total,
+        SUM(s) / NULLIF(SUM(cv), 0) as valor_promedio,
+        MIN(mn) as valor_minimo,
+        MAX(mx) as valor_maximo
+    FROM per_person
+    GROUP BY tipo_beneficio
+    UNION ALL
+    SELECT
+        'top' as seccion,
+        r.tipo_beneficio,
+        p.cedula,
+        p.nombres_apellidos as nombre_completo,
+        r.c as total_beneficios,
+        NULL as total_beneficiarios,
+        r.s as valor_total,
+        r.a as valor_promedio,
+        NULL as valor_minimo,
+        NULL as valor_maximo
+    FROM top10 r
+    JOIN operational.persona_base p ON r.persona_id = p.id
+"""
+
+RESUMEN_COLUMNS = [
+    'tipo_beneficio', 'total_beneficios', 'total_beneficiarios',
+    'valor_total', 'valor_promedio', 'valor_minimo', 'valor_maximo'
+]
+
+def top_beneficiarios(top, tipo_beneficio):
+    """Top 10 beneficiaries of one benefit type from the fused query."""
+    df = top[top['tipo_beneficio'] == tipo_beneficio].sort_values('valor_total', ascending=False)
+    df = df.rename(columns={'valor_total': 'valor_total_recibido'})
+    return df[['cedula', 'nombre_completo', 'total_beneficios', 'valor_total_recibido', 'valor_promedio']]
+
+def resumen_financiero(resumen):
+    """Per-type totals plus a TOTAL row, derived from the fused summary rows."""
+    df = resumen[['tipo_beneficio', 'valor_total', 'total_beneficios', 'total_beneficiarios']]
+    df = df.rename(columns={'total_beneficiarios': 'beneficiarios_unicos'})
+    total = pd.DataFrame([{
+        'tipo_beneficio': 'TOTAL',
+        'valor_total': df['valor_total'].sum(),
+        'total_beneficios': df['total_beneficios'].sum(),
+        'beneficiarios_unicos': df['beneficiarios_unicos'].sum(),
+    }])
+    df = pd.concat([df, total], ignore_index=True)
+    df['valor_promedio_por_beneficio'] = df['valor_total'] / df['total_beneficios'].replace(0, pd.NA)
+    df['valor_promedio_por_beneficiario'] = df['valor_total'] / df['beneficiarios_unicos'].replace(0, pd.NA)
+    return df
+
+# 2. Distribución por tipo de cultivo - Semillas
+CULTIVO_SEMILLAS_QUERY = """
+    SELECT
+        bs.tipo_cultivo,
+        COUNT(*) as total_beneficios,
+        {distinct_personas} as total_beneficiarios,
+        SUM(bb.valor_monetario) as valor_total,
+        AVG(bb.valor_monetario) as valor_promedio
+    FROM bb_slice bb
+    JOIN operational.beneficio_semillas bs ON bb.id = bs.id
+    WHERE bb.tipo_beneficio = %(semillas)s
+    AND bs.tipo_cultivo IS NOT NULL
+    GROUP BY bs.tipo_cultivo
+    ORDER BY valor_total DESC;
+"""
+
+# 3. Distribución por tipo de cultivo - Fertilizantes
+CULTIVO_FERTILIZANTES_QUERY = """
+    SELECT
+        bf.tipo_cultivo,
+        COUNT(*) as total_beneficios,
+        {distinct_personas} as total_beneficiarios,
+        SUM(bb.valor_monetario) as valor_total,
+        AVG(bb.valor_monetario) as valor_promedio
+    FROM bb_slice bb
+    JOIN operational.beneficio_fertilizantes bf ON bb.id = bf.id
+    WHERE bb.tipo_beneficio = %(fertilizantes)s
+    AND bf.tipo_cultivo IS NOT NULL
+    GROUP BY bf.tipo_cultivo
+    ORDER BY valor_total DESC;
+"""
+
+# 6. Distribución por ubicación (canton o estado)
+UBICACION_QUERY = """
+    SELECT
+        u.{geo_col},
+        bb.tipo_beneficio,
+        COUNT(*) as total_beneficios,
+        SUM(bb.valor_monetario) as valor_total,
+        AVG(bb.valor_monetario) as valor_promedio
+    FROM bb_slice bb
+    JOIN operational.ubicacion u ON bb.ubicacion_id = u.id
+    GROUP BY u.{geo_col}, bb.tipo_beneficio
+    ORDER BY u.{geo_col}, bb.tipo_beneficio;
+"""
+
+# 7. Estadísticas desde el esquema analítico
+FACT_BENEFICIO_QUERY = """
+    SELECT
+        fb.tipo_beneficio,
+        dc.nombre_cultivo,
+        COUNT(*) as total_registros,
+        SUM(fb.valor_total) as valor_total,
+        AVG(fb.valor_total) as valor_promedio,
+        MIN(fb.valor_total) as valor_minimo,
+        MAX(fb.valor_total) as valor_maximo
+    FROM analytics.fact_beneficio fb
+    JOIN analytics.dim_cultivo dc ON fb.cultivo_key = dc.cultivo_key
+    WHERE fb.tipo_beneficio = ANY(%(tipos)s)
+    GROUP BY fb.tipo_beneficio, dc.nombre_cultivo
+    ORDER BY fb.tipo_beneficio, valor_total DESC;
+"""
+
+# 8. Comparación temporal (por año)
+TEMPORAL_QUERY = """
+    SELECT
+        dt.ano,
+        fb.tipo_beneficio,
+        COUNT(*) as total_beneficios,
+        SUM(fb.valor_total) as valor_total,
+        AVG(fb.valor_total) as valor_promedio
+    FROM analytics.fact_beneficio fb
+    JOIN analytics.dim_tiempo dt ON fb.tiempo_key = dt.tiempo_key
+    WHERE fb.tipo_beneficio = ANY(%(tipos)s)
+    GROUP BY dt.ano, fb.tipo_beneficio
+    ORDER BY dt.ano DESC, fb.tipo_beneficio;
+"""
+
+# 10. Detalles adicionales - Semillas
+KG_SEMILLA_QUERY = """
+    SELECT
+        bs.kg_semilla,
+        COUNT(*) as cantidad,
+        SUM(bb.valor_monetario) as valor_total,
+        AVG(bb.valor_monetario) as valor_promedio,
+        SUM(bb.valor_monetario) / NULLIF(SUM(bs.kg_semilla), 0) as valor_por_kg
+    FROM bb_slice bb
+    JOIN operational.beneficio_semillas bs ON bb.id = bs.id
+    WHERE bb.tipo_beneficio = %(semillas)s
+    AND bs.kg_semilla IS NOT NULL
+    GROUP BY bs.kg_semilla
+    ORDER BY cantidad DESC
+    LIMIT 10;
+"""
+
+# 11. Organizaciones con mayor inversión
+ORGANIZACIONES_QUERY = """
+    WITH org_stats AS (
+        -- Un solo recorrido: cada tipo se une solo con su tabla de beneficiarios
+        SELECT
+            o.id,
+            o.nombre as organizacion,
+            bb.tipo_beneficio,
+            COUNT(*) as total_beneficios,
+            SUM(bb.valor_monetario) as valor_total
+        FROM bb_slice bb
+        LEFT JOIN operational.beneficiario_semillas bs
+            ON bs.persona_id = bb.persona_id AND bb.tipo_beneficio = %(semillas)s
+        LEFT JOIN operational.beneficiario_fertilizantes bf
+            ON bf.persona_id = bb.persona_id AND bb.tipo_beneficio = %(fertilizantes)s
+        JOIN operational.organizacion o ON o.id = COALESCE(bs.organizacion_id, bf.organizacion_id)
+        GROUP BY o.id, o.nombre, bb.tipo_beneficio
+    )
+    SELECT
+        organizacion,
+        tipo_beneficio,
+        total_beneficios,
+        valor_total
+    FROM org_stats
+    WHERE organizacion IS NOT NULL
+    ORDER BY valor_total DESC
+    LIMIT 10;
+"""
+
+# 12. Distribución por hectáreas beneficiadas
+HECTAREAS_QUERY = """
+    SELECT
+        tipo_beneficio,
+        COUNT(*) as total_beneficios,
+        SUM(hectarias_beneficiadas) as total_hectarias,
+        AVG(hectarias_beneficiadas) as promedio_hectarias,
+        MIN(hectarias_beneficiadas) as min_hectarias,
+        MAX(hectarias_beneficiadas) as max_hectarias
+    FROM bb_slice
+    WHERE hectarias_beneficiadas IS NOT NULL
+    GROUP BY tipo_beneficio
+    ORDER BY tipo_beneficio;
+"""
+
+# Secciones 1, 4, 5 y 9 para la sentencia consolidada. En vivo salen de
+# BENEFICIO_STATS_QUERY; aquí leen el bb_slice materializado.
+RESUMEN_QUERY = """
+    SELECT
+        bb.tipo_beneficio,
+        COUNT(*) as total_beneficios,
+        {distinct_personas} as total_beneficiarios,
+        SUM(bb.valor_monetario) as valor_total,
+        AVG(bb.valor_monetario) as valor_promedio,
+        MIN(bb.valor_monetario) as valor_minimo,
+        MAX(bb.valor_monetario) as valor_maximo
+    FROM bb_slice bb
+    GROUP BY bb.tipo_beneficio
+    ORDER BY bb.tipo_beneficio;
+"""
+
+# El LIMIT se aplica después del JOIN: una persona sin fila en persona_base no
+# deja la sección con menos de 10 beneficiarios
+TOP_BENEFICIARIOS_QUERY = """
+    SELECT
+        p.cedula,
+        p.nombres_apellidos as nombre_completo,
+        COUNT(*) as total_beneficios,
+        SUM(bb.valor_monetario) as valor_total_recibido,
+        AVG(bb.valor_monetario) as valor_promedio
+    FROM bb_slice bb
+    JOIN operational.persona_base p ON bb.persona_id = p.id
+    WHERE bb.tipo_beneficio = {tipo}
+    GROUP BY p.id, p.cedula, p.nombres_apellidos
+    ORDER BY valor_total_recibido DESC NULLS LAST
+    LIMIT 10;
+"""
+
+RESUMEN_TOTAL_QUERY = """
+    WITH totales AS (
+        SELECT
+            bb.tipo_beneficio,
+            SUM(bb.valor_monetario) as valor_total,
+            COUNT(*) as total_beneficios,
+            {distinct_personas} as beneficiarios_unicos
+        FROM bb_slice bb
+        GROUP BY bb.tipo_beneficio
+    )
+    SELECT
+        tipo_beneficio,
+        valor_total,
+        total_beneficios,
+        beneficiarios_unicos,
+        valor_total / NULLIF(total_beneficios, 0) as valor_promedio_por_beneficio,
+        valor_total / NULLIF(beneficiarios_unicos, 0) as valor_promedio_por_beneficiario
+    FROM totales
+    UNION ALL
+    SELECT
+        'TOTAL' as tipo_beneficio,
+        SUM(valor_total) as valor_total,
+        SUM(total_beneficios) as total_beneficios,
+        SUM(beneficiarios_unicos) as beneficiarios_unicos,
+        SUM(valor_total) / NULLIF(SUM(total_beneficios), 0) as valor_promedio_por_beneficio,
+        SUM(valor_total) / NULLIF(SUM(beneficiarios_unicos), 0) as valor_promedio_por_beneficiario
+    FROM totales;
+"""
+
+# Resultado precalculado por scripts/create_mv_financial_statistics.py
+MV_NAME = 'analytics.mv_financial_statistics'
+
+MV_EXISTS_SQL = """
+    SELECT EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'analytics' AND matviewname = 'mv_financial_statistics'
+    )
+"""
+
+MV_SELECT_SQL = f"SELECT resultados FROM {MV_NAME}"
+
+# (clave, título, mensaje si la sección no tiene filas), en el orden del reporte
+REPORT_SECTIONS = (
+    ('resumen', "1. RESUMEN GENERAL POR TIPO DE BENEFICIO", "No hay datos disponibles"),
+    ('cultivo_semillas', "2. DISTRIBUCIÓN POR TIPO DE CULTIVO - SEMILLAS", "No hay datos disponibles"),
+    ('cultivo_fertilizantes', "3. DISTRIBUCIÓN POR TIPO DE CULTIVO - FERTILIZANTES", "No hay datos disponibles"),
+    ('top_semillas', "4. TOP 10 BENEFICIARIOS POR VALOR - SEMILLAS", "No hay datos disponibles"),
+    ('top_fertilizantes', "5. TOP 10 BENEFICIARIOS POR VALOR - FERTILIZANTES", "No hay datos disponibles"),
+    ('ubicacion', "6. DISTRIBUCIÓN POR {geo_col}", "No hay datos disponibles"),
+    ('fact_beneficio', "7. ESTADÍSTICAS DESDE ESQUEMA ANALÍTICO (FACT_BENEFICIO)", "No hay datos en el esquema analítico aún"),
+    ('temporal', "8. COMPARACIÓN TEMPORAL (POR AÑO)", "No hay datos temporales disponibles"),
+    ('resumen_total', "9. RESUMEN FINANCIERO TOTAL", "No hay datos disponibles"),
+    ('kg_semilla', "10. DETALLES ADICIONALES - SEMILLAS (por KG)", "No hay datos de kg_semilla disponibles"),
+    ('organizaciones', "11. ORGANIZACIONES CON MAYOR INVERSIÓN", "No hay datos de organizaciones disponibles"),
+    ('hectareas', "12. DISTRIBUCIÓN POR HECTÁREAS BENEFICIADAS", "No hay datos disponibles"),
+)
+
+# Consultas concurrentes, cada una con su propia conexión
+MAX_WORKERS = 6
+
+def report_queries(distinct_personas, geo_col):
+    """Build the independent report queries as {clave: (sql, modo)}.
+
+    modo: 'df' (DataFrame), 'stream' (DataFrame con cursor del lado del
+    servidor, consultas sin LIMIT) o 'rows' (tuplas, consultas con LIMIT).
+    """
+    return {
+        'beneficio_stats': (BENEFICIO_STATS_QUERY, 'df'),
+        'cultivo_semillas': (CULTIVO_SEMILLAS_QUERY.format(distinct_personas=distinct_personas), 'stream'),
+        'cultivo_fertilizantes': (CULTIVO_FERTILIZANTES_QUERY.format(distinct_personas=distinct_personas), 'stream'),
+        'ubicacion': (UBICACION_QUERY.format(geo_col=geo_col), 'stream'),
+        'fact_beneficio': (FACT_BENEFICIO_QUERY, 'stream'),
+        'temporal': (TEMPORAL_QUERY, 'df'),
+        'kg_semilla': (KG_SEMILLA_QUERY, 'rows'),
+        'organizaciones': (ORGANIZACIONES_QUERY, 'rows'),
+        'hectareas': (HECTAREAS_QUERY, 'df'),
+    }
+
+def statistics_queries(distinct_personas, geo_col):
+    """Build the final SQL of every report section as {clave: sql} for the consolidated statement."""
+    consultas = report_queries(distinct_personas, geo_col)
+    return {
+        'resumen': RESUMEN_QUERY.format(distinct_personas=distinct_personas),
+        'cultivo_semillas': consultas['cultivo_semillas'][0],
+        'cultivo_fertilizantes': consultas['cultivo_fertilizantes'][0],
+        'top_semillas': TOP_BENEFICIARIOS_QUERY.format(tipo='%(semillas)s'),
+        'top_fertilizantes': TOP_BENEFICIARIOS_QUERY.format(tipo='%(fertilizantes)s'),
+        'ubicacion': consultas['ubicacion'][0],
+        'fact_beneficio': consultas['fact_beneficio'][0],
+        'temporal': consultas['temporal'][0],
+        'resumen_total': RESUMEN_TOTAL_QUERY.format(distinct_personas=distinct_personas),
+        'kg_semilla': consultas['kg_semilla'][0],
+        'organizaciones': consultas['organizaciones'][0],
+        'hectareas': consultas['hectareas'][0],
+    }
+
+def statistics_sql(distinct_personas, geo_col):
+    """Build one statement returning every section as a JSON object of row arrays.
+
+    Todo el reporte viaja en un solo round-trip y bb_slice se recorre una sola
+    vez para todas las secciones. Es la consulta de la vista materializada.
+    """
+    secciones = ", ".join(
+        f"'{clave}', (SELECT COALESCE(json_agg(q), '[]'::json) FROM ({sql.strip().rstrip(';')}) q)"
+        for clave, sql in statistics_queries(distinct_personas, geo_col).items()
+    )
+    return f"WITH bb_slice AS MATERIALIZED ({BB_SLICE_SELECT}) SELECT json_build_object({secciones})"
+
+def fetch_materialized(conn):
+    """Read the precomputed report from the materialized view, or None when it does not exist."""
+    _, filas = fetch_rows(conn, MV_EXISTS_SQL)
+    if not filas[0][0]:
+        return None
+    _, filas = fetch_rows(conn, MV_SELECT_SQL)
+    return filas[0][0]
+
+def json_sections(resultados):
+    """Turn the JSON object of the view into {clave: (columnas, filas)} without pandas."""
+    return {
+        clave: (list(filas[0]) if filas else [], [tuple(fila.values()) for fila in filas])
+        for clave, filas in resultados.items()
+    }
+
+def run_isolated(engine, sql, params, modo):
+    """Run one report query on its own connection, so worker threads never share one."""
+    sql = with_slice(sql)
+    with engine.connect() as conn:
+        if modo == 'rows':
+            return fetch_rows(conn, sql, params)
+        return run_query(conn, sql, params, stream=(modo == 'stream'))
+
+def live_sections(engine, tipo_params, geo_col, distinct_personas):
+    """Run the report queries concurrently and shape them as {clave: sección}."""
+    # Las consultas no dependen entre sí: se ejecutan en paralelo y se
+    # imprimen después en el orden del reporte
+    consultas = report_queries(distinct_personas, geo_col)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            clave: executor.submit(run_isolated, engine, sql, tipo_params, modo)
+            for clave, (sql, modo) in consultas.items()
+        }
+        secciones = {clave: future.result() for clave, future in futures.items()}
+    
+    # Secciones 1, 4, 5 y 9 salen de una sola pasada sobre beneficio_base
+    beneficio_stats = secciones.pop('beneficio_stats')
+    resumen = beneficio_stats[beneficio_stats['seccion'] == 'resumen']
+    top = beneficio_stats[beneficio_stats['seccion'] == 'top']
+    
+    secciones['resumen'] = resumen[RESUMEN_COLUMNS].sort_values('tipo_beneficio')
+    for clave, tipo in (('top_semillas', tipo_params['semillas']),
+                        ('top_fertilizantes', tipo_params['fertilizantes'])):
+        df = top_beneficiarios(top, tipo)
+        secciones[clave] = (list(df.columns), list(df.itertuples(index=False)))
+    secciones['resumen_total'] = resumen_financiero(resumen)
+    return secciones
+
+def print_report(secciones, geo_col):
+    """Print the report sections; DataFrames via format_df, (columnas, filas) via format_rows."""
+    print("\n" + "="*80)
+    print("ESTADÍSTICAS FINANCIERAS - SEMILLAS Y FERTILIZANTES")
+    print("="*80)
+    
+    for clave, titulo, sin_datos in REPORT_SECTIONS:
+        print(f"\n{titulo.format(geo_col=geo_col.upper())}")
+        print("-" * 60)
+        seccion = secciones[clave]
+        if isinstance(seccion, pd.DataFrame):
+            print(format_df(seccion) if not seccion.empty else sin_datos)
+        else:
+            columnas, filas = seccion
+            print(format_rows(columnas, filas) if filas else sin_datos)
+
 def get_financial_statistics():
     """Get financial statistics from operational and analytical data."""
     if not db_connection.engine:
@@ -17,294 +591,20 @@ def get_financial_statistics():
     engine = db_connection.engine
     
     with engine.connect() as conn:
-        print("\n" + "="*80)
-        print("ESTADÍSTICAS FINANCIERAS - SEMILLAS Y FERTILIZANTES")
-        print("="*80)
-        
-        # 1. Resumen general por tipo de beneficio
-        print("\n1. RESUMEN GENERAL POR TIPO DE BENEFICIO")
-        print("-" * 60)
-        query = text("""
-            SELECT 
-                tipo_beneficio,
-                COUNT(*) as total_beneficios,
-                COUNT(DISTINCT persona_id) as total_beneficiarios,
-                SUM(valor_monetario) as valor_total,
-                AVG(valor_monetario) as valor_promedio,
-                MIN(valor_monetario) as valor_minimo,
-                MAX(valor_monetario) as valor_maximo
-            FROM operational.beneficio_base
-            WHERE tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
-            GROUP BY tipo_beneficio
-            ORDER BY tipo_beneficio;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        print(df.to_string(index=False))
-        
-        # 2. Distribución por tipo de cultivo - Semillas
-        print("\n2. DISTRIBUCIÓN POR TIPO DE CULTIVO - SEMILLAS")
-        print("-" * 60)
-        query = text("""
-            SELECT 
-                bs.tipo_cultivo,
-                COUNT(*) as total_beneficios,
-                COUNT(DISTINCT bb.persona_id) as total_beneficiarios,
-                SUM(bb.valor_monetario) as valor_total,
-                AVG(bb.valor_monetario) as valor_promedio
-            FROM operational.beneficio_base bb
-            JOIN operational.beneficio_semillas bs ON bb.id = bs.id
-            WHERE bb.tipo_beneficio = 'SEMILLAS'
-            AND bs.tipo_cultivo IS NOT NULL
-            GROUP BY bs.tipo_cultivo
-            ORDER BY valor_total DESC;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        print(df.to_string(index=False))
-        
-        # 3. Distribución por tipo de cultivo - Fertilizantes
-        print("\n3. DISTRIBUCIÓN POR TIPO DE CULTIVO - FERTILIZANTES")
-        print("-" * 60)
-        query = text("""
-            SELECT 
-                bf.tipo_cultivo,
-                COUNT(*) as total_beneficios,
-                COUNT(DISTINCT bb.persona_id) as total_beneficiarios,
-                SUM(bb.valor_monetario) as valor_total,
-                AVG(bb.valor_monetario) as valor_promedio
-            FROM operational.beneficio_base bb
-            JOIN operational.beneficio_fertilizantes bf ON bb.id = bf.id
-            WHERE bb.tipo_beneficio = 'fertilizantes'
-            AND bf.tipo_cultivo IS NOT NULL
-            GROUP BY bf.tipo_cultivo
-            ORDER BY valor_total DESC;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        print(df.to_string(index=False))
-        
-        # 4. Top 10 beneficiarios por valor - Semillas
-        print("\n4. TOP 10 BENEFICIARIOS POR VALOR - SEMILLAS")
-        print("-" * 60)
-        query = text("""
-            SELECT 
-                p.cedula,
-                p.nombres_apellidos as nombre_completo,
-                COUNT(*) as total_beneficios,
-                SUM(bb.valor_monetario) as valor_total_recibido,
-                AVG(bb.valor_monetario) as valor_promedio
-            FROM operational.beneficio_base bb
-            JOIN operational.persona_base p ON bb.persona_id = p.id
-            WHERE bb.tipo_beneficio = 'SEMILLAS'
-            GROUP BY p.cedula, p.nombres_apellidos
-            ORDER BY valor_total_recibido DESC
-            LIMIT 10;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        print(df.to_string(index=False))
-        
-        # 5. Top 10 beneficiarios por valor - Fertilizantes
-        print("\n5. TOP 10 BENEFICIARIOS POR VALOR - FERTILIZANTES")
-        print("-" * 60)
-        query = text("""
-            SELECT 
-                p.cedula,
-                p.nombres_apellidos as nombre_completo,
-                COUNT(*) as total_beneficios,
-                SUM(bb.valor_monetario) as valor_total_recibido,
-                AVG(bb.valor_monetario) as valor_promedio
-            FROM operational.beneficio_base bb
-            JOIN operational.persona_base p ON bb.persona_id = p.id
-            WHERE bb.tipo_beneficio = 'fertilizantes'
-            GROUP BY p.cedula, p.nombres_apellidos
-            ORDER BY valor_total_recibido DESC
-            LIMIT 10;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        print(df.to_string(index=False))
-        
-        # 6. Distribución por ubicación (Canton)
-        print("\n6. DISTRIBUCIÓN POR CANTON")
-        print("-" * 60)
-        query = text("""
-            SELECT 
-                u.canton,
-                bb.tipo_beneficio,
-                COUNT(*) as total_beneficios,
-                SUM(bb.valor_monetario) as valor_total,
-                AVG(bb.valor_monetario) as valor_promedio
-            FROM operational.beneficio_base bb
-            JOIN operational.ubicacion u ON bb.ubicacion_id = u.id
-            WHERE bb.tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
-            GROUP BY u.canton, bb.tipo_beneficio
-            ORDER BY u.canton, bb.tipo_beneficio;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        print(df.to_string(index=False))
-        
-        # 7. Estadísticas desde el esquema analítico
-        print("\n7. ESTADÍSTICAS DESDE ESQUEMA ANALÍTICO (FACT_BENEFICIO)")
-        print("-" * 60)
-        query = text("""
-            SELECT COUNT(*) FROM analytics.fact_beneficio
-        """)
-        result = conn.execute(query)
-        count = result.scalar()
-        if count > 0:
-            query = text("""
-                SELECT 
-                    fb.tipo_beneficio,
-                    dc.nombre_cultivo,
-                    COUNT(*) as total_registros,
-                    SUM(fb.valor_total) as valor_total,
-                    AVG(fb.valor_total) as valor_promedio,
-                    MIN(fb.valor_total) as valor_minimo,
-                    MAX(fb.valor_total) as valor_maximo
-                FROM analytics.fact_beneficio fb
-                JOIN analytics.dim_cultivo dc ON fb.cultivo_key = dc.cultivo_key
-                WHERE fb.tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
-                GROUP BY fb.tipo_beneficio, dc.nombre_cultivo
-                ORDER BY fb.tipo_beneficio, valor_total DESC;
-            """)
-            result = conn.execute(query)
-            df = pd.DataFrame(result.fetchall(), columns=result.keys())
-            print(df.to_string(index=False))
-        else:
-            print("No hay datos en el esquema analítico aún")
-        
-        # 8. Resumen financiero total
-        print("\n8. RESUMEN FINANCIERO TOTAL")
-        print("-" * 60)
-        query = text("""
-            WITH totales AS (
-                SELECT 
-                    tipo_beneficio,
-                    SUM(valor_monetario) as valor_total,
-                    COUNT(*) as total_beneficios,
-                    COUNT(DISTINCT persona_id) as beneficiarios_unicos
-                FROM operational.beneficio_base
-                WHERE tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
-                GROUP BY tipo_beneficio
-            )
-            SELECT 
-                tipo_beneficio,
-                valor_total,
-                total_beneficios,
-                beneficiarios_unicos,
-                valor_total / NULLIF(total_beneficios, 0) as valor_promedio_por_beneficio,
-                valor_total / NULLIF(beneficiarios_unicos, 0) as valor_promedio_por_beneficiario
-            FROM totales
-            UNION ALL
-            SELECT 
-                'TOTAL' as tipo_beneficio,
-                SUM(valor_total) as valor_total,
-                SUM(total_beneficios) as total_beneficios,
-                SUM(beneficiarios_unicos) as beneficiarios_unicos,
-                SUM(valor_total) / NULLIF(SUM(total_beneficios), 0) as valor_promedio_por_beneficio,
-                SUM(valor_total) / NULLIF(SUM(beneficiarios_unicos), 0) as valor_promedio_por_beneficiario
-            FROM totales;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        print(df.to_string(index=False))
-        
-        # 9. Detalles adicionales - Semillas
-        print("\n9. DETALLES ADICIONALES - SEMILLAS (por KG)")
-        print("-" * 60)
-        query = text("""
-            SELECT 
-                bs.kg_semilla,
-                COUNT(*) as cantidad,
-                SUM(bb.valor_monetario) as valor_total,
-                AVG(bb.valor_monetario) as valor_promedio,
-                SUM(bb.valor_monetario) / NULLIF(SUM(bs.kg_semilla), 0) as valor_por_kg
-            FROM operational.beneficio_base bb
-            JOIN operational.beneficio_semillas bs ON bb.id = bs.id
-            WHERE bb.tipo_beneficio = 'SEMILLAS' 
-            AND bs.kg_semilla IS NOT NULL
-            GROUP BY bs.kg_semilla
-            ORDER BY cantidad DESC
-            LIMIT 10;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        if not df.empty:
-            print(df.to_string(index=False))
-        else:
-            print("No hay datos de kg_semilla disponibles")
-        
-        # 10. Organizaciones con mayor inversión
-        print("\n10. ORGANIZACIONES CON MAYOR INVERSIÓN")
-        print("-" * 60)
-        query = text("""
-            WITH org_stats AS (
-                SELECT 
-                    o.id,
-                    o.nombre as organizacion,
-                    bb.tipo_beneficio,
-                    COUNT(*) as total_beneficios,
-                    SUM(bb.valor_monetario) as valor_total
-                FROM operational.beneficio_base bb
-                JOIN operational.beneficiario_semillas bs ON bb.persona_id = bs.persona_id
-                JOIN operational.organizacion o ON bs.organizacion_id = o.id
-                WHERE bb.tipo_beneficio = 'SEMILLAS'
-                GROUP BY o.id, o.nombre, bb.tipo_beneficio
-                
-                UNION ALL
-                
-                SELECT 
-                    o.id,
-                    o.nombre as organizacion,
-                    bb.tipo_beneficio,
-                    COUNT(*) as total_beneficios,
-                    SUM(bb.valor_monetario) as valor_total
-                FROM operational.beneficio_base bb
-                JOIN operational.beneficiario_fertilizantes bf ON bb.persona_id = bf.persona_id
-                JOIN operational.organizacion o ON bf.organizacion_id = o.id
-                WHERE bb.tipo_beneficio = 'fertilizantes'
-                GROUP BY o.id, o.nombre, bb.tipo_beneficio
-            )
-            SELECT 
-                organizacion,
-                tipo_beneficio,
-                total_beneficios,
-                valor_total
-            FROM org_stats
-            WHERE organizacion IS NOT NULL
-            ORDER BY valor_total DESC
-            LIMIT 10;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        if not df.empty:
-            print(df.to_string(index=False))
-        else:
-            print("No hay datos de organizaciones disponibles")
-            
-        # 11. Distribución por hectáreas beneficiadas
-        print("\n11. DISTRIBUCIÓN POR HECTÁREAS BENEFICIADAS")
-        print("-" * 60)
-        query = text("""
-            SELECT 
-                tipo_beneficio,
-                COUNT(*) as total_beneficios,
-                SUM(hectarias_beneficiadas) as total_hectarias,
-                AVG(hectarias_beneficiadas) as promedio_hectarias,
-                MIN(hectarias_beneficiadas) as min_hectarias,
-                MAX(hectarias_beneficiadas) as max_hectarias
-            FROM operational.beneficio_base
-            WHERE tipo_beneficio IN ('SEMILLAS', 'fertilizantes')
-            AND hectarias_beneficiadas IS NOT NULL
-            GROUP BY tipo_beneficio
-            ORDER BY tipo_beneficio;
-        """)
-        result = conn.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        print(df.to_string(index=False))
+        resultados = fetch_materialized(conn)
+        if resultados is None:
+            tipo_params, geo_col = detect_labels(conn)
+            distinct_personas = distinct_personas_expr(conn)
+    
+    if resultados is not None:
+        # Vista materializada: todo el reporte en una fila, sin DataFrames
+        secciones = json_sections(resultados)
+        columnas_ubicacion = secciones['ubicacion'][0]
+        geo_col = columnas_ubicacion[0] if columnas_ubicacion else GEO_COL
+    else:
+        secciones = live_sections(engine, tipo_params, geo_col, distinct_personas)
+    
+    print_report(secciones, geo_col)
 
 if __name__ == "__main__":
-    get_financial_statistics()
\ No newline at end of file
+    get_financial_statistics()
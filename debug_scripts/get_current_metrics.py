@@ -7,6 +7,30 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.connections.database import db_connection
 from sqlalchemy import text
+import numpy as np
+
+# Todas las métricas escalares en una sola sentencia (un solo round-trip)
+METRICS_QUERY = text('''
+    SELECT
+        (SELECT COUNT(*) FROM operational.persona_base) AS personas_count,
+        (SELECT COUNT(DISTINCT persona_id) FROM operational.beneficiario_semillas) AS beneficiarios_count,
+        bs.total_inversion,
+        bs.total_hectareas,
+        (SELECT COUNT(*) FROM operational.ubicacion) AS ubicaciones_count,
+        (SELECT COUNT(*) FROM operational.organizacion) AS organizaciones_count,
+        bs.beneficios_count,
+        (SELECT COUNT(*) FROM operational.persona_base
+         WHERE cedula IS NOT NULL AND cedula != '') AS personas_completas,
+        (SELECT COUNT(*) FROM staging.stg_semilla) AS staging_total
+    FROM (
+        -- Un solo recorrido de beneficio_semillas para sus tres agregados
+        SELECT
+            SUM(inversion) AS total_inversion,
+            SUM(hectarias_beneficiadas) AS total_hectareas,
+            COUNT(*) AS beneficios_count
+        FROM operational.beneficio_semillas
+    ) bs
+''')
 
 def get_current_metrics():
     """Obtiene las métricas actuales del esquema operational."""
@@ -14,62 +38,49 @@ def get_current_metrics():
     with db_connection.get_session() as session:
         print('=== MÉTRICAS ACTUALES DEL SISTEMA ===\n')
         
-        # Personas
-        personas_count = session.execute(text('SELECT COUNT(*) FROM operational.persona_base')).scalar()
-        print(f'Personas únicas: {personas_count:,}')
+        (personas_count, beneficiarios_count, total_inversion, total_hectareas,
+         ubicaciones_count, organizaciones_count, beneficios_count,
+         personas_completas, staging_total) = session.execute(METRICS_QUERY).one()
+        total_inversion = float(total_inversion or 0)
+        total_hectareas = float(total_hectareas or 0)
         
-        # Beneficiarios semillas
-        beneficiarios_count = session.execute(text('SELECT COUNT(DISTINCT persona_id) FROM operational.beneficiario_semillas')).scalar()
+        print(f'Personas únicas: {personas_count:,}')
         print(f'Beneficiarios semillas: {beneficiarios_count:,}')
-        
-        # Total inversión
-        total_inversion = float(session.execute(text('SELECT SUM(inversion) FROM operational.beneficio_semillas')).scalar() or 0)
         print(f'Total inversión: ${total_inversion:,.2f}')
-        
-        # Total hectáreas
-        total_hectareas = float(session.execute(text('SELECT SUM(hectarias_beneficiadas) FROM operational.beneficio_semillas')).scalar() or 0)
         print(f'Total hectáreas: {total_hectareas:,.2f}')
-        
-        # Ubicaciones
-        ubicaciones_count = session.execute(text('SELECT COUNT(*) FROM operational.ubicacion')).scalar()
         print(f'Total ubicaciones: {ubicaciones_count:,}')
-        
-        # Organizaciones
-        organizaciones_count = session.execute(text('SELECT COUNT(*) FROM operational.organizacion')).scalar()
         print(f'Total organizaciones: {organizaciones_count:,}')
-        
-        # Beneficios
-        beneficios_count = session.execute(text('SELECT COUNT(*) FROM operational.beneficio_semillas')).scalar()
         print(f'Total beneficios: {beneficios_count:,}')
         
         # Comparación con datos anteriores
         print(f'\n=== COMPARACIÓN CON DATOS ANTERIORES ===\n')
         
         # Datos anteriores (proporcionados por el usuario)
-        personas_antes = 11805
-        beneficiarios_antes = 11804
-        inversion_antes = 2465035.57
-        hectareas_antes = 27821
+        antes = np.array([11805, 11804, 2465035.57, 27821], dtype=float)
+        actual = np.array([personas_count, beneficiarios_count, total_inversion, total_hectareas], dtype=float)
+        
+        # Diferencias y porcentajes en un solo bloque; una base en cero da 0%
+        diferencia = actual - antes
+        porcentaje = np.divide(diferencia, antes, out=np.zeros_like(diferencia), where=antes != 0) * 100
+        
+        formatos = (
+            ('Personas', '{:,.0f}', '{:+,.0f}'),
+            ('Beneficiarios', '{:,.0f}', '{:+,.0f}'),
+            ('Total inversión', '${:,.2f}', '${:+,.2f}'),
+            ('Total hectáreas', '{:,.2f}', '{:+,.2f}'),
+        )
         
         print('Incrementos:')
-        print(f'  - Personas: {personas_count:,} → {personas_count - personas_antes:+,} ({(personas_count - personas_antes)/personas_antes*100:+.1f}%)')
-        print(f'  - Beneficiarios: {beneficiarios_count:,} → {beneficiarios_count - beneficiarios_antes:+,} ({(beneficiarios_count - beneficiarios_antes)/beneficiarios_antes*100:+.1f}%)')
-        print(f'  - Total inversión: ${total_inversion:,.2f} → ${total_inversion - inversion_antes:+,.2f} ({(total_inversion - inversion_antes)/inversion_antes*100:+.1f}%)')
-        print(f'  - Total hectáreas: {total_hectareas:,.2f} → {total_hectareas - hectareas_antes:+,.2f} ({(total_hectareas - hectareas_antes)/hectareas_antes*100:+.1f}%)')
+        for (etiqueta, fmt_valor, fmt_diferencia), valor, dif, pct in zip(formatos, actual, diferencia, porcentaje):
+            print(f'  - {etiqueta}: {fmt_valor.format(valor)} → {fmt_diferencia.format(dif)} ({pct:+.1f}%)')
         
         # Calidad de datos
         print(f'\n=== CALIDAD DE DATOS ===\n')
         
         # Personas con datos completos
-        personas_completas = session.execute(text('''
-            SELECT COUNT(*) FROM operational.persona_base 
-            WHERE cedula IS NOT NULL AND cedula != ''
-        ''')).scalar()
-        
         print(f'Personas con cédula: {personas_completas:,} ({personas_completas/personas_count*100:.1f}%)')
         
         # Validación exitosa
-        staging_total = session.execute(text('SELECT COUNT(*) FROM staging.stg_semilla')).scalar()
         print(f'\nRegistros en staging: {staging_total:,}')
         print(f'Tasa de carga exitosa: {beneficios_count/staging_total*100:.1f}%')
 
@@ -1,9 +1,18 @@
-"""Loader para cargar datos transformados a operational."""
+"""
+Loader para cargar datos transformados a operational.
+
+Nota: los modelos que importa (src.models.operational.operational.*) no existen
+en este árbol desde el baseline, así que el módulo no puede importarse ni
+probarse hasta restaurarlos o migrarlo a src.models.operational_refactored.
+"""
+import io
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple
 from datetime import datetime
+from sqlalchemy import select, insert, update, or_, literal_column, Integer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
 from loguru import logger
 
 from config.connections.database import db_connection
@@ -14,6 +23,35 @@ from src.models.operational.operational.organizaciones_ops import Organizacion
 from src.models.operational.operational.beneficio_base_ops import BeneficioBase
 from src.models.operational.operational.beneficio_semillas_ops import BeneficioSemillas
 
+try:
+    # Opcional: strip/comparación de nombres en C sobre un buffer Arrow contiguo
+    import pyarrow  # noqa: F401
+    NOMBRES_DTYPE = 'string[pyarrow]'
+except ImportError:
+    NOMBRES_DTYPE = 'string'
+
+# Filas por executemany; coincide con insertmanyvalues_page_size del engine
+INSERT_CHUNK_SIZE = 10_000
+
+# Columnas de BeneficioSemillas que vienen del DataFrame de beneficios
+BENEFICIO_SEMILLAS_COLUMNS = [
+    'cultivo', 'hectarias_beneficiadas', 'precio_unitario', 'inversion', 'quintil',
+    'score_quintil', 'numero_acta', 'documento', 'proceso', 'fecha_retiro', 'anio',
+    'responsable_agencia', 'cedula_jefe_sucursal', 'sucursal', 'observacion'
+]
+
+# Marcador de NULL en el CSV que se envía con COPY (distinto de la cadena vacía)
+COPY_NULL = r'\N'
+
+
+def _prepare_df(df: pd.DataFrame, schema_defaults: Dict) -> pd.DataFrame:
+    """Deja solo las columnas esperadas, aplica sus defaults y convierte NaN a None."""
+    df = df.reindex(columns=list(schema_defaults))
+    for col, default in schema_defaults.items():
+        if default is not None:
+            df[col] = df[col].fillna(default)
+    return df.astype(object).where(df.notna(), None)
+
 
 class SemillasOperationalLoader:
     """Carga datos normalizados a las tablas operacionales."""
@@ -59,224 +97,246 @@ class SemillasOperationalLoader:
             raise
             
     def _load_organizaciones(self, df: pd.DataFrame, session: Session):
-        """Carga organizaciones únicas."""
-        for _, row in df.iterrows():
-            try:
-                # Verificar si existe
-                org = session.query(Organizacion).filter_by(
-                    nombre=row['nombre']
-                ).first()
-                
-                if not org:
-                    org = Organizacion(
-                        nombre=row['nombre'],
-                        tipo_organizacion=row.get('tipo_organizacion'),
-                        estado=row.get('estado', 'ACTIVO')
-                    )
-                    session.add(org)
-                    session.flush()  # Para obtener el ID
-                    self.stats['organizaciones_insertadas'] += 1
-                    
-                # Guardar mapeo
-                self.organizacion_id_map[row['nombre']] = org.id
-                
-            except IntegrityError:
-                session.rollback()
-                # Ya existe, obtener el existente
-                org = session.query(Organizacion).filter_by(
-                    nombre=row['nombre']
-                ).first()
-                if org:
-                    self.organizacion_id_map[row['nombre']] = org.id
+        """Carga organizaciones únicas con una consulta previa y un insert masivo."""
+        # Los nombres ya mapeados en batches anteriores no vuelven a consultarse
+        names = [nombre for nombre in df['nombre'].dropna().unique() if nombre not in self.organizacion_id_map]
+        if not names:
+            return
+        
+        # Una sola consulta para las organizaciones que ya existen
+        existing = dict(session.execute(
+            select(Organizacion.nombre, Organizacion.id).where(Organizacion.nombre.in_(names))
+        ).all())
+        self.organizacion_id_map.update(existing)
+        
+        missing = [nombre for nombre in names if nombre not in existing]
+        if not missing:
+            return
+        
+        # Primera aparición de cada nombre, con los mismos defaults que antes
+        orgs = _prepare_df(
+            df.drop_duplicates('nombre'),
+            {'nombre': None, 'tipo_organizacion': None, 'estado': 'ACTIVO'}
+        )
+        records = orgs[orgs['nombre'].isin(missing)].to_dict('records')
+        
+        # Insert masivo; RETURNING completa el mapeo nombre -> id
+        rows = session.execute(
+            insert(Organizacion).returning(Organizacion.id, Organizacion.nombre),
+            records
+        ).all()
+        for org_id, nombre in rows:
+            self.organizacion_id_map[nombre] = org_id
+        self.stats['organizaciones_insertadas'] += len(rows)
                     
     def _load_ubicaciones(self, df: pd.DataFrame, session: Session):
-        """Carga ubicaciones únicas."""
-        for _, row in df.iterrows():
-            try:
-                # Crear clave única
-                key = f"{row['canton']}|{row.get('parroquia', '')}|{row.get('localidad', '')}"
-                
-                # Verificar si existe
-                ubi = session.query(Ubicacion).filter_by(
-                    canton=row['canton'],
-                    parroquia=row.get('parroquia'),
-                    localidad=row.get('localidad')
-                ).first()
-                
-                if not ubi:
-                    ubi = Ubicacion(
-                        canton=row['canton'],
-                        parroquia=row.get('parroquia'),
-                        localidad=row.get('localidad'),
-                        coordenada_x=row.get('coordenada_x'),
-                        coordenada_y=row.get('coordenada_y'),
-                        tipo_ubicacion=row.get('tipo_ubicacion', 'RURAL')
-                    )
-                    session.add(ubi)
-                    session.flush()
-                    self.stats['ubicaciones_insertadas'] += 1
-                    
-                # Guardar mapeo
-                self.ubicacion_id_map[key] = ubi.id
-                
-            except IntegrityError:
-                session.rollback()
-                # Obtener existente
-                ubi = session.query(Ubicacion).filter_by(
-                    canton=row['canton'],
-                    parroquia=row.get('parroquia'),
-                    localidad=row.get('localidad')
-                ).first()
-                if ubi:
-                    self.ubicacion_id_map[key] = ubi.id
+        """Carga ubicaciones únicas con una consulta previa y un insert masivo."""
+        key_cols = ['canton', 'parroquia', 'localidad']
+        ubis = _prepare_df(df, {
+            'canton': None, 'parroquia': None, 'localidad': None,
+            'coordenada_x': None, 'coordenada_y': None, 'tipo_ubicacion': 'RURAL'
+        })
+        first = ~ubis.duplicated(key_cols).to_numpy()
+        ubis = ubis[first]
+        
+        # Clave canton|parroquia|localidad del mapeo, calculada de una vez para todo el
+        # batch con el mismo formato que el f-string original (valores sin preparar)
+        raw = df.reindex(columns=key_cols, fill_value='').astype(str)[first]
+        map_keys = raw['canton'].str.cat([raw['parroquia'], raw['localidad']], sep='|')
+        
+        # Las claves ya mapeadas en batches anteriores no vuelven a consultarse
+        unseen = ~map_keys.isin(list(self.ubicacion_id_map)).to_numpy()
+        ubis = ubis[unseen]
+        map_keys = map_keys.to_numpy()[unseen]
+        keys = list(ubis[key_cols].itertuples(index=False, name=None))
+        if not keys:
+            return
+        
+        # Una sola consulta por los cantones del batch. NULL no iguala en IN, así que
+        # un canton NULL se busca con IS NULL; la clave completa se compara en Python,
+        # donde None == None equivale a IS NOT DISTINCT FROM para parroquia/localidad
+        cantones = {canton for canton, _, _ in keys}
+        condiciones = [Ubicacion.canton.in_([canton for canton in cantones if canton is not None])]
+        if None in cantones:
+            condiciones.append(Ubicacion.canton.is_(None))
+        existing = {
+            (canton, parroquia, localidad): ubi_id
+            for ubi_id, canton, parroquia, localidad in session.execute(
+                select(Ubicacion.id, Ubicacion.canton, Ubicacion.parroquia, Ubicacion.localidad)
+                .where(or_(*condiciones))
+            )
+        }
+        
+        found = np.array([key in existing for key in keys], dtype=bool)
+        self.ubicacion_id_map.update(
+            zip(map_keys[found], (existing[key] for key, hit in zip(keys, found) if hit))
+        )
+        
+        records = ubis[~found].to_dict('records')
+        if not records:
+            return
+        
+        # Insert masivo; los ids vuelven en el orden de records y se emparejan con sus claves
+        ids = session.execute(
+            insert(Ubicacion).returning(Ubicacion.id, sort_by_parameter_order=True),
+            records
+        ).scalars().all()
+        self.ubicacion_id_map.update(zip(map_keys[~found], ids))
+        self.stats['ubicaciones_insertadas'] += len(ids)
                     
     def _load_personas(self, df: pd.DataFrame, session: Session):
         """Carga personas con merge (insert o update)."""
         logger.info(f"Cargando {len(df)} personas")
         
-        # Filtrar completamente registros con nombres nulos ANTES de procesar
-        valid_df = df[df['nombres_apellidos'].notna() & (df['nombres_apellidos'].str.strip() != '')]
+        # Filtrar completamente registros con nombres nulos ANTES de procesar,
+        # y convertir edad a entero nullable, todo vectorizado y una sola vez
+        names = df['nombres_apellidos'].astype(NOMBRES_DTYPE).str.strip()
+        mask = names.notna() & names.ne('')
+        edad = np.trunc(pd.to_numeric(df['edad'], errors='coerce')) if 'edad' in df else pd.Series(np.nan, index=df.index)
+        valid_df = df.loc[mask].assign(
+            nombres_apellidos=names[mask].astype(object),
+            edad=edad[mask].astype('Int64').astype(object).where(edad[mask].notna(), None)
+        )
         logger.info(f"Personas válidas tras filtro: {len(valid_df)}/{len(df)}")
         
         if len(valid_df) == 0:
             logger.warning("No hay personas válidas para cargar")
             return
         
-        for idx, row in valid_df.iterrows():
-            try:
-                # Ya sabemos que el nombre es válido por el filtro anterior
-                nombres = row['nombres_apellidos']
-                    
-                # Crear savepoint para poder hacer rollback parcial
-                savepoint = session.begin_nested()
-                # Buscar por cédula si existe
-                persona = None
-                if pd.notna(row.get('cedula')):
-                    persona = session.query(PersonaBase).filter_by(
-                        cedula=row['cedula']
-                    ).first()
-                
-                if persona:
-                    # Actualizar datos
-                    persona.nombres_apellidos = nombres
-                    persona.telefono = row.get('telefono')
-                    persona.genero = row.get('genero')
-                    # Manejar edad NaN
-                    edad = row.get('edad')
-                    persona.edad = int(edad) if pd.notna(edad) else None
-                    self.stats['personas_actualizadas'] += 1
-                    # Guardar mapeo
-                    key = row.get('cedula') if pd.notna(row.get('cedula')) else nombres
-                    self.persona_id_map[key] = persona.id
-                else:
-                    # Insertar nueva
-                    edad = row.get('edad')
-                    edad_val = int(edad) if pd.notna(edad) else None
-                    
-                    # Verificación final antes de crear el objeto
-                    nombres_final = row['nombres_apellidos']
-                    if nombres_final is None or str(nombres_final).strip() == '':
-                        logger.error(f"Intento de insertar persona sin nombre en índice {idx}")
-                        continue
-                    
-                    persona = PersonaBase(
-                        cedula=row.get('cedula'),
-                        nombres_apellidos=nombres_final,
-                        telefono=row.get('telefono'),
-                        genero=row.get('genero'),
-                        edad=edad_val,
-                        is_active=True
-                    )
-                    session.add(persona)
-                    # Hacer commit individual para evitar bulk insert problemático
-                    try:
-                        session.flush()
-                        self.stats['personas_insertadas'] += 1
-                        # Guardar mapeo ahora que tenemos el ID
-                        key = row.get('cedula') if pd.notna(row.get('cedula')) else nombres_final
-                        self.persona_id_map[key] = persona.id
-                    except Exception as e:
-                        logger.error(f"Error insertando persona {nombres_final}: {str(e)}")
-                        session.rollback()
-                        raise
-                
-                # Commit del savepoint
-                savepoint.commit()
-                
-            except Exception as e:
-                logger.error(f"Error insertando persona: {str(e)}")
-                self.stats['errores'] += 1
-                # Rollback solo de este registro
-                savepoint.rollback()
-                
+        # Sin savepoints: los inserts corren en la transacción del batch y cualquier
+        # error lo revierte completo en el except de load_batch
+        personas = _prepare_df(valid_df, {
+            'cedula': None, 'nombres_apellidos': None, 'telefono': None,
+            'genero': None, 'edad': None, 'is_active': True
+        })
+        
+        # Con cédula: un solo INSERT ... ON CONFLICT (cedula) DO UPDATE. Si la cédula
+        # se repite en el batch gana la última fila, como en la carga fila a fila.
+        # xmax = 0 en RETURNING distingue las filas insertadas de las actualizadas.
+        has_cedula = personas[personas['cedula'].notna()].drop_duplicates('cedula', keep='last')
+        if len(has_cedula):
+            stmt = pg_insert(PersonaBase).values(has_cedula.to_dict('records'))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[PersonaBase.cedula],
+                set_=dict(
+                    nombres_apellidos=stmt.excluded.nombres_apellidos,
+                    telefono=stmt.excluded.telefono,
+                    genero=stmt.excluded.genero,
+                    edad=stmt.excluded.edad
+                )
+            ).returning(PersonaBase.id, PersonaBase.cedula, literal_column('xmax = 0'))
+            rows = session.execute(stmt).all()
+            insertadas = sum(1 for _, _, inserted in rows if inserted)
+            self.stats['personas_insertadas'] += insertadas
+            self.stats['personas_actualizadas'] += len(rows) - insertadas
+            self.persona_id_map.update({cedula: persona_id for persona_id, cedula, _ in rows})
+        
+        # Sin cédula: insert masivo; el mapeo se hace por nombre
+        no_cedula = personas[personas['cedula'].isna()]
+        if len(no_cedula):
+            stmt = insert(PersonaBase).returning(PersonaBase.id, PersonaBase.nombres_apellidos)
+            rows = session.execute(stmt, no_cedula.to_dict('records')).all()
+            self.stats['personas_insertadas'] += len(rows)
+            self.persona_id_map.update({nombres: persona_id for persona_id, nombres in rows})
+    
     def _load_personas_agricultores(self, df: pd.DataFrame, session: Session):
-        """Carga información de agricultores."""
-        for _, row in df.iterrows():
-            try:
-                persona_id = row.get('persona_id')
-                
-                # Verificar si ya existe
-                agricultor = session.query(PersonaAgricultor).filter_by(
-                    persona_id=persona_id
-                ).first()
-                
-                if not agricultor:
-                    agricultor = PersonaAgricultor(
-                        persona_id=persona_id,
-                        tipo_productor=row.get('tipo_productor', 'AGRICULTOR'),
-                        hectarias_totales=row.get('hectarias_totales'),
-                        organizacion_id=row.get('organizacion_id')
-                    )
-                    session.add(agricultor)
-                else:
-                    # Actualizar si hay cambios
-                    if row.get('hectarias_totales'):
-                        agricultor.hectarias_totales = row['hectarias_totales']
-                    if row.get('organizacion_id'):
-                        agricultor.organizacion_id = row['organizacion_id']
-                        
-            except Exception as e:
-                logger.error(f"Error con agricultor: {str(e)}")
-                self.stats['errores'] += 1
+        """Carga información de agricultores con un insert y un update masivos."""
+        agricultores = _prepare_df(df, {
+            'persona_id': None, 'tipo_productor': 'AGRICULTOR',
+            'hectarias_totales': None, 'organizacion_id': None
+        })
+        agricultores = agricultores[agricultores['persona_id'].notna()]
+        agricultores = agricultores.drop_duplicates('persona_id', keep='last')
+        if len(agricultores) == 0:
+            return
+        
+        # Una sola consulta por los agricultores que ya existen
+        existing = dict(session.execute(
+            select(PersonaAgricultor.persona_id, PersonaAgricultor.id)
+            .where(PersonaAgricultor.persona_id.in_(agricultores['persona_id'].tolist()))
+        ).all())
+        
+        # Máscaras calculadas una vez como arrays booleanos; sin pd.notna por fila
+        is_new = ~agricultores['persona_id'].isin(list(existing)).to_numpy()
+        new_records = agricultores[is_new].to_dict('records')
+        
+        existentes = agricultores[~is_new]
+        existentes = existentes.assign(id=[existing[pid] for pid in existentes['persona_id']])
+        hect_ok = existentes['hectarias_totales'].notna().to_numpy()
+        org_ok = existentes['organizacion_id'].notna().to_numpy()
+        
+        # Actualizar solo los campos que traen valor; cada grupo comparte las mismas columnas
+        updates = (
+            existentes.loc[hect_ok & org_ok, ['id', 'hectarias_totales', 'organizacion_id']].to_dict('records')
+            + existentes.loc[hect_ok & ~org_ok, ['id', 'hectarias_totales']].to_dict('records')
+            + existentes.loc[~hect_ok & org_ok, ['id', 'organizacion_id']].to_dict('records')
+        )
+        
+        if new_records:
+            session.execute(insert(PersonaAgricultor), new_records)
+        if updates:
+            # UPDATE masivo por clave primaria (SQLAlchemy 2.x)
+            session.execute(update(PersonaAgricultor), updates)
                 
     def _load_beneficios(self, df: pd.DataFrame, session: Session):
-        """Carga beneficios de semillas."""
-        for _, row in df.iterrows():
-            try:
-                # Crear beneficio base
-                beneficio_base = BeneficioBase(
-                    persona_id=row['persona_id'],
-                    ubicacion_id=row.get('ubicacion_id')
-                )
-                session.add(beneficio_base)
-                session.flush()
-                
-                # Crear beneficio semillas
-                beneficio_semillas = BeneficioSemillas(
-                    beneficio_id=beneficio_base.id,
-                    cultivo=row.get('cultivo'),
-                    hectarias_beneficiadas=row.get('hectarias_beneficiadas'),
-                    precio_unitario=row.get('precio_unitario'),
-                    inversion=row.get('inversion'),
-                    quintil=row.get('quintil'),
-                    score_quintil=row.get('score_quintil'),
-                    numero_acta=row.get('numero_acta'),
-                    documento=row.get('documento'),
-                    proceso=row.get('proceso'),
-                    fecha_retiro=row.get('fecha_retiro'),
-                    anio=row.get('anio'),
-                    responsable_agencia=row.get('responsable_agencia'),
-                    cedula_jefe_sucursal=row.get('cedula_jefe_sucursal'),
-                    sucursal=row.get('sucursal'),
-                    observacion=row.get('observacion'),
-                    estado='ACTIVO'
-                )
-                session.add(beneficio_semillas)
-                self.stats['beneficios_insertados'] += 1
+        """Carga beneficios de semillas con dos inserts masivos (base y detalle)."""
+        # Sin persona el beneficio base no se puede insertar
+        con_persona = df['persona_id'].notna()
+        sin_persona = int((~con_persona).sum())
+        if sin_persona:
+            logger.warning(f"{sin_persona} beneficios sin persona_id")
+            self.stats['errores'] += sin_persona
+            df = df[con_persona]
+        if len(df) == 0:
+            return
+        
+        # Constante de todo el DataFrame: una columna asignada una vez
+        df = df.assign(estado='ACTIVO')
+        
+        # Cada chunk son dos executemany de INSERT ... VALUES multi-fila
+        for start in range(0, len(df), INSERT_CHUNK_SIZE):
+            chunk = df.iloc[start:start + INSERT_CHUNK_SIZE]
+            
+            base_records = _prepare_df(chunk, {'persona_id': None, 'ubicacion_id': None}).to_dict('records')
+            
+            # sort_by_parameter_order garantiza que los ids vuelvan en el orden de los registros
+            stmt = insert(BeneficioBase).returning(BeneficioBase.id, sort_by_parameter_order=True)
+            ids = session.execute(stmt, base_records).scalars().all()
+            
+            semillas = _prepare_df(chunk, dict.fromkeys(BENEFICIO_SEMILLAS_COLUMNS + ['estado']))
+            semillas = semillas.assign(beneficio_id=ids)
+            if session.get_bind().dialect.name == 'postgresql':
+                # Tabla más grande del loader: COPY evita el costo de executemany
+                self._copy_dataframe(session, BeneficioSemillas.__table__, semillas)
+            else:
+                session.execute(insert(BeneficioSemillas), semillas.to_dict('records'))
+            self.stats['beneficios_insertados'] += len(semillas)
                 
-            except Exception as e:
-                logger.error(f"Error insertando beneficio: {str(e)}")
-                self.stats['errores'] += 1
+    @staticmethod
+    def _copy_dataframe(session: Session, table, df: pd.DataFrame):
+        """Inserta un DataFrame con COPY ... FROM STDIN (CSV) sobre la conexión de la sesión."""
+        # Los enteros que pasaron por float (por NaN) se escribirían como '2024.0'
+        df = df.copy()
+        for column in table.columns:
+            if column.name in df and isinstance(column.type, Integer):
+                df[column.name] = pd.to_numeric(df[column.name]).astype('Int64')
+        
+        buffer = io.StringIO()
+        df.to_csv(buffer, index=False, header=False, na_rep=COPY_NULL)
+        buffer.seek(0)
+        
+        preparer = session.get_bind().dialect.identifier_preparer
+        columns = ', '.join(preparer.quote(name) for name in df.columns)
+        copy_sql = (
+            f"COPY {preparer.format_table(table)} ({columns}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        )
+        # Conexión DBAPI (psycopg2) de la misma transacción de la sesión
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(copy_sql, buffer)
+        finally:
+            cursor.close()
                 
     def get_summary(self) -> Dict:
         """Retorna resumen de la carga."""
@@ -102,21 +102,22 @@ def test_id_mapping():
         logger.info(f"  Beneficios: {beneficios_count}")
         logger.info(f"  Beneficiarios: {beneficiarios_count}")
             
-        # Verificar relaciones
-        beneficios = session.execute(select(BeneficioSemillas)).scalars().all()
-        for beneficio in beneficios:
+        # Verificar relaciones: una sola consulta con LEFT JOIN en lugar de
+        # dos session.get por beneficio; NULL indica relación no encontrada
+        rows = session.execute(
+            select(BeneficioSemillas, PersonaBase.nombres_apellidos, Ubicacion.canton)
+            .outerjoin(PersonaBase, BeneficioSemillas.persona_id == PersonaBase.id)
+            .outerjoin(Ubicacion, BeneficioSemillas.ubicacion_id == Ubicacion.id)
+        ).all()
+        for beneficio, nombres_apellidos, canton in rows:
             logger.info(f"\nBeneficio ID {beneficio.id}:")
             logger.info(f"  Persona ID: {beneficio.persona_id}")
             logger.info(f"  Ubicacion ID: {beneficio.ubicacion_id}")
             logger.info(f"  Cultivo: {beneficio.cultivo}")
             logger.info(f"  Valor monetario: ${beneficio.valor_monetario}")
-                
-            # Verificar que las relaciones existen
-            persona = session.get(PersonaBase, beneficio.persona_id)
-            ubicacion = session.get(Ubicacion, beneficio.ubicacion_id)
             
-            logger.info(f"  Persona: {persona.nombres_apellidos if persona else 'NO ENCONTRADA'}")
-            logger.info(f"  Ubicacion: {ubicacion.canton if ubicacion else 'NO ENCONTRADA'}")
+            logger.info(f"  Persona: {nombres_apellidos if nombres_apellidos is not None else 'NO ENCONTRADA'}")
+            logger.info(f"  Ubicacion: {canton if canton is not None else 'NO ENCONTRADA'}")
             
         logger.info("\n=== PRUEBA COMPLETADA EXITOSAMENTE ===")
 
@@ -1,44 +1,58 @@
 """Test simple insert without batch complexity."""
 import pandas as pd
+from sqlalchemy import select
 from src.transform.semillas_transformer_batch import SemillasTransformerBatch
 from config.connections.database import DatabaseConnection
 from src.models.operational.staging.semillas_stg_model import StgSemilla
 
-# Get first 5 records and transform them
+# Rows to pull from staging and rows per streamed chunk
+LIMIT = 5
+CHUNK_SIZE = 10_000
+
+
+def iter_stg_chunks(session, size=CHUNK_SIZE, limit=None):
+    """Yield unprocessed staging rows as DataFrames of at most `size` rows.
+
+    Uses a server-side cursor, so memory stays bounded by one chunk no matter
+    how many rows staging holds. The cursor lives in the session's transaction:
+    do not commit until the generator is exhausted.
+    """
+    stmt = select(StgSemilla.__table__).where(
+        StgSemilla.processed == False
+    ).order_by(StgSemilla.id).limit(limit)
+    result = session.connection().execution_options(
+        stream_results=True, yield_per=size
+    ).execute(stmt)
+    columns = list(result.keys())
+    for partition in result.partitions():
+        yield pd.DataFrame.from_records(partition, columns=columns)
+
+
 db = DatabaseConnection()
 with db.get_session() as session:
-    records = session.query(StgSemilla).filter(
-        StgSemilla.processed == False
-    ).order_by(StgSemilla.id).limit(5).all()
-    
-    # Convert to DataFrame
-    data = []
-    for record in records:
-        row_dict = {col.name: getattr(record, col.name) 
-                   for col in record.__table__.columns}
-        data.append(row_dict)
-        
-    df = pd.DataFrame(data)
-    
-    # Transform
-    transformer = SemillasTransformerBatch(batch_size=5)
-    entities = transformer._transform_batch(df)
-    
-    print(f"Persons to insert: {len(entities['personas'])}")
-    print(f"Names: {entities['personas']['nombres_apellidos'].tolist()}")
-    
-    # Try simple load
+    transformer = SemillasTransformerBatch(batch_size=min(LIMIT, CHUNK_SIZE))
+
+    # Clear mappings first
+    transformer.operational_loader.persona_id_map.clear()
+    transformer.operational_loader.ubicacion_id_map.clear()
+    transformer.operational_loader.organizacion_id_map.clear()
+
+    # Try simple load, transforming and loading each chunk as it is read
     try:
-        # Clear mappings first
-        transformer.operational_loader.persona_id_map.clear()
-        transformer.operational_loader.ubicacion_id_map.clear()
-        transformer.operational_loader.organizacion_id_map.clear()
-        
-        # Load
-        stats = transformer.operational_loader.load_batch(entities, session)
+        for df in iter_stg_chunks(session, limit=LIMIT):
+            # Transform
+            entities = transformer._transform_batch(df)
+
+            print(f"Persons to insert: {len(entities['personas'])}")
+            print(f"Names: {entities['personas']['nombres_apellidos'].tolist()}")
+
+            # Load
+            transformer.operational_loader.load_batch(entities, session)
+
+        # Commit only after the stream is exhausted: it closes the cursor
         session.commit()
         print("Success!")
-        print(f"Stats: {stats}")
+        print(f"Stats: {transformer.operational_loader.get_summary()}")
     except Exception as e:
         print(f"Error: {e}")
-        session.rollback()
\ No newline at end of file
+        session.rollback()
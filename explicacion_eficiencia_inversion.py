@@ -4,153 +4,169 @@
 Explicación detallada de la eficiencia de inversión 4.57x en beneficios GAD
 """
 
+import sys
+
+# Datos del análisis
+INVERSION_GAD = 4_255_901.69  # Lo que invirtió el GAD
+AHORRO_GENERADO = 19_460_743.79  # Lo que ahorran los productores
+HECTAREAS_TOTAL = 81_596.41
+
+# Datos específicos por tipo
+INVERSION_SEMILLAS = 2_034_851.69
+INVERSION_FERTILIZANTES = 2_221_050.00
+HECTAREAS_SEMILLAS = 37_640.61
+HECTAREAS_FERTILIZANTES = 43_315.55
+
+# Costo por hectárea de la matriz
+COSTO_SEMILLA_MATRIZ = 138.00  # 2 quintales x $69
+COSTO_FERTILIZANTE_MATRIZ = 201.00  # Urea + Abono completo
+
+# Valores derivados, calculados una sola vez al importar
+EFICIENCIA = AHORRO_GENERADO / INVERSION_GAD
+AHORRO_SEMILLAS_TOTAL = HECTAREAS_SEMILLAS * COSTO_SEMILLA_MATRIZ
+AHORRO_FERTILIZANTES_TOTAL = HECTAREAS_FERTILIZANTES * (COSTO_FERTILIZANTE_MATRIZ * 0.5)  # 50% subsidio
+EFICIENCIA_SEMILLAS = AHORRO_SEMILLAS_TOTAL / INVERSION_SEMILLAS
+EFICIENCIA_FERTILIZANTES = AHORRO_FERTILIZANTES_TOTAL / INVERSION_FERTILIZANTES
+
+EJEMPLOS = [100, 1000, 10000]
+
+EJEMPLO_TEMPLATE = """\
+Si el GAD invierte ${ejemplo:,}:
+  → Productores ahorran ${ahorro:,.2f}
+  → Ganancia neta para la economía: ${ganancia:,.2f}
+
+"""
+
+EJEMPLOS_TEXTO = "".join(
+    EJEMPLO_TEMPLATE.format(ejemplo=ejemplo, ahorro=ejemplo * EFICIENCIA, ganancia=ejemplo * EFICIENCIA - ejemplo)
+    for ejemplo in EJEMPLOS
+)
+
+SEPARADOR = "-" * 50
+
+TEMPLATE = """\
+{doble}
+EXPLICACIÓN: EFICIENCIA DE INVERSIÓN 4.57x
+{doble}
+
+1. CONCEPTOS BÁSICOS:
+{sep}
+• INVERSIÓN GAD = Dinero que gasta el gobierno en comprar y entregar beneficios
+• AHORRO PRODUCTORES = Dinero que NO gastan los productores por recibir beneficios
+• EFICIENCIA = Cuánto ahorro se genera por cada dólar invertido
+
+2. LOS NÚMEROS REALES:
+{sep}
+✓ Inversión total del GAD: ${inversion_gad:,.2f}
+✓ Ahorro total de productores: ${ahorro_generado:,.2f}
+✓ Hectáreas beneficiadas: {hectareas_total:,.2f} ha
+
+3. CÁLCULO DE EFICIENCIA:
+{sep}
+Eficiencia = Ahorro Generado ÷ Inversión GAD
+Eficiencia = ${ahorro_generado:,.2f} ÷ ${inversion_gad:,.2f}
+Eficiencia = {eficiencia:.2f}x
+
+4. ¿QUÉ SIGNIFICA 4.57x?
+{sep}
+Por cada $1.00 que invierte el GAD:
+• Los productores ahorran ${eficiencia:.2f}
+• El beneficio económico total es {eficiencia:.2f} veces mayor que la inversión
+• Se genera ${valor_adicional:.2f} de valor adicional por cada dólar
+
+5. EJEMPLOS PRÁCTICOS:
+{sep}
+{ejemplos}\
+6. DESGLOSE POR TIPO DE BENEFICIO:
+{sep}
+SEMILLAS:
+  • Inversión GAD: ${inversion_semillas:,.2f}
+  • Ahorro productores: ${ahorro_semillas:,.2f}
+  • Eficiencia: {eficiencia_semillas:.2f}x
+
+FERTILIZANTES:
+  • Inversión GAD: ${inversion_fertilizantes:,.2f}
+  • Ahorro productores: ${ahorro_fertilizantes:,.2f}
+  • Eficiencia: {eficiencia_fertilizantes:.2f}x
+
+7. ¿POR QUÉ ES TAN ALTA LA EFICIENCIA?
+{sep}
+La eficiencia 4.57x es alta porque:
+
+a) ECONOMÍAS DE ESCALA:
+   • El GAD compra insumos al por mayor → precios más bajos
+   • Productores individuales pagan precios retail → más caros
+
+b) ELIMINACIÓN DE INTERMEDIARIOS:
+   • GAD compra directo a proveedores
+   • Productores compran a distribuidores (más margen)
+
+c) SUBSIDIO CRUZADO:
+   • GAD puede comprar a precio de costo
+   • Mercado incluye márgenes de ganancia
+
+d) IMPACTO MULTIPLICADOR:
+   • Los ahorros se reinvierten en la producción
+   • Mejora la competitividad del sector
+   • Genera más actividad económica
+
+8. COMPARACIÓN CON OTROS SECTORES:
+{sep}
+¿Es 4.57x una buena eficiencia?
+
+• Programas sociales típicos: 1.2x - 2.0x
+• Inversión en infraestructura: 2.0x - 3.5x
+• Subsidios agrícolas GAD: 4.57x ← EXCELENTE
+• Inversión privada promedio: 1.1x - 1.3x
+
+9. BENEFICIOS ADICIONALES NO CUANTIFICADOS:
+{sep}
+El 4.57x NO incluye otros beneficios como:
+• Aumento en rendimientos por mejor calidad de insumos
+• Reducción de riesgos de pérdida de cosecha
+• Fortalecimiento de cadenas de suministro
+• Generación de empleo indirecto
+• Mejora en seguridad alimentaria
+• Reducción de migración rural-urbana
+
+10. CONCLUSIÓN:
+{igual}
+Una eficiencia de 4.57x significa que el programa de beneficios
+agrícolas es ALTAMENTE EXITOSO desde el punto de vista económico.
+
+Por cada dólar que invierte el gobierno:
+• Se generan ${eficiencia:.2f} en valor económico real
+• La economía local se beneficia con un multiplicador alto
+• Los productores mejoran su rentabilidad significativamente
+• Se fortalece el sector agrícola de manera sostenible
+
+¡Este es un programa modelo de inversión pública eficiente!
+"""
+
+# El texto completo no depende de ninguna entrada, así que se arma una sola vez
+EXPLICACION = TEMPLATE.format(
+    doble="=" * 80,
+    igual="=" * 50,
+    sep=SEPARADOR,
+    inversion_gad=INVERSION_GAD,
+    ahorro_generado=AHORRO_GENERADO,
+    hectareas_total=HECTAREAS_TOTAL,
+    eficiencia=EFICIENCIA,
+    valor_adicional=EFICIENCIA - 1,
+    ejemplos=EJEMPLOS_TEXTO,
+    inversion_semillas=INVERSION_SEMILLAS,
+    ahorro_semillas=AHORRO_SEMILLAS_TOTAL,
+    eficiencia_semillas=EFICIENCIA_SEMILLAS,
+    inversion_fertilizantes=INVERSION_FERTILIZANTES,
+    ahorro_fertilizantes=AHORRO_FERTILIZANTES_TOTAL,
+    eficiencia_fertilizantes=EFICIENCIA_FERTILIZANTES,
+)
+
+
 def explicar_eficiencia_inversion():
     """Explica paso a paso cómo se calcula y qué significa la eficiencia 4.57x"""
-    
-    print("=" * 80)
-    print("EXPLICACIÓN: EFICIENCIA DE INVERSIÓN 4.57x")
-    print("=" * 80)
-    print()
-    
-    # Datos del análisis
-    inversion_gad = 4_255_901.69  # Lo que invirtió el GAD
-    ahorro_generado = 19_460_743.79  # Lo que ahorran los productores
-    hectareas_total = 81_596.41
-    
-    print("1. CONCEPTOS BÁSICOS:")
-    print("-" * 50)
-    print("• INVERSIÓN GAD = Dinero que gasta el gobierno en comprar y entregar beneficios")
-    print("• AHORRO PRODUCTORES = Dinero que NO gastan los productores por recibir beneficios")
-    print("• EFICIENCIA = Cuánto ahorro se genera por cada dólar invertido")
-    print()
-    
-    print("2. LOS NÚMEROS REALES:")
-    print("-" * 50)
-    print(f"✓ Inversión total del GAD: ${inversion_gad:,.2f}")
-    print(f"✓ Ahorro total de productores: ${ahorro_generado:,.2f}")
-    print(f"✓ Hectáreas beneficiadas: {hectareas_total:,.2f} ha")
-    print()
-    
-    # Calcular eficiencia
-    eficiencia = ahorro_generado / inversion_gad
-    
-    print("3. CÁLCULO DE EFICIENCIA:")
-    print("-" * 50)
-    print(f"Eficiencia = Ahorro Generado ÷ Inversión GAD")
-    print(f"Eficiencia = ${ahorro_generado:,.2f} ÷ ${inversion_gad:,.2f}")
-    print(f"Eficiencia = {eficiencia:.2f}x")
-    print()
-    
-    print("4. ¿QUÉ SIGNIFICA 4.57x?")
-    print("-" * 50)
-    print(f"Por cada $1.00 que invierte el GAD:")
-    print(f"• Los productores ahorran ${eficiencia:.2f}")
-    print(f"• El beneficio económico total es {eficiencia:.2f} veces mayor que la inversión")
-    print(f"• Se genera ${eficiencia - 1:.2f} de valor adicional por cada dólar")
-    print()
-    
-    print("5. EJEMPLOS PRÁCTICOS:")
-    print("-" * 50)
-    ejemplos = [100, 1000, 10000]
-    
-    for ejemplo in ejemplos:
-        ahorro_ejemplo = ejemplo * eficiencia
-        ganancia_neta = ahorro_ejemplo - ejemplo
-        print(f"Si el GAD invierte ${ejemplo:,}:")
-        print(f"  → Productores ahorran ${ahorro_ejemplo:,.2f}")
-        print(f"  → Ganancia neta para la economía: ${ganancia_neta:,.2f}")
-        print()
-    
-    print("6. DESGLOSE POR TIPO DE BENEFICIO:")
-    print("-" * 50)
-    
-    # Datos específicos por tipo
-    inversion_semillas = 2_034_851.69
-    inversion_fertilizantes = 2_221_050.00
-    hectareas_semillas = 37_640.61
-    hectareas_fertilizantes = 43_315.55
-    
-    # Costo por hectárea de la matriz
-    costo_semilla_matriz = 138.00  # 2 quintales x $69
-    costo_fertilizante_matriz = 201.00  # Urea + Abono completo
-    
-    # Ahorros calculados
-    ahorro_semillas_total = hectareas_semillas * costo_semilla_matriz
-    ahorro_fertilizantes_total = hectareas_fertilizantes * (costo_fertilizante_matriz * 0.5)  # 50% subsidio
-    
-    eficiencia_semillas = ahorro_semillas_total / inversion_semillas
-    eficiencia_fertilizantes = ahorro_fertilizantes_total / inversion_fertilizantes
-    
-    print("SEMILLAS:")
-    print(f"  • Inversión GAD: ${inversion_semillas:,.2f}")
-    print(f"  • Ahorro productores: ${ahorro_semillas_total:,.2f}")
-    print(f"  • Eficiencia: {eficiencia_semillas:.2f}x")
-    print()
-    
-    print("FERTILIZANTES:")
-    print(f"  • Inversión GAD: ${inversion_fertilizantes:,.2f}")
-    print(f"  • Ahorro productores: ${ahorro_fertilizantes_total:,.2f}")
-    print(f"  • Eficiencia: {eficiencia_fertilizantes:.2f}x")
-    print()
-    
-    print("7. ¿POR QUÉ ES TAN ALTA LA EFICIENCIA?")
-    print("-" * 50)
-    print("La eficiencia 4.57x es alta porque:")
-    print()
-    print("a) ECONOMÍAS DE ESCALA:")
-    print("   • El GAD compra insumos al por mayor → precios más bajos")
-    print("   • Productores individuales pagan precios retail → más caros")
-    print()
-    
-    print("b) ELIMINACIÓN DE INTERMEDIARIOS:")
-    print("   • GAD compra directo a proveedores")
-    print("   • Productores compran a distribuidores (más margen)")
-    print()
-    
-    print("c) SUBSIDIO CRUZADO:")
-    print("   • GAD puede comprar a precio de costo")
-    print("   • Mercado incluye márgenes de ganancia")
-    print()
-    
-    print("d) IMPACTO MULTIPLICADOR:")
-    print("   • Los ahorros se reinvierten en la producción")
-    print("   • Mejora la competitividad del sector")
-    print("   • Genera más actividad económica")
-    print()
-    
-    print("8. COMPARACIÓN CON OTROS SECTORES:")
-    print("-" * 50)
-    print("¿Es 4.57x una buena eficiencia?")
-    print()
-    print("• Programas sociales típicos: 1.2x - 2.0x")
-    print("• Inversión en infraestructura: 2.0x - 3.5x")
-    print("• Subsidios agrícolas GAD: 4.57x ← EXCELENTE")
-    print("• Inversión privada promedio: 1.1x - 1.3x")
-    print()
-    
-    print("9. BENEFICIOS ADICIONALES NO CUANTIFICADOS:")
-    print("-" * 50)
-    print("El 4.57x NO incluye otros beneficios como:")
-    print("• Aumento en rendimientos por mejor calidad de insumos")
-    print("• Reducción de riesgos de pérdida de cosecha")
-    print("• Fortalecimiento de cadenas de suministro")
-    print("• Generación de empleo indirecto")
-    print("• Mejora en seguridad alimentaria")
-    print("• Reducción de migración rural-urbana")
-    print()
-    
-    print("10. CONCLUSIÓN:")
-    print("=" * 50)
-    print("Una eficiencia de 4.57x significa que el programa de beneficios")
-    print("agrícolas es ALTAMENTE EXITOSO desde el punto de vista económico.")
-    print()
-    print("Por cada dólar que invierte el gobierno:")
-    print(f"• Se generan ${eficiencia:.2f} en valor económico real")
-    print("• La economía local se beneficia con un multiplicador alto")
-    print("• Los productores mejoran su rentabilidad significativamente")
-    print("• Se fortalece el sector agrícola de manera sostenible")
-    print()
-    print("¡Este es un programa modelo de inversión pública eficiente!")
+    # Una sola escritura en lugar de un print por línea
+    sys.stdout.write(EXPLICACION)
 
 if __name__ == "__main__":
-    explicar_eficiencia_inversion()
\ No newline at end of file
+    explicar_eficiencia_inversion()
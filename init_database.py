@@ -38,7 +38,7 @@ def init_database():
         print("✅ Conexión establecida")
         
         print("📊 Creando todas las tablas...")
-        Base.metadata.create_all(engine)
+        db.create_all_tables(Base)
         
         print("✅ Tablas creadas exitosamente")
         
@@ -60,22 +60,19 @@ def init_database():
         # Insertar tipos de cultivo básicos
         print("\n🌱 Insertando tipos de cultivo básicos...")
         with engine.connect() as conn:
-            # Verificar si ya existen tipos de cultivo
-            check_query = '''SELECT COUNT(*) as count FROM "etl-productivo".tipo_cultivo;'''
-            result = conn.execute(text(check_query))
-            count = result.fetchone().count
-            
-            if count == 0:
-                insert_cultivos = '''
-                INSERT INTO "etl-productivo".tipo_cultivo (nombre) VALUES 
-                ('ARROZ'),
-                ('MAIZ'),
-                ('CACAO'),
-                ('OTROS');
-                '''
-                conn.execute(text(insert_cultivos))
-                conn.commit()
-                print("   ✅ Tipos de cultivo insertados")
+            # Un solo viaje: idempotente gracias a la restricción única de nombre
+            insert_cultivos = '''
+            INSERT INTO "etl-productivo".tipo_cultivo (nombre) VALUES 
+            ('ARROZ'),
+            ('MAIZ'),
+            ('CACAO'),
+            ('OTROS')
+            ON CONFLICT (nombre) DO NOTHING;
+            '''
+            result = conn.execute(text(insert_cultivos))
+            conn.commit()
+            if result.rowcount:
+                print(f"   ✅ Tipos de cultivo insertados: {result.rowcount}")
             else:
                 print("   ✅ Tipos de cultivo ya existen")
         
@@ -1,29 +1,40 @@
 #!/usr/bin/env python3
 """Script para inicializar la base de datos con los modelos refactorizados."""
 
+import importlib
+from collections import Counter
+
 from config.connections.database import db_connection
 from src.models.base import Base
 
-# Importar modelos de staging
-from src.models.operational.staging.semillas_stg_model import StgSemilla
-from src.models.operational.staging.fertilizantes_stg_model import StgFertilizante
-from src.models.operational.staging.mecanizacion_stg_model import StgMecanizacion
-from src.models.operational.staging.plantas_stg_model import StgPlantas
+# Módulos de modelos a registrar en Base.metadata. Se importan recién después
+# de verificar la conexión, para no pagar la construcción de clases si falla
+MODEL_MODULES = (
+    # Staging
+    'src.models.operational.staging.semillas_stg_model',
+    'src.models.operational.staging.fertilizantes_stg_model',
+    'src.models.operational.staging.mecanizacion_stg_model',
+    'src.models.operational.staging.plantas_stg_model',
+    # Operacionales refactorizados
+    'src.models.operational_refactored.direccion',
+    'src.models.operational_refactored.asociacion',
+    'src.models.operational_refactored.tipo_cultivo',
+    'src.models.operational_refactored.beneficiario',
+    'src.models.operational_refactored.beneficio',
+    'src.models.operational_refactored.beneficio_semillas',
+    'src.models.operational_refactored.beneficio_mecanizacion',
+    'src.models.operational_refactored.beneficio_plantas',
+    'src.models.operational_refactored.beneficiario_asociacion',
+    # Analíticos (existentes)
+    'src.models.analytical.dimensions',
+    'src.models.analytical.facts',
+)
 
-# Importar modelos operacionales refactorizados
-from src.models.operational_refactored.direccion import Direccion
-from src.models.operational_refactored.asociacion import Asociacion
-from src.models.operational_refactored.tipo_cultivo import TipoCultivo
-from src.models.operational_refactored.beneficiario import Beneficiario
-from src.models.operational_refactored.beneficio import Beneficio
-from src.models.operational_refactored.beneficio_semillas import BeneficioSemillas
-from src.models.operational_refactored.beneficio_mecanizacion import BeneficioMecanizacion
-from src.models.operational_refactored.beneficio_plantas import BeneficioPlanta
-from src.models.operational_refactored.beneficiario_asociacion import BeneficiarioAsociacion
 
-# Importar modelos analíticos (existentes)
-from src.models.analytical.dimensions import DimPersona, DimUbicacion, DimOrganizacion, DimTiempo, DimCultivo
-from src.models.analytical.facts import FactBeneficio
+def import_models():
+    """Importa los módulos de MODEL_MODULES, registrando sus tablas en Base.metadata."""
+    for module in MODEL_MODULES:
+        importlib.import_module(module)
 
 
 def init_database_refactored():
@@ -35,33 +46,46 @@ def init_database_refactored():
         print("No se pudo conectar a la base de datos. Verifica la configuración.")
         return
     
+    import_models()
+    
     print("\n--- Creando Schema ---")
     db_connection.create_schemas(['etl-productivo'])
     
     print("\n--- Creando Tablas ---")
     db_connection.create_all_tables(Base)
     
+    # create_all no agrega índices nuevos a tablas que ya existían
+    print("\n--- Verificando Índices de Staging ---")
+    for table_name in ('stg_semilla', 'stg_fertilizante'):
+        for index in Base.metadata.tables[f'etl-productivo.{table_name}'].indexes:
+            index.create(db_connection.engine, checkfirst=True)
+            print(f"✓ Índice '{index.name}' creado o ya existe")
+    
     print("\n--- Verificando Tablas Creadas ---")
     tables = db_connection.get_table_info()
     
     if tables:
         print("\nTablas encontradas:")
         current_schema = None
+        # Una sola pasada: imprime y clasifica cada tabla por capa
+        buckets = Counter()
         for schema, table, table_type in tables:
             if schema != current_schema:
                 current_schema = schema
                 print(f"\nSchema: {schema}")
             print(f"  - {table} ({table_type})")
+            if table.startswith('stg_'):
+                buckets['staging'] += 1
+            elif table.startswith(('dim_', 'fact_')):
+                buckets['analytical'] += 1
+            else:
+                buckets['operational'] += 1
         
         # Mostrar estadísticas por tipo de tabla
         print("\n--- Estadísticas por Tipo ---")
-        staging_tables = [t for s, t, _ in tables if t.startswith('stg_')]
-        operational_tables = [t for s, t, _ in tables if not t.startswith('stg_') and not t.startswith('dim_') and not t.startswith('fact_')]
-        analytical_tables = [t for s, t, _ in tables if t.startswith('dim_') or t.startswith('fact_')]
-        
-        print(f"Staging: {len(staging_tables)} tablas")
-        print(f"Operational: {len(operational_tables)} tablas")
-        print(f"Analytical: {len(analytical_tables)} tablas")
+        print(f"Staging: {buckets['staging']} tablas")
+        print(f"Operational: {buckets['operational']} tablas")
+        print(f"Analytical: {buckets['analytical']} tablas")
         print(f"Total: {len(tables)} tablas")
         
     else:
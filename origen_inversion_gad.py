@@ -4,67 +4,126 @@
 Muestra el origen exacto de la inversión de $4.3 millones del GAD
 """
 
+import argparse
+
 from config.connections.database import db_connection
 from sqlalchemy import text
 
-def mostrar_origen_inversion():
-    """Muestra de dónde salen los $4.3 millones de inversión del GAD."""
+# Una fila por tipo de beneficio, con los mismos filtros que el reporte.
+# precio > 0 ya excluye NULL y SUM ignora los NULL de entrega, así que el
+# COALESCE va sobre el agregado (0 si no hay filas) y no sobre cada fila
+INVERSION_ARROZ_SQL = """
+    SELECT
+        'semillas' as tipo,
+        COUNT(*) as beneficios,
+        COALESCE(SUM(precio_unitario * entrega), 0) as inversion_total,
+        AVG(precio_unitario) as precio_promedio,
+        COALESCE(SUM(entrega), 0) as total_quintales
+    FROM "etl-productivo".stg_semilla
+    WHERE processed = true
+    AND UPPER(TRIM(cultivo)) = 'ARROZ'
+    AND precio_unitario > 0
+    UNION ALL
+    SELECT
+        'fertilizantes' as tipo,
+        COUNT(*) as beneficios,
+        COALESCE(SUM(precio_kit), 0) as inversion_total,
+        AVG(precio_kit) as precio_promedio,
+        NULL as total_quintales
+    FROM "etl-productivo".stg_fertilizante
+    WHERE processed = true
+    AND UPPER(TRIM(cultivo)) = 'ARROZ'
+    AND precio_kit > 0
+"""
+
+# Agregados precalculados por scripts/create_mv_inversion_arroz.py (una fila por tipo)
+INVERSION_ARROZ_QUERY = text('''
+    SELECT tipo, beneficios, inversion_total, precio_promedio, total_quintales
+    FROM "etl-productivo".mv_inversion_arroz
+''')
+
+# Sin la vista (base recién creada) se calculan los mismos agregados en vivo
+INVERSION_ARROZ_LIVE_QUERY = text(INVERSION_ARROZ_SQL)
+
+MV_EXISTS_QUERY = text('''
+    SELECT EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'etl-productivo' AND matviewname = 'mv_inversion_arroz'
+    )
+''')
+
+# Filas por lote al leer la muestra con cursor del servidor
+MUESTRA_YIELD_PER = 100
+
+# Muestra de semillas
+MUESTRA_SEMILLAS_QUERY = text('''
+    SELECT 
+        nombres_apellidos,
+        precio_unitario,
+        entrega,
+        (precio_unitario * entrega) as costo_total
+    FROM "etl-productivo".stg_semilla
+    WHERE processed = true 
+    AND UPPER(TRIM(cultivo)) = 'ARROZ'
+    AND precio_unitario > 0
+    LIMIT 5
+''')
+
+# Muestra de fertilizantes
+MUESTRA_FERTILIZANTES_QUERY = text('''
+    SELECT 
+        nombres_apellidos,
+        precio_kit
+    FROM "etl-productivo".stg_fertilizante
+    WHERE processed = true 
+    AND UPPER(TRIM(cultivo)) = 'ARROZ'
+    AND precio_kit > 0
+    LIMIT 5
+''')
+
+def mostrar_origen_inversion(con_muestra: bool = True):
+    """
+    Muestra de dónde salen los $4.3 millones de inversión del GAD.
+    
+    Args:
+        con_muestra: Si es False (--quiet) se omite la muestra de registros,
+                     sin ejecutar sus consultas ni formatear sus filas
+    """
     
     with db_connection.get_session() as session:
         print('ORIGEN DE LOS $4.3 MILLONES - DATOS DE LA BASE DE DATOS:')
         print('=' * 60)
         print()
         
-        # 1. Semillas - de stg_semilla
-        query_semillas = text('''
-            SELECT 
-                COUNT(*) as beneficios,
-                SUM(COALESCE(precio_unitario, 0) * COALESCE(entrega, 0)) as inversion_total,
-                AVG(COALESCE(precio_unitario, 0)) as precio_promedio,
-                SUM(COALESCE(entrega, 0)) as total_quintales
-            FROM "etl-productivo".stg_semilla
-            WHERE processed = true 
-            AND UPPER(TRIM(cultivo)) = 'ARROZ'
-            AND precio_unitario > 0
-        ''')
-        
-        result_semillas = session.execute(query_semillas).fetchone()
+        # 1 y 2. Semillas y fertilizantes - de la vista materializada sobre staging,
+        # o de las tablas de staging si la vista aún no existe
+        query = INVERSION_ARROZ_QUERY if session.execute(MV_EXISTS_QUERY).scalar() else INVERSION_ARROZ_LIVE_QUERY
+        # Desempaquetadas en locales: sin acceso por atributo a Row en cada print
+        resultados = {tipo: valores for tipo, *valores in session.execute(query)}
+        beneficios_semillas, inversion_semillas, precio_semillas, total_quintales = resultados['semillas']
+        beneficios_fertilizantes, inversion_fertilizantes, precio_fertilizantes, _ = resultados['fertilizantes']
         
         print('1. SEMILLAS (de tabla stg_semilla):')
-        print(f'   - Beneficiarios: {result_semillas.beneficios:,}')
-        print(f'   - Total quintales entregados: {result_semillas.total_quintales:,}')
-        print(f'   - Precio promedio por quintal: ${result_semillas.precio_promedio:.2f}')
-        print(f'   - INVERSIÓN TOTAL: ${result_semillas.inversion_total:,.2f}')
-        print(f'   - Cálculo: {result_semillas.total_quintales:,} quintales × ${result_semillas.precio_promedio:.2f}/quintal')
+        print(f'   - Beneficiarios: {beneficios_semillas:,}')
+        print(f'   - Total quintales entregados: {total_quintales:,}')
+        print(f'   - Precio promedio por quintal: ${precio_semillas:.2f}')
+        print(f'   - INVERSIÓN TOTAL: ${inversion_semillas:,.2f}')
+        print(f'   - Cálculo: {total_quintales:,} quintales × ${precio_semillas:.2f}/quintal')
         print()
         
-        # 2. Fertilizantes - de stg_fertilizante
-        query_fertilizantes = text('''
-            SELECT 
-                COUNT(*) as beneficios,
-                SUM(COALESCE(precio_kit, 0)) as inversion_total,
-                AVG(COALESCE(precio_kit, 0)) as precio_promedio_kit
-            FROM "etl-productivo".stg_fertilizante
-            WHERE processed = true 
-            AND UPPER(TRIM(cultivo)) = 'ARROZ'
-            AND precio_kit > 0
-        ''')
-        
-        result_fertilizantes = session.execute(query_fertilizantes).fetchone()
-        
         print('2. FERTILIZANTES (de tabla stg_fertilizante):')
-        print(f'   - Beneficiarios: {result_fertilizantes.beneficios:,}')
-        print(f'   - Precio promedio por kit: ${result_fertilizantes.precio_promedio_kit:.2f}')
-        print(f'   - INVERSIÓN TOTAL: ${result_fertilizantes.inversion_total:,.2f}')
-        print(f'   - Cálculo: {result_fertilizantes.beneficios:,} kits × ${result_fertilizantes.precio_promedio_kit:.2f}/kit')
+        print(f'   - Beneficiarios: {beneficios_fertilizantes:,}')
+        print(f'   - Precio promedio por kit: ${precio_fertilizantes:.2f}')
+        print(f'   - INVERSIÓN TOTAL: ${inversion_fertilizantes:,.2f}')
+        print(f'   - Cálculo: {beneficios_fertilizantes:,} kits × ${precio_fertilizantes:.2f}/kit')
         print()
         
         # 3. Total
-        total_inversion = result_semillas.inversion_total + result_fertilizantes.inversion_total
+        total_inversion = inversion_semillas + inversion_fertilizantes
         
         print('3. TOTAL INVERSIÓN GAD:')
-        print(f'   - Semillas: ${result_semillas.inversion_total:,.2f}')
-        print(f'   - Fertilizantes: ${result_fertilizantes.inversion_total:,.2f}')
+        print(f'   - Semillas: ${inversion_semillas:,.2f}')
+        print(f'   - Fertilizantes: ${inversion_fertilizantes:,.2f}')
         print(f'   - TOTAL: ${total_inversion:,.2f}')
         print()
         
@@ -79,48 +138,8 @@ def mostrar_origen_inversion():
         print()
         
         # 4. Mostrar algunos registros específicos como evidencia
-        print('EVIDENCIA - ALGUNOS REGISTROS ESPECÍFICOS:')
-        print('=' * 50)
-        
-        # Muestra de semillas
-        query_muestra_semillas = text('''
-            SELECT 
-                nombres_apellidos,
-                precio_unitario,
-                entrega,
-                (precio_unitario * entrega) as costo_total
-            FROM "etl-productivo".stg_semilla
-            WHERE processed = true 
-            AND UPPER(TRIM(cultivo)) = 'ARROZ'
-            AND precio_unitario > 0
-            LIMIT 5
-        ''')
-        
-        muestra_semillas = session.execute(query_muestra_semillas).fetchall()
-        
-        print('Muestra de registros SEMILLAS:')
-        for registro in muestra_semillas:
-            print(f'  {registro.nombres_apellidos[:20]:<20} | ${registro.precio_unitario:.2f}/qq × {registro.entrega} qq = ${registro.costo_total:.2f}')
-        print()
-        
-        # Muestra de fertilizantes
-        query_muestra_fertilizantes = text('''
-            SELECT 
-                nombres_apellidos,
-                precio_kit
-            FROM "etl-productivo".stg_fertilizante
-            WHERE processed = true 
-            AND UPPER(TRIM(cultivo)) = 'ARROZ'
-            AND precio_kit > 0
-            LIMIT 5
-        ''')
-        
-        muestra_fertilizantes = session.execute(query_muestra_fertilizantes).fetchall()
-        
-        print('Muestra de registros FERTILIZANTES:')
-        for registro in muestra_fertilizantes:
-            print(f'  {registro.nombres_apellidos[:20]:<20} | Kit = ${registro.precio_kit:.2f}')
-        print()
+        if con_muestra:
+            mostrar_muestra(session)
         
         print('CONCLUSIÓN:')
         print('=' * 40)
@@ -132,8 +151,33 @@ def mostrar_origen_inversion():
         print('FERTILIZANTES: precio_kit (por cada beneficiario)')
         print()
         print('Total de registros procesados:')
-        print(f'- Semillas: {result_semillas.beneficios:,} beneficiarios')
-        print(f'- Fertilizantes: {result_fertilizantes.beneficios:,} beneficiarios')
+        print(f'- Semillas: {beneficios_semillas:,} beneficiarios')
+        print(f'- Fertilizantes: {beneficios_fertilizantes:,} beneficiarios')
+
+def mostrar_muestra(session):
+    """Muestra algunos registros de staging como evidencia."""
+    print('EVIDENCIA - ALGUNOS REGISTROS ESPECÍFICOS:')
+    print('=' * 50)
+    
+    print('Muestra de registros SEMILLAS:')
+    for nombre, precio, entrega, costo_total in _stream(session, MUESTRA_SEMILLAS_QUERY):
+        print('  %-20.20s | $%.2f/qq × %s qq = $%.2f' % (nombre, precio, entrega, costo_total))
+    print()
+    
+    print('Muestra de registros FERTILIZANTES:')
+    for nombre, precio_kit in _stream(session, MUESTRA_FERTILIZANTES_QUERY):
+        print('  %-20.20s | Kit = $%.2f' % (nombre, precio_kit))
+    print()
+
+def _stream(session, query):
+    """Itera la consulta por lotes con cursor del servidor, sin cargarla entera en memoria."""
+    return session.execute(
+        query.execution_options(stream_results=True, yield_per=MUESTRA_YIELD_PER)
+    )
 
 if __name__ == "__main__":
-    mostrar_origen_inversion()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--quiet', action='store_true',
+                        help='Omitir la muestra de registros')
+    args = parser.parse_args()
+    mostrar_origen_inversion(con_muestra=not args.quiet)
\ No newline at end of file
@@ -9,7 +9,8 @@
 # 3. Carga datos de staging para los 4 tipos de beneficios
 # 4. Corrige tipos de datos de coordenadas
 # 5. Ejecuta pipelines operational para transformar datos
-# 6. Verifica resultados finales
+# 6. Refresca las vistas materializadas de los reportes
+# 7. Verifica resultados finales
 #
 # Tiempo estimado: 15-20 minutos
 # ==============================================================================
@@ -303,8 +304,16 @@ fi
 # Limpiar archivos temporales
 rm -rf "$TEMP_DIR"
 
-# 8. VERIFICAR RESULTADOS FINALES
-echo -e "\n${YELLOW}📊 Paso 8: Verificando resultados finales...${NC}"
+# 8. REFRESCAR VISTAS MATERIALIZADAS DE REPORTES
+# Sin este paso los reportes leen vistas de la corrida anterior. Va después de
+# los pipelines operational, que marcan las filas de staging como procesadas
+echo -e "\n${YELLOW}🔄 Paso 8: Refrescando vistas materializadas de reportes...${NC}"
+python scripts/create_mv_financial_statistics.py || echo -e "${YELLOW}   ⚠️ No se pudo crear/refrescar analytics.mv_financial_statistics${NC}"
+python scripts/create_mv_fin_stats.py || echo -e "${YELLOW}   ⚠️ No se pudo crear/refrescar analytics.mv_fin_stats${NC}"
+python scripts/create_mv_inversion_arroz.py || echo -e "${YELLOW}   ⚠️ No se pudo crear/refrescar \"etl-productivo\".mv_inversion_arroz${NC}"
+
+# 9. VERIFICAR RESULTADOS FINALES
+echo -e "\n${YELLOW}📊 Paso 9: Verificando resultados finales...${NC}"
 python3 -c "
 from config.connections.database import db_connection
 
@@ -389,7 +398,7 @@ def verify_final_results():
 verify_final_results()
 "
 
-# 9. RESUMEN FINAL
+# 10. RESUMEN FINAL
 echo -e "\n${GREEN}=================================================================="
 echo -e "🎉 ETL COMPLETO FINALIZADO"
 echo -e "==================================================================${NC}"
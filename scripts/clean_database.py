@@ -3,80 +3,74 @@
 
 import sys
 import os
+import argparse
+import logging
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.connections.database import db_connection
 from sqlalchemy import text
-import time
+
+# Reporte por logging; con --quiet (WARNING) la verificación no se consulta ni se formatea
+log = logging.getLogger(__name__)
+
+SCHEMA = '"etl-productivo"'
+
+# Tablas por capa, en el orden en que se reportan
+TABLES_STAGING = ['stg_semilla', 'stg_fertilizante']
+TABLES_OPERATIONAL = [
+    'persona_base', 'ubicacion', 'organizacion', 
+    'beneficio_base', 'beneficio_semillas', 'beneficiario_semillas'
+]
+TABLES_ANALYTICS = [
+    'dim_persona', 'dim_ubicacion', 'dim_organizacion', 
+    'dim_tiempo', 'fact_beneficio'
+]
+ALL_TABLES = TABLES_ANALYTICS + TABLES_OPERATIONAL + TABLES_STAGING
+
+# Un solo TRUNCATE multi-tabla: una transacción y un viaje al servidor
+TRUNCATE_SQL = text(
+    f"TRUNCATE TABLE {', '.join(f'{SCHEMA}.{table}' for table in ALL_TABLES)} "
+    "RESTART IDENTITY CASCADE"
+)
+
+# Todos los conteos de verificación en una sola consulta
+COUNTS_SQL = text("\nUNION ALL\n".join(
+    f"SELECT '{table}' AS tabla, COUNT(*) AS registros FROM {SCHEMA}.{table}"
+    for table in TABLES_STAGING + TABLES_OPERATIONAL + TABLES_ANALYTICS
+))
 
 def clean_database():
     """Limpia todas las tablas de la base de datos."""
     
     with db_connection.get_session() as session:
-        print("=== LIMPIANDO BASE DE DATOS ===\n")
+        log.info("=== LIMPIANDO BASE DE DATOS ===\n")
         
         try:
-            # Limpiar tablas analytics
-            print("Limpiando tablas analytics...")
-            session.execute(text('TRUNCATE TABLE "etl-productivo".fact_beneficio CASCADE'))
-            session.execute(text('TRUNCATE TABLE "etl-productivo".dim_persona CASCADE'))
-            session.execute(text('TRUNCATE TABLE "etl-productivo".dim_ubicacion CASCADE'))
-            session.execute(text('TRUNCATE TABLE "etl-productivo".dim_organizacion CASCADE'))
-            session.execute(text('TRUNCATE TABLE "etl-productivo".dim_tiempo CASCADE'))
-            session.commit()
-            print("✓ Tablas analytics limpiadas")
-            
-            # Limpiar tablas operational
-            print("\nLimpiando tablas operational...")
-            session.execute(text('TRUNCATE TABLE "etl-productivo".beneficio_semillas CASCADE'))
-            session.execute(text('TRUNCATE TABLE "etl-productivo".beneficiario_semillas CASCADE'))
-            session.execute(text('TRUNCATE TABLE "etl-productivo".beneficio_base CASCADE'))
-            session.execute(text('TRUNCATE TABLE "etl-productivo".persona_base CASCADE'))
-            session.execute(text('TRUNCATE TABLE "etl-productivo".ubicacion CASCADE'))
-            session.execute(text('TRUNCATE TABLE "etl-productivo".organizacion CASCADE'))
-            session.commit()
-            print("✓ Tablas operational limpiadas")
-            
-            # Limpiar tablas staging
-            print("\nLimpiando tablas staging...")
-            session.execute(text('TRUNCATE TABLE "etl-productivo".stg_semilla CASCADE'))
-            session.execute(text('TRUNCATE TABLE "etl-productivo".stg_fertilizante CASCADE'))
+            log.info("Limpiando tablas analytics, operational y staging...")
+            session.execute(TRUNCATE_SQL)
             session.commit()
-            print("✓ Tablas staging limpiadas")
+            log.info("✓ Tablas analytics limpiadas")
+            log.info("✓ Tablas operational limpiadas")
+            log.info("✓ Tablas staging limpiadas")
             
             # Verificar que todo esté limpio
-            print("\n=== VERIFICACIÓN DE LIMPIEZA ===")
-            
-            # Verificar staging
-            count = session.execute(text('SELECT COUNT(*) FROM "etl-productivo".stg_semilla')).scalar()
-            print(f"Registros en stg_semilla: {count}")
-            count = session.execute(text('SELECT COUNT(*) FROM "etl-productivo".stg_fertilizante')).scalar()
-            print(f"Registros en stg_fertilizante: {count}")
-            
-            # Verificar operational
-            tables_operational = [
-                'persona_base', 'ubicacion', 'organizacion', 
-                'beneficio_base', 'beneficio_semillas', 'beneficiario_semillas'
-            ]
-            for table in tables_operational:
-                count = session.execute(text(f'SELECT COUNT(*) FROM "etl-productivo".{table}')).scalar()
-                print(f"Registros en {table}: {count}")
-            
-            # Verificar analytics
-            tables_analytics = [
-                'dim_persona', 'dim_ubicacion', 'dim_organizacion', 
-                'dim_tiempo', 'fact_beneficio'
-            ]
-            for table in tables_analytics:
-                count = session.execute(text(f'SELECT COUNT(*) FROM "etl-productivo".{table}')).scalar()
-                print(f"Registros en {table}: {count}")
+            if log.isEnabledFor(logging.INFO):
+                log.info("\n=== VERIFICACIÓN DE LIMPIEZA ===")
+                for table, count in session.execute(COUNTS_SQL):
+                    log.info("Registros en %s: %s", table, count)
             
-            print("\n✓ Base de datos limpiada exitosamente")
+            log.info("\n✓ Base de datos limpiada exitosamente")
             
         except Exception as e:
-            print(f"\n✗ Error al limpiar la base de datos: {str(e)}")
+            log.error("\n✗ Error al limpiar la base de datos: %s", e)
             session.rollback()
             raise
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--quiet', action='store_true',
+                        help='Solo reportar errores (omite la verificación de conteos)')
+    args = parser.parse_args()
+    logging.basicConfig(stream=sys.stdout, format='%(message)s',
+                        level=logging.WARNING if args.quiet else logging.INFO)
     clean_database()
\ No newline at end of file
@@ -20,6 +20,28 @@ from src.models.operational_refactored.beneficiario import Beneficiario
 from src.models.operational_refactored.beneficio import Beneficio
 from src.models.operational_refactored.beneficio_fertilizantes import BeneficioFertilizantes
 
+# Existencia de la tabla, de su tabla padre y sus columnas en un solo viaje
+VERIFY_TABLE_SQL = """
+    SELECT jsonb_build_object(
+        'table_exists', EXISTS (
+            SELECT 1 FROM information_schema.tables
+            WHERE table_schema = 'etl-productivo' AND table_name = 'beneficio_fertilizantes'
+        ),
+        'parent_exists', EXISTS (
+            SELECT 1 FROM information_schema.tables
+            WHERE table_schema = 'etl-productivo' AND table_name = 'beneficio'
+        ),
+        'columns', (
+            SELECT jsonb_agg(
+                jsonb_build_array(column_name, data_type, is_nullable)
+                ORDER BY ordinal_position
+            )
+            FROM information_schema.columns
+            WHERE table_schema = 'etl-productivo' AND table_name = 'beneficio_fertilizantes'
+        )
+    )
+"""
+
 
 def create_beneficio_fertilizantes_table():
     """Crear la tabla beneficio_fertilizantes y sus dependencias."""
@@ -43,25 +65,15 @@ def create_beneficio_fertilizantes_table():
         
         # Verificar que la tabla se creó correctamente
         print("\n--- Verificando Tabla Creada ---")
-        result = db_connection.execute_query(
-            "SELECT table_name FROM information_schema.tables "
-            "WHERE table_schema = 'etl-productivo' AND table_name = 'beneficio_fertilizantes';"
-        )
+        verificacion = db_connection.execute_query(VERIFY_TABLE_SQL)[0][0]
         
-        if result:
+        if verificacion['table_exists']:
             print("✅ Tabla 'beneficio_fertilizantes' creada exitosamente")
             
             # Mostrar estructura de la tabla
             print("\n--- Estructura de la Tabla ---")
-            columns = db_connection.execute_query(
-                "SELECT column_name, data_type, is_nullable "
-                "FROM information_schema.columns "
-                "WHERE table_schema = 'etl-productivo' AND table_name = 'beneficio_fertilizantes' "
-                "ORDER BY ordinal_position;"
-            )
-            
             print("Columnas de beneficio_fertilizantes:")
-            for col_name, data_type, is_nullable in columns:
+            for col_name, data_type, is_nullable in verificacion['columns'] or []:
                 nullable = "NULL" if is_nullable == "YES" else "NOT NULL"
                 print(f"  - {col_name}: {data_type} {nullable}")
                 
@@ -71,12 +83,7 @@ def create_beneficio_fertilizantes_table():
             
         # Verificar la tabla padre también
         print("\n--- Verificando Tabla Padre ---")
-        result = db_connection.execute_query(
-            "SELECT table_name FROM information_schema.tables "
-            "WHERE table_schema = 'etl-productivo' AND table_name = 'beneficio';"
-        )
-        
-        if result:
+        if verificacion['parent_exists']:
             print("✅ Tabla padre 'beneficio' existe")
         else:
             print("⚠️  Tabla padre 'beneficio' no encontrada")
@@ -18,33 +18,7 @@ from loguru import logger
 logger.remove()
 logger.add(sys.stdout, format="{time:HH:mm:ss} | {level} | {message}", level="INFO")
 
-def main():
-    """Función principal."""
-    logger.info("=== CREANDO TABLAS BENEFICIO_PLANTAS Y BENEFICIO_MECANIZACION ===")
-    
-    try:
-        # Verificar conexión
-        if not db_connection.test_connection():
-            logger.error("❌ No se pudo conectar a la base de datos")
-            return False
-        logger.info("✅ Conexión a base de datos exitosa")
-        
-        # Crear tablas
-        create_beneficio_plantas_table()
-        create_beneficio_mecanizacion_table()
-        
-        logger.info("✅ Tablas creadas exitosamente")
-        return True
-        
-    except Exception as e:
-        logger.error(f"❌ Error durante creación: {e}")
-        return False
-
-def create_beneficio_plantas_table():
-    """Crea la tabla beneficio_plantas."""
-    logger.info("Creando tabla beneficio_plantas...")
-    
-    sql = '''
+BENEFICIO_PLANTAS_SQL = '''
     CREATE TABLE IF NOT EXISTS "etl-productivo".beneficio_plantas (
         id INTEGER PRIMARY KEY REFERENCES "etl-productivo".beneficio(id),
         actas VARCHAR(50),
@@ -61,22 +35,9 @@ def create_beneficio_plantas_table():
     COMMENT ON COLUMN "etl-productivo".beneficio_plantas.actas IS 'Código único del acta';
     COMMENT ON COLUMN "etl-productivo".beneficio_plantas.entrega IS 'Cantidad de plantas entregadas';
     COMMENT ON COLUMN "etl-productivo".beneficio_plantas.hectareas IS 'Hectáreas del beneficiario';
-    '''
-    
-    try:
-        db_connection.execute_query(sql)
-        logger.info("✅ Tabla beneficio_plantas creada")
-    except Exception as e:
-        if "already exists" in str(e):
-            logger.info("ℹ️  Tabla beneficio_plantas ya existe")
-        else:
-            raise
+'''
 
-def create_beneficio_mecanizacion_table():
-    """Crea la tabla beneficio_mecanizacion."""
-    logger.info("Creando tabla beneficio_mecanizacion...")
-    
-    sql = '''
+BENEFICIO_MECANIZACION_SQL = '''
     CREATE TABLE IF NOT EXISTS "etl-productivo".beneficio_mecanizacion (
         id INTEGER PRIMARY KEY REFERENCES "etl-productivo".beneficio(id),
         estado VARCHAR(50),
@@ -92,16 +53,49 @@ def create_beneficio_mecanizacion_table():
     COMMENT ON COLUMN "etl-productivo".beneficio_mecanizacion.cu_ha IS 'Costo unitario por hectárea';
     COMMENT ON COLUMN "etl-productivo".beneficio_mecanizacion.inversion IS 'Monto de inversión';
     COMMENT ON COLUMN "etl-productivo".beneficio_mecanizacion.agrupacion IS 'Nombre de la agrupación';
-    '''
+'''
+
+TABLES_DDL = {
+    'beneficio_plantas': BENEFICIO_PLANTAS_SQL,
+    'beneficio_mecanizacion': BENEFICIO_MECANIZACION_SQL,
+}
+
+# Una sola consulta al catálogo para saber cuáles tablas ya existen
+EXISTING_TABLES_SQL = """
+    SELECT table_name FROM information_schema.tables
+    WHERE table_schema = 'etl-productivo'
+    AND table_name IN ('beneficio_plantas', 'beneficio_mecanizacion')
+"""
+
+def main():
+    """Función principal."""
+    logger.info("=== CREANDO TABLAS BENEFICIO_PLANTAS Y BENEFICIO_MECANIZACION ===")
     
     try:
-        db_connection.execute_query(sql)
-        logger.info("✅ Tabla beneficio_mecanizacion creada")
+        # Verificar conexión
+        if not db_connection.test_connection():
+            logger.error("❌ No se pudo conectar a la base de datos")
+            return False
+        logger.info("✅ Conexión a base de datos exitosa")
+        
+        existing = {row[0] for row in db_connection.execute_query(EXISTING_TABLES_SQL)}
+        missing = [table for table in TABLES_DDL if table not in existing]
+        for table in existing:
+            logger.info(f"ℹ️  Tabla {table} ya existe")
+        if not missing:
+            return True
+        
+        # Las tablas faltantes y sus comentarios en un solo script: execute_query
+        # lo envía en un viaje y lo confirma en una transacción (todo o nada)
+        logger.info(f"Creando tablas {', '.join(missing)}...")
+        db_connection.execute_query(''.join(TABLES_DDL[table] for table in missing))
+        
+        logger.info("✅ Tablas creadas exitosamente")
+        return True
+        
     except Exception as e:
-        if "already exists" in str(e):
-            logger.info("ℹ️  Tabla beneficio_mecanizacion ya existe")
-        else:
-            raise
+        logger.error(f"❌ Error durante creación: {e}")
+        return False
 
 if __name__ == "__main__":
     success = main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Script para crear o refrescar la vista materializada analytics.mv_fin_stats.
+
+La vista precalcula las siete secciones del reporte de estadísticas financieras
+con la SQL que define debug_scripts/estadisticas_financieras.py. Cada fila lleva
+la sección, su orden dentro de la sección y los datos de la fila como JSON.
+run_full_etl.sh ejecuta este script después de cargar los datos: si la vista no
+existe la crea, y si ya existe la refresca con REFRESH MATERIALIZED VIEW
+CONCURRENTLY.
+"""
+
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.connections.database import db_connection
+from debug_scripts.estadisticas_financieras import MV_NAME, SECTIONS_SQL
+from loguru import logger
+
+# Configurar logger simple para pantalla
+logger.remove()
+logger.add(sys.stdout, format="{time:HH:mm:ss} | {level} | {message}", level="INFO")
+
+def main():
+    """Función principal."""
+    logger.info(f"=== CREANDO/REFRESCANDO {MV_NAME.upper()} ===")
+
+    try:
+        # Verificar conexión
+        if not db_connection.test_connection():
+            logger.error("❌ No se pudo conectar a la base de datos")
+            return False
+        logger.info("✅ Conexión a base de datos exitosa")
+
+        if mv_fin_stats_exists():
+            refresh_mv_fin_stats()
+        else:
+            create_mv_fin_stats()
+
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Error durante creación/refresco: {e}")
+        return False
+
+def mv_fin_stats_exists():
+    """Indica si la vista materializada ya existe."""
+    result = db_connection.execute_query(
+        "SELECT 1 FROM pg_matviews WHERE schemaname = 'analytics' AND matviewname = 'mv_fin_stats'"
+    )
+    return bool(result)
+
+def create_mv_fin_stats():
+    """Crea la vista materializada con su índice único (requerido por CONCURRENTLY)."""
+    create_beneficio_base_persona_index()
+
+    logger.info(f"Creando vista materializada {MV_NAME}...")
+
+    union_sql = "\n    UNION ALL\n".join(SECTIONS_SQL)
+    sql = f'''
+    CREATE MATERIALIZED VIEW IF NOT EXISTS {MV_NAME} AS
+    {union_sql}
+    WITH DATA;
+
+    CREATE UNIQUE INDEX IF NOT EXISTS mv_fin_stats_section_sort_key_idx
+        ON {MV_NAME} (section, sort_key);
+    '''
+
+    db_connection.execute_query(sql)
+    logger.info(f"✅ Vista materializada {MV_NAME} creada")
+
+def create_beneficio_base_persona_index():
+    """Crea el índice parcial que cubre la agregación por persona de la sección 3."""
+    logger.info("Creando índice parcial beneficio_base(persona_id)...")
+
+    sql = '''
+    CREATE INDEX IF NOT EXISTS idx_beneficio_base_persona_semillas_fert
+        ON operational.beneficio_base (persona_id) INCLUDE (valor_monetario, tipo_beneficio)
+        WHERE tipo_beneficio IN ('SEMILLAS', 'fertilizantes');
+    '''
+
+    db_connection.execute_query(sql)
+    logger.info("✅ Índice idx_beneficio_base_persona_semillas_fert creado")
+
+def refresh_mv_fin_stats():
+    """Refresca la vista sin bloquear las lecturas del reporte."""
+    logger.info(f"Refrescando vista materializada {MV_NAME}...")
+    db_connection.execute_query(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {MV_NAME}")
+    logger.info(f"✅ Vista materializada {MV_NAME} refrescada")
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
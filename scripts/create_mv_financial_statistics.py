@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Script para crear o refrescar la vista materializada analytics.mv_financial_statistics.
+
+La vista guarda en una sola fila el objeto JSON con las 12 secciones del reporte
+debug_scripts/financial_statistics_fixed.py, que la lee directamente cuando existe.
+Ejecutar este script como paso final después de cargar los datos: si la vista
+no existe la crea, y si ya existe la refresca con REFRESH MATERIALIZED VIEW
+CONCURRENTLY.
+"""
+
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.connections.database import db_connection
+from debug_scripts.financial_statistics_fixed import (
+    MV_NAME, MV_EXISTS_SQL, detect_labels, distinct_personas_expr, statistics_sql
+)
+from loguru import logger
+
+# Configurar logger simple para pantalla
+logger.remove()
+logger.add(sys.stdout, format="{time:HH:mm:ss} | {level} | {message}", level="INFO")
+
+def main():
+    """Función principal."""
+    logger.info(f"=== CREANDO/REFRESCANDO {MV_NAME.upper()} ===")
+
+    try:
+        # Verificar conexión
+        if not db_connection.test_connection():
+            logger.error("❌ No se pudo conectar a la base de datos")
+            return False
+        logger.info("✅ Conexión a base de datos exitosa")
+
+        if db_connection.execute_query(MV_EXISTS_SQL)[0][0]:
+            refresh_mv_financial_statistics()
+        else:
+            create_mv_financial_statistics()
+
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Error durante creación/refresco: {e}")
+        return False
+
+def build_mv_query():
+    """
+    Arma la consulta de la vista con las etiquetas de tipo_beneficio de esta base.
+
+    Una vista no admite parámetros: se interpolan con mogrify al crearla, y el
+    REFRESH reutiliza la misma definición.
+    """
+    with db_connection.engine.connect() as conn:
+        tipo_params, geo_col = detect_labels(conn)
+        sql = statistics_sql(distinct_personas_expr(conn), geo_col)
+        cursor = conn.connection.cursor()
+        try:
+            sql = cursor.mogrify(sql, tipo_params).decode()
+        finally:
+            cursor.close()
+
+    return f"SELECT 1 AS id, stats.resultados FROM ({sql}) stats(resultados)"
+
+def create_mv_financial_statistics():
+    """Crea la vista materializada con su índice único (requerido por CONCURRENTLY)."""
+    logger.info(f"Creando vista materializada {MV_NAME}...")
+
+    sql = f'''
+    CREATE MATERIALIZED VIEW IF NOT EXISTS {MV_NAME} AS
+    {build_mv_query()}
+    WITH DATA;
+
+    CREATE UNIQUE INDEX IF NOT EXISTS mv_financial_statistics_id_idx
+        ON {MV_NAME} (id);
+    '''
+
+    db_connection.execute_query(sql)
+    logger.info(f"✅ Vista materializada {MV_NAME} creada")
+
+def refresh_mv_financial_statistics():
+    """Refresca la vista sin bloquear las lecturas del reporte."""
+    logger.info(f"Refrescando vista materializada {MV_NAME}...")
+    db_connection.execute_query(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {MV_NAME}")
+    logger.info(f"✅ Vista materializada {MV_NAME} refrescada")
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
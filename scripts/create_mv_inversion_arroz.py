@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Script para crear o refrescar la vista materializada "etl-productivo".mv_inversion_arroz.
+
+La vista precalcula los agregados de inversión GAD en arroz (semillas y
+fertilizantes) sobre las tablas de staging que muestra origen_inversion_gad.py,
+con la SQL que define ese módulo. run_full_etl.sh ejecuta este script después
+de los pipelines que marcan las filas de staging como procesadas: si la vista no
+existe la crea, y si ya existe la refresca con REFRESH MATERIALIZED VIEW
+CONCURRENTLY.
+"""
+
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.connections.database import db_connection
+from origen_inversion_gad import INVERSION_ARROZ_SQL
+from loguru import logger
+
+# Configurar logger simple para pantalla
+logger.remove()
+logger.add(sys.stdout, format="{time:HH:mm:ss} | {level} | {message}", level="INFO")
+
+MV_NAME = '"etl-productivo".mv_inversion_arroz'
+
+def main():
+    """Función principal."""
+    logger.info(f"=== CREANDO/REFRESCANDO {MV_NAME.upper()} ===")
+
+    try:
+        # Verificar conexión
+        if not db_connection.test_connection():
+            logger.error("❌ No se pudo conectar a la base de datos")
+            return False
+        logger.info("✅ Conexión a base de datos exitosa")
+
+        if mv_inversion_arroz_exists():
+            refresh_mv_inversion_arroz()
+        else:
+            create_mv_inversion_arroz()
+
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Error durante creación/refresco: {e}")
+        return False
+
+def mv_inversion_arroz_exists():
+    """Indica si la vista materializada ya existe."""
+    result = db_connection.execute_query(
+        "SELECT 1 FROM pg_matviews WHERE schemaname = 'etl-productivo' AND matviewname = 'mv_inversion_arroz'"
+    )
+    return bool(result)
+
+def create_mv_inversion_arroz():
+    """Crea la vista materializada con su índice único (requerido por CONCURRENTLY)."""
+    logger.info(f"Creando vista materializada {MV_NAME}...")
+
+    sql = f'''
+    CREATE MATERIALIZED VIEW IF NOT EXISTS {MV_NAME} AS
+    {INVERSION_ARROZ_SQL}
+    WITH DATA;
+
+    CREATE UNIQUE INDEX IF NOT EXISTS mv_inversion_arroz_tipo_idx
+        ON {MV_NAME} (tipo);
+    '''
+
+    db_connection.execute_query(sql)
+    logger.info(f"✅ Vista materializada {MV_NAME} creada")
+
+def refresh_mv_inversion_arroz():
+    """Refresca la vista sin bloquear las lecturas del reporte."""
+    logger.info(f"Refrescando vista materializada {MV_NAME}...")
+    db_connection.execute_query(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {MV_NAME}")
+    logger.info(f"✅ Vista materializada {MV_NAME} refrescada")
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -5,18 +5,99 @@ Script para corregir los tipos de datos de coordenadas en la tabla direccion.
 
 import sys
 import os
+import re
 from pathlib import Path
 
 # Agregar el directorio raíz al path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from loguru import logger
+from sqlalchemy import text
 from config.connections.database import db_connection
 
 # Configurar logger
 logger.remove()
 logger.add(sys.stdout, format="{time:HH:mm:ss} | {level} | {message}", level="INFO")
 
+# Limpieza de datos problemáticos antes del cambio de tipo, en un solo UPDATE
+# (una pasada por la tabla). Cada subconsulta LATERAL aplica un paso sobre el
+# resultado del anterior, en el mismo orden en que se limpiaban antes:
+#   1. 'None' o '' -> NULL
+#   2. Coordenadas con espacios -> primer número
+#   3. UTM con sufijos (604238.838E -> 604238.838)
+#   4. GPS decimales con coma (-2.720260, -79.948107) -> NULL por ser formato diferente
+# El WHERE limita el UPDATE a las filas que alguno de los pasos modifica
+CLEANUP_SQL = """
+    UPDATE "etl-productivo".direccion
+    SET (coordenada_x, coordenada_y) = (
+        SELECT
+            CASE WHEN x3 LIKE '%,%' THEN NULL ELSE x3 END,
+            CASE WHEN y3 LIKE '%,%' THEN NULL ELSE y3 END
+        FROM (
+            SELECT NULLIF(NULLIF(coordenada_x, 'None'), '') AS x1,
+                   NULLIF(NULLIF(coordenada_y, 'None'), '') AS y1
+        ) paso1
+        CROSS JOIN LATERAL (
+            SELECT CASE WHEN x1 LIKE '% %' AND split_part(x1, ' ', 1) ~ '^[0-9]+\.?[0-9]*$'
+                        THEN split_part(x1, ' ', 1) ELSE x1 END AS x2,
+                   CASE WHEN y1 LIKE '% %' AND split_part(y1, ' ', 1) ~ '^[0-9]+\.?[0-9]*$'
+                        THEN split_part(y1, ' ', 1) ELSE y1 END AS y2
+        ) paso2
+        CROSS JOIN LATERAL (
+            SELECT CASE WHEN x2 ~ '[0-9]+\.?[0-9]*[A-Z]'
+                        THEN regexp_replace(x2, '[^0-9.]', '', 'g') ELSE x2 END AS x3,
+                   CASE WHEN y2 ~ '[0-9]+\.?[0-9]*[A-Z]'
+                        THEN regexp_replace(y2, '[^0-9.]', '', 'g') ELSE y2 END AS y3
+        ) paso3
+    )
+    WHERE coordenada_x IN ('None', '') OR coordenada_x LIKE '% %'
+       OR coordenada_x ~ '[0-9]+\.?[0-9]*[A-Z]' OR coordenada_x LIKE '%,%'
+       OR coordenada_y IN ('None', '') OR coordenada_y LIKE '% %'
+       OR coordenada_y ~ '[0-9]+\.?[0-9]*[A-Z]' OR coordenada_y LIKE '%,%';
+"""
+
+# Ambas columnas en un solo ALTER TABLE: PostgreSQL reescribe la tabla una vez
+ALTER_COORDINATES_SQL = """
+    ALTER TABLE "etl-productivo".direccion
+        ALTER COLUMN coordenada_x TYPE DECIMAL(15,2)
+            USING CASE WHEN coordenada_x ~ '^[0-9]+\.?[0-9]*$' THEN coordenada_x::DECIMAL(15,2) ELSE NULL END,
+        ALTER COLUMN coordenada_y TYPE DECIMAL(15,2)
+            USING CASE WHEN coordenada_y ~ '^[0-9]+\.?[0-9]*$' THEN coordenada_y::DECIMAL(15,2) ELSE NULL END;
+    
+    COMMENT ON COLUMN "etl-productivo".direccion.coordenada_x IS 'Coordenada X (UTM o decimal)';
+    COMMENT ON COLUMN "etl-productivo".direccion.coordenada_y IS 'Coordenada Y (UTM o decimal)';
+"""
+
+FIX_COORDINATES_SQL = CLEANUP_SQL + ALTER_COORDINATES_SQL
+
+# Índices de direccion que no respaldan una restricción (PK, UNIQUE): se pueden
+# eliminar antes del ALTER y recrear después con su definición original
+DIRECCION_INDEXES_SQL = """
+    SELECT i.relname, pg_get_indexdef(i.oid)
+    FROM pg_index x
+    JOIN pg_class i ON i.oid = x.indexrelid
+    JOIN pg_class t ON t.oid = x.indrelid
+    JOIN pg_namespace n ON n.oid = t.relnamespace
+    WHERE n.nspname = 'etl-productivo'
+    AND t.relname = 'direccion'
+    AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+"""
+
+# Un CREATE INDEX CONCURRENTLY fallido deja el índice creado pero marcado INVALID:
+# no se usa en consultas, pero se sigue manteniendo en cada escritura
+INVALID_INDEX_SQL = """
+    SELECT 1
+    FROM pg_index x
+    JOIN pg_class i ON i.oid = x.indexrelid
+    JOIN pg_namespace n ON n.oid = i.relnamespace
+    WHERE n.nspname = 'etl-productivo'
+    AND i.relname = :name
+    AND NOT x.indisvalid
+"""
+
+# Tipo destino tal como lo reporta information_schema: (data_type, precision, scale)
+TARGET_COORDINATE_TYPE = ('numeric', 15, 2)
+
 def main():
     """Función principal para corregir tipos de coordenadas."""
     logger.info("=== CORRIGIENDO TIPOS DE DATOS DE COORDENADAS ===")
@@ -30,16 +111,30 @@ def main():
         
         # Verificar estructura actual
         logger.info("\n--- Verificando estructura actual ---")
-        check_current_structure()
+        structure = check_current_structure()
+        
+        # Si ya están migradas, evitar la limpieza y la reescritura de la tabla
+        if structure and all(
+            structure.get(column) == TARGET_COORDINATE_TYPE
+            for column in ('coordenada_x', 'coordenada_y')
+        ):
+            logger.info("\n✅ Coordenadas ya son DECIMAL(15,2); no se requiere migración")
+            return True
         
         # Corregir tipos de datos
         logger.info("\n--- Corrigiendo tipos de datos ---")
-        fix_coordinate_types()
+        failed_indexes = fix_coordinate_types()
         
         # Verificar estructura corregida
         logger.info("\n--- Verificando estructura corregida ---")
         check_current_structure()
         
+        if failed_indexes:
+            logger.error(f"\n❌ Tipos corregidos, pero {len(failed_indexes)} índices no se pudieron recrear; ejecutar manualmente:")
+            for definition in failed_indexes:
+                logger.error(f"    {definition};")
+            return False
+        
         logger.info("\n✅ Corrección de tipos de datos completada exitosamente")
         return True
         
@@ -48,7 +143,12 @@ def main():
         return False
 
 def check_current_structure():
-    """Verifica la estructura actual de la tabla direccion."""
+    """
+    Verifica la estructura actual de la tabla direccion.
+    
+    Returns:
+        Dict {columna: (data_type, precision, scale)}; vacío si no se pudo consultar
+    """
     query = """
     SELECT column_name, data_type, character_maximum_length, numeric_precision, numeric_scale
     FROM information_schema.columns 
@@ -58,6 +158,7 @@ def check_current_structure():
     ORDER BY column_name;
     """
     
+    structure = {}
     try:
         result = db_connection.execute_query(query)
         if result:
@@ -70,79 +171,76 @@ def check_current_structure():
                 elif precision:
                     type_info += f"({precision},{scale or 0})"
                 logger.info(f"    - {col_name}: {type_info}")
+                structure[col_name] = (data_type, precision, scale)
         else:
             logger.warning("  No se encontraron columnas de coordenadas")
     except Exception as e:
         logger.error(f"  Error verificando estructura: {e}")
+    
+    return structure
 
 def fix_coordinate_types():
-    """Corrige los tipos de datos de las coordenadas."""
+    """
+    Corrige los tipos de datos de las coordenadas.
     
-    # Primero limpiar datos problemáticos
+    Returns:
+        Lista con las definiciones de los índices que no se pudieron recrear
+    """
     logger.info("  Limpiando datos de coordenadas problemáticos...")
-    cleanup_coordinate_data()
+    logger.info("  Cambiando coordenada_x y coordenada_y a DECIMAL(15,2)...")
     
-    # Lista de comandos SQL a ejecutar
-    sql_commands = [
-        "-- Cambiar coordenada_x a DECIMAL(15,2)",
-        'ALTER TABLE "etl-productivo".direccion ALTER COLUMN coordenada_x TYPE DECIMAL(15,2) USING CASE WHEN coordenada_x ~ \'^[0-9]+\.?[0-9]*$\' THEN coordenada_x::DECIMAL(15,2) ELSE NULL END;',
-        
-        "-- Cambiar coordenada_y a DECIMAL(15,2)", 
-        'ALTER TABLE "etl-productivo".direccion ALTER COLUMN coordenada_y TYPE DECIMAL(15,2) USING CASE WHEN coordenada_y ~ \'^[0-9]+\.?[0-9]*$\' THEN coordenada_y::DECIMAL(15,2) ELSE NULL END;',
-        
-        "-- Agregar comentarios",
-        'COMMENT ON COLUMN "etl-productivo".direccion.coordenada_x IS \'Coordenada X (UTM o decimal)\';',
-        'COMMENT ON COLUMN "etl-productivo".direccion.coordenada_y IS \'Coordenada Y (UTM o decimal)\';'
-    ]
+    # Limpieza, cambio de tipo y comentarios en una sola transacción (todo o nada).
+    # Los índices secundarios se eliminan en la misma transacción para que el
+    # ALTER no los reconstruya mientras tiene la tabla bloqueada
+    with db_connection.engine.begin() as conn:
+        indexes = conn.execute(text(DIRECCION_INDEXES_SQL)).all()
+        if indexes:
+            logger.info(f"  Eliminando {len(indexes)} índices secundarios de direccion...")
+            conn.execute(text('; '.join(
+                f'DROP INDEX "etl-productivo"."{name}"' for name, _ in indexes
+            )))
+        conn.execute(text(FIX_COORDINATES_SQL))
+    logger.info("    ✅ Completado")
     
-    for command in sql_commands:
-        if command.startswith('--'):
-            logger.info(f"  {command}")
-            continue
-            
-        try:
-            logger.info(f"  Ejecutando: {command[:50]}...")
-            db_connection.execute_query(command)
-            logger.info("    ✅ Completado")
-        except Exception as e:
-            if "does not exist" in str(e):
-                logger.warning(f"    ⚠️  Columna no existe: {e}")
-            else:
-                logger.error(f"    ❌ Error: {e}")
-                raise
-
-def cleanup_coordinate_data():
-    """Limpia los datos de coordenadas problemáticos."""
+    return recreate_indexes(indexes)
+
+def recreate_indexes(indexes):
+    """
+    Recrea índices con CREATE INDEX CONCURRENTLY (no bloquea lecturas ni escrituras).
     
-    cleanup_commands = [
-        "-- Limpiar coordenadas None",
-        'UPDATE "etl-productivo".direccion SET coordenada_x = NULL WHERE coordenada_x = \'None\' OR coordenada_x = \'\';',
-        'UPDATE "etl-productivo".direccion SET coordenada_y = NULL WHERE coordenada_y = \'None\' OR coordenada_y = \'\';',
-        
-        "-- Limpiar coordenadas con espacios (tomar primer número)",
-        'UPDATE "etl-productivo".direccion SET coordenada_x = split_part(coordenada_x, \' \', 1) WHERE coordenada_x LIKE \'% %\' AND split_part(coordenada_x, \' \', 1) ~ \'^[0-9]+\.?[0-9]*$\';',
-        'UPDATE "etl-productivo".direccion SET coordenada_y = split_part(coordenada_y, \' \', 1) WHERE coordenada_y LIKE \'% %\' AND split_part(coordenada_y, \' \', 1) ~ \'^[0-9]+\.?[0-9]*$\';',
+    Args:
+        indexes: Pares (nombre, definición) tal como los retorna DIRECCION_INDEXES_SQL
         
-        "-- Limpiar coordenadas UTM con sufijos (604238.838E -> 604238.838)",
-        'UPDATE "etl-productivo".direccion SET coordenada_x = regexp_replace(coordenada_x, \'[^0-9.]\', \'\', \'g\') WHERE coordenada_x ~ \'[0-9]+\.?[0-9]*[A-Z]\';',
-        'UPDATE "etl-productivo".direccion SET coordenada_y = regexp_replace(coordenada_y, \'[^0-9.]\', \'\', \'g\') WHERE coordenada_y ~ \'[0-9]+\.?[0-9]*[A-Z]\';',
-        
-        "-- Limpiar coordenadas GPS decimales (-2.720260, -79.948107 -> NULL por ser formato diferente)",
-        'UPDATE "etl-productivo".direccion SET coordenada_x = NULL WHERE coordenada_x LIKE \'%,%\';',
-        'UPDATE "etl-productivo".direccion SET coordenada_y = NULL WHERE coordenada_y LIKE \'%,%\';'
-    ]
+    Returns:
+        Lista con las definiciones de los índices que no se pudieron recrear
+    """
+    failed = []
+    if not indexes:
+        return failed
     
-    for command in cleanup_commands:
-        if command.startswith('--'):
-            logger.info(f"    {command}")
-            continue
-            
-        try:
-            result = db_connection.execute_query(command)
-            logger.info(f"    ✅ Ejecutado")
-        except Exception as e:
-            logger.warning(f"    ⚠️  Error en limpieza: {e}")
-            continue
+    logger.info(f"  Recreando {len(indexes)} índices con CONCURRENTLY...")
+    # CONCURRENTLY no puede ejecutarse dentro de un bloque de transacción
+    with db_connection.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, definition in indexes:
+            concurrent = re.sub(r'^CREATE (UNIQUE )?INDEX ', r'CREATE \1INDEX CONCURRENTLY ', definition)
+            try:
+                conn.execute(text(concurrent))
+                logger.info(f"    ✅ {concurrent[:80]}")
+            except Exception as e:
+                logger.error(f"    ❌ No se pudo recrear el índice {name}: {e}")
+                failed.append(definition)
+                drop_invalid_index(conn, name)
+    
+    return failed
+
+def drop_invalid_index(conn, name):
+    """Elimina el índice INVALID que deja un CREATE INDEX CONCURRENTLY fallido."""
+    try:
+        if conn.execute(text(INVALID_INDEX_SQL), {'name': name}).first():
+            conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "etl-productivo"."{name}"'))
+            logger.info(f"    🗑️  Índice inválido {name} eliminado")
+    except Exception as e:
+        logger.error(f"    ❌ No se pudo eliminar el índice inválido {name}: {e}")
 
 def verify_data_integrity():
     """Verifica que los datos no se hayan corrompido."""
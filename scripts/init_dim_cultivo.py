@@ -3,14 +3,40 @@ Script para inicializar la dimensión dim_cultivo con datos base.
 Incluye los cultivos identificados en el sistema con sus características agronómicas.
 """
 
-from config.connections.database import DatabaseConnection
+from config.connections.database import db_connection
 from src.models.analytical.dimensions.dim_cultivo import DimCultivo
+from sqlalchemy import or_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from loguru import logger
 
+# Columnas que el UPSERT actualiza cuando codigo_cultivo ya existe
+UPSERT_COLUMNS = [
+    'nombre_cultivo',
+    'nombre_cientifico',
+    'familia_botanica',
+    'genero',
+    'tipo_ciclo',
+    'duracion_ciclo_dias',
+    'estacionalidad',
+    'clasificacion_economica',
+    'uso_principal',
+    'tipo_clima',
+    'requerimiento_agua',
+    'tipo_suelo_preferido',
+    'epoca_siembra_principal',
+    'epoca_cosecha_principal',
+]
+
+# Variantes ortográficas de codigo_cultivo -> código canónico. No se insertan
+# como filas propias: get_cultivo_mapping las resuelve a la clave del canónico
+# cuando la base no tiene ya una fila para el alias
+CULTIVO_ALIASES = {
+    'MAÍZ': 'MAIZ',
+}
+
 
 def get_cultivos_data():
-    """Retorna los datos base de cultivos con sus características."""
+    """Retorna los datos base de cultivos (un código único por fila, sin alias)."""
     return [
         {
             'codigo_cultivo': 'ARROZ',
@@ -46,23 +72,6 @@ def get_cultivos_data():
             'epoca_siembra_principal': 'INVIERNO_VERANO',
             'epoca_cosecha_principal': 'MAY_JUL_NOV_ENE'
         },
-        {
-            'codigo_cultivo': 'MAÍZ',  # Variante ortográfica, mapear al mismo
-            'nombre_cultivo': 'Maíz',
-            'nombre_cientifico': 'Zea mays',
-            'familia_botanica': 'Poaceae',
-            'genero': 'Zea',
-            'tipo_ciclo': 'ANUAL',
-            'duracion_ciclo_dias': 90,
-            'estacionalidad': 'INVIERNO_VERANO',
-            'clasificacion_economica': 'ALIMENTARIO',
-            'uso_principal': 'CONSUMO_HUMANO_ANIMAL',
-            'tipo_clima': 'TROPICAL',
-            'requerimiento_agua': 'MEDIO',
-            'tipo_suelo_preferido': 'FRANCO',
-            'epoca_siembra_principal': 'INVIERNO_VERANO',
-            'epoca_cosecha_principal': 'MAY_JUL_NOV_ENE'
-        },
         {
             'codigo_cultivo': 'CACAO',
             'nombre_cultivo': 'Cacao',
@@ -121,9 +130,7 @@ def init_dim_cultivo():
     """Inicializa la dimensión dim_cultivo con datos base."""
     logger.info("=== INICIALIZANDO DIM_CULTIVO ===")
     
-    db = DatabaseConnection()
-    
-    with db.get_session() as session:
+    with db_connection.get_session() as session:
         try:
             # Obtener datos de cultivos
             cultivos_data = get_cultivos_data()
@@ -134,42 +141,32 @@ def init_dim_cultivo():
             stmt = stmt.on_conflict_do_update(
                 index_elements=['codigo_cultivo'],
                 set_={
-                    'nombre_cultivo': stmt.excluded.nombre_cultivo,
-                    'nombre_cientifico': stmt.excluded.nombre_cientifico,
-                    'familia_botanica': stmt.excluded.familia_botanica,
-                    'genero': stmt.excluded.genero,
-                    'tipo_ciclo': stmt.excluded.tipo_ciclo,
-                    'duracion_ciclo_dias': stmt.excluded.duracion_ciclo_dias,
-                    'estacionalidad': stmt.excluded.estacionalidad,
-                    'clasificacion_economica': stmt.excluded.clasificacion_economica,
-                    'uso_principal': stmt.excluded.uso_principal,
-                    'tipo_clima': stmt.excluded.tipo_clima,
-                    'requerimiento_agua': stmt.excluded.requerimiento_agua,
-                    'tipo_suelo_preferido': stmt.excluded.tipo_suelo_preferido,
-                    'epoca_siembra_principal': stmt.excluded.epoca_siembra_principal,
-                    'epoca_cosecha_principal': stmt.excluded.epoca_cosecha_principal,
+                    **{column: stmt.excluded[column] for column in UPSERT_COLUMNS},
                     'updated_at': 'NOW()'
-                }
+                },
+                # Solo reescribir filas cuyo contenido cambió: sin escrituras
+                # (ni WAL) cuando los datos base son los mismos
+                where=or_(*[
+                    getattr(DimCultivo, column).is_distinct_from(stmt.excluded[column])
+                    for column in UPSERT_COLUMNS
+                ])
             )
             
-            result = session.execute(stmt)
-            logger.info(f"Cultivos procesados: {len(cultivos_data)}")
-            
-            # Verificar resultados
-            from sqlalchemy import text
-            count_result = session.execute(text("SELECT COUNT(*) FROM analytics.dim_cultivo")).scalar()
-            logger.info(f"Total cultivos en dim_cultivo: {count_result}")
-            
-            # Mostrar cultivos cargados
-            cultivos_result = session.execute(text("""
-                SELECT cultivo_key, codigo_cultivo, nombre_cultivo, clasificacion_economica 
-                FROM analytics.dim_cultivo 
-                ORDER BY codigo_cultivo
-            """))
+            # RETURNING devuelve solo las filas insertadas o modificadas: sin
+            # consultas de verificación adicionales
+            stmt = stmt.returning(
+                DimCultivo.cultivo_key,
+                DimCultivo.codigo_cultivo,
+                DimCultivo.nombre_cultivo,
+                DimCultivo.clasificacion_economica
+            )
+            rows = sorted(session.execute(stmt).all(), key=lambda row: row.codigo_cultivo)
+            logger.info(f"Cultivos procesados: {len(cultivos_data)}, "
+                        f"insertados o actualizados: {len(rows)}")
             
-            logger.info("Cultivos cargados:")
-            for row in cultivos_result:
-                logger.info(f"  {row[0]}: {row[1]} - {row[2]} ({row[3]})")
+            logger.info("Cultivos insertados o actualizados:")
+            for cultivo_key, codigo, nombre, clasificacion in rows:
+                logger.info(f"  {cultivo_key}: {codigo} - {nombre} ({clasificacion})")
             
             logger.info("✓ dim_cultivo inicializada exitosamente")
             
@@ -180,9 +177,7 @@ def init_dim_cultivo():
 
 def get_cultivo_mapping():
     """Retorna mapeo de códigos de cultivo a cultivo_key para uso en ETL."""
-    db = DatabaseConnection()
-    
-    with db.get_session() as session:
+    with db_connection.get_session() as session:
         from sqlalchemy import text
         result = session.execute(text("""
             SELECT codigo_cultivo, cultivo_key 
@@ -194,6 +189,12 @@ def get_cultivo_mapping():
         for row in result:
             mapping[row[0]] = row[1]
         
+        # En bases existentes el alias puede seguir con su propia fila en dim_cultivo;
+        # se respeta su cultivo_key para que hechos nuevos y viejos coincidan
+        for alias, canonico in CULTIVO_ALIASES.items():
+            if alias not in mapping and canonico in mapping:
+                mapping[alias] = mapping[canonico]
+        
         logger.info(f"Mapeo de cultivos obtenido: {mapping}")
         return mapping
 
@@ -5,6 +5,7 @@ Script para cargar datos de staging para los 4 tipos de beneficios desde Excel.
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -15,6 +16,7 @@ from loguru import logger
 from config.connections.database import db_connection
 
 # Importar extractores y loaders
+from src.extract.excel_workbook import open_workbook
 from src.extract.semillas_excel_extractor import SemillasExcelExtractor
 from src.extract.fertilizantes_excel_extractor import FertilizantesExcelExtractor
 from src.extract.plantas_excel_extractor import PlantasExcelExtractor
@@ -29,6 +31,126 @@ from src.load.mecanizacion_stg_load import MecanizacionStgLoader
 logger.remove()
 logger.add(sys.stdout, format="{time:HH:mm:ss} | {level} | {message}", level="INFO")
 
+STAGING_TABLES = [
+    ("Semillas", 'stg_semilla'),
+    ("Fertilizantes", 'stg_fertilizante'),
+    ("Plantas", 'stg_plantas'),
+    ("Mecanización", 'stg_mecanizacion')
+]
+
+# Todos los conteos de verificación en una sola consulta
+STAGING_COUNTS_SQL = "\nUNION ALL\n".join(
+    f"SELECT '{table}' AS tabla, COUNT(*) AS registros FROM \"etl-productivo\".{table}"
+    for _, table in STAGING_TABLES
+)
+
+# Filas por lote al cargar a staging
+BATCH_SIZE = 1000
+
+# Adaptadores por tipo: "extraer" lee su pestaña del workbook compartido (en el
+# hilo principal, una pestaña a la vez) y "cargar" usa el punto de entrada que
+# cada loader tiene realmente, retornando los registros cargados
+
+def extraer_semillas(workbook, excel_file):
+    """DataFrame de la pestaña SEMILLAS."""
+    return SemillasExcelExtractor(BATCH_SIZE).extract_from_workbook(workbook)
+
+def cargar_semillas(df):
+    """Trunca stg_semilla y carga el DataFrame por lotes con SemillasStgLoader.load_batch."""
+    extractor = SemillasExcelExtractor(BATCH_SIZE)
+    loader = SemillasStgLoader()
+    total = 0
+    with db_connection.get_session() as session:
+        loader.truncate_staging_table(session)
+        for start in range(0, len(df), BATCH_SIZE):
+            chunk = df.iloc[start:start + BATCH_SIZE]
+            # prepare_row mapea los headers del Excel a las columnas de staging
+            batch_data = [extractor.prepare_row(row) for _, row in chunk.iterrows()]
+            total += loader.load_batch(batch_data, session)
+    return total
+
+def extraer_fertilizantes(workbook, excel_file):
+    """Lotes de dicts de la pestaña FERTILIZANTES."""
+    return list(FertilizantesExcelExtractor(excel_file).extract_from_workbook(workbook, BATCH_SIZE))
+
+def cargar_fertilizantes(batches):
+    """Trunca stg_fertilizante y carga cada lote con load_batch_to_staging."""
+    loader = FertilizantesStgLoader()
+    loader.truncate_staging_table()
+    return _cargar_lotes(loader, batches)
+
+def extraer_plantas(workbook, excel_file):
+    """Objetos StgPlantas de la pestaña PLANTAS DE CACAO."""
+    return PlantasExcelExtractor(excel_file).extract_from_workbook(workbook)
+
+def cargar_plantas(records):
+    """Carga con PlantasStagingLoader.load, que limpia stg_plantas antes de insertar."""
+    stats = PlantasStagingLoader(BATCH_SIZE).load(records)
+    if stats['failed_records']:
+        raise RuntimeError(f"{stats['failed_records']:,} registros de plantas no se cargaron")
+    return stats['loaded_records']
+
+def extraer_mecanizacion(workbook, excel_file):
+    """Lotes de dicts de la pestaña MECANIZACIÓN."""
+    return list(MecanizacionExcelExtractor(excel_file).extract_from_workbook(workbook, BATCH_SIZE))
+
+def cargar_mecanizacion(batches):
+    """Trunca stg_mecanizacion y carga cada lote con load_batch_to_staging."""
+    loader = MecanizacionStgLoader()
+    loader.truncate_staging_table()
+    return _cargar_lotes(loader, batches)
+
+def _cargar_lotes(loader, batches):
+    """Carga lotes de dicts con load_batch_to_staging, confirmando cada lote."""
+    total = 0
+    with db_connection.get_session() as session:
+        for batch in batches:
+            total += loader.load_batch_to_staging(session, batch)
+            session.commit()
+    return total
+
+# (nombre, etiqueta para el log, extraer, cargar) de cada pipeline de staging
+PIPELINES = [
+    ("SEMILLAS", "semillas", extraer_semillas, cargar_semillas),
+    ("FERTILIZANTES", "fertilizantes", extraer_fertilizantes, cargar_fertilizantes),
+    ("PLANTAS", "plantas", extraer_plantas, cargar_plantas),
+    ("MECANIZACIÓN", "mecanización", extraer_mecanizacion, cargar_mecanizacion),
+]
+
+def extract_all(excel_file):
+    """
+    Lee la pestaña de cada tipo abriendo el Excel una sola vez.
+    
+    Las pestañas se leen una a la vez: el workbook read_only comparte un solo
+    ZipFile y no debe leerse desde varios hilos.
+    
+    Returns:
+        Dict {nombre: datos de su pestaña}; los tipos que fallaron no aparecen
+    """
+    data = {}
+    workbook = open_workbook(excel_file)
+    try:
+        for nombre, etiqueta, extraer, _ in PIPELINES:
+            logger.info(f"\n--- EXTRAYENDO {nombre} ---")
+            try:
+                data[nombre] = extraer(workbook, excel_file)
+            except Exception as e:
+                logger.error(f"❌ Error extrayendo {etiqueta}: {e}")
+    finally:
+        workbook.close()
+    return data
+
+def run_pipeline(nombre, etiqueta, cargar, datos):
+    """Carga un tipo de beneficio con sus propios datos; cada loader abre su propia sesión."""
+    logger.info(f"\n--- CARGANDO {nombre} ---")
+    try:
+        loaded = cargar(datos)
+        logger.info(f"✅ {etiqueta.capitalize()}: {loaded:,} registros cargados")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error en {etiqueta}: {e}")
+        return False
+
 def main():
     """Función principal."""
     logger.info("=== CARGANDO DATOS DE STAGING PARA LOS 4 TIPOS ===")
@@ -46,76 +168,19 @@ def main():
             return False
         logger.info("✅ Conexión a base de datos exitosa")
         
-        # Cargar datos de staging
-        success = True
-        
-        # 1. SEMILLAS
-        logger.info("\n--- CARGANDO SEMILLAS ---")
-        try:
-            extractor = SemillasExcelExtractor()
-            loader = SemillasStgLoader()
-            
-            # Extraer datos
-            df = extractor.extract(excel_file)
-            logger.info(f"Extraidos {len(df):,} registros de semillas")
-            
-            # Cargar a staging
-            result = loader.load_from_dataframe(df)
-            logger.info(f"✅ Semillas: {result.get('total_loaded', 0):,} registros cargados")
-        except Exception as e:
-            logger.error(f"❌ Error en semillas: {e}")
-            success = False
-        
-        # 2. FERTILIZANTES
-        logger.info("\n--- CARGANDO FERTILIZANTES ---")
-        try:
-            extractor = FertilizantesExcelExtractor()
-            loader = FertilizantesStgLoader()
-            
-            # Extraer datos
-            df = extractor.extract(excel_file)
-            logger.info(f"Extraidos {len(df):,} registros de fertilizantes")
-            
-            # Cargar a staging
-            result = loader.load_from_dataframe(df)
-            logger.info(f"✅ Fertilizantes: {result.get('total_loaded', 0):,} registros cargados")
-        except Exception as e:
-            logger.error(f"❌ Error en fertilizantes: {e}")
-            success = False
-        
-        # 3. PLANTAS
-        logger.info("\n--- CARGANDO PLANTAS ---")
-        try:
-            extractor = PlantasExcelExtractor()
-            loader = PlantasStagingLoader()
-            
-            # Extraer datos
-            df = extractor.extract(excel_file)
-            logger.info(f"Extraidos {len(df):,} registros de plantas")
-            
-            # Cargar a staging
-            result = loader.load_from_dataframe(df)
-            logger.info(f"✅ Plantas: {result.get('total_loaded', 0):,} registros cargados")
-        except Exception as e:
-            logger.error(f"❌ Error en plantas: {e}")
-            success = False
+        # Abrir el Excel una sola vez y separar los datos de cada pestaña
+        data = extract_all(excel_file)
+        success = len(data) == len(PIPELINES)
         
-        # 4. MECANIZACIÓN
-        logger.info("\n--- CARGANDO MECANIZACIÓN ---")
-        try:
-            extractor = MecanizacionExcelExtractor()
-            loader = MecanizacionStgLoader()
-            
-            # Extraer datos
-            df = extractor.extract(excel_file)
-            logger.info(f"Extraidos {len(df):,} registros de mecanización")
-            
-            # Cargar a staging
-            result = loader.load_from_dataframe(df)
-            logger.info(f"✅ Mecanización: {result.get('total_loaded', 0):,} registros cargados")
-        except Exception as e:
-            logger.error(f"❌ Error en mecanización: {e}")
-            success = False
+        # Cargar los tipos extraídos en paralelo: cada hilo recibe solo sus datos
+        # y escribe en su propia tabla de staging
+        with ThreadPoolExecutor(max_workers=len(PIPELINES)) as executor:
+            futures = [
+                executor.submit(run_pipeline, nombre, etiqueta, cargar, data[nombre])
+                for nombre, etiqueta, _, cargar in PIPELINES
+                if nombre in data
+            ]
+            success = all([future.result() for future in futures]) and success
         
         # Verificar resultados finales
         logger.info("\n--- VERIFICACIÓN FINAL DE STAGING ---")
@@ -134,26 +199,16 @@ def main():
 
 def verify_staging_data():
     """Verifica los datos cargados en staging."""
-    staging_tables = [
-        ("Semillas", 'stg_semilla'),
-        ("Fertilizantes", 'stg_fertilizante'),
-        ("Plantas", 'stg_plantas'),
-        ("Mecanización", 'stg_mecanizacion')
-    ]
-    
-    total_records = 0
+    try:
+        counts = dict(db_connection.execute_query(STAGING_COUNTS_SQL))
+    except Exception as e:
+        logger.warning(f"  Error consultando staging: {e}")
+        return
     
-    for name, table in staging_tables:
-        try:
-            query = f'SELECT COUNT(*) FROM "etl-productivo".{table}'
-            result = db_connection.execute_query(query)
-            count = result[0][0] if result else 0
-            total_records += count
-            logger.info(f"  {name}: {count:,} registros")
-        except Exception as e:
-            logger.warning(f"  Error consultando {name}: {e}")
+    for name, table in STAGING_TABLES:
+        logger.info(f"  {name}: {counts.get(table, 0):,} registros")
     
-    logger.info(f"  TOTAL STAGING: {total_records:,} registros")
+    logger.info(f"  TOTAL STAGING: {sum(counts.values()):,} registros")
 
 if __name__ == "__main__":
     success = main()
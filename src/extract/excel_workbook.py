@@ -0,0 +1,70 @@
+"""Utilidades compartidas para leer el Excel de beneficios con openpyxl."""
+from collections import defaultdict
+from typing import Any, List
+
+import openpyxl
+import pandas as pd
+
+
+def open_workbook(excel_path: str):
+    """
+    Abre el Excel en modo read_only (streaming fila a fila) y data_only.
+
+    data_only lee el valor calculado de las celdas con fórmula, igual que
+    pd.read_excel. Todos los extractores y scripts abren el archivo con estas
+    mismas opciones, compartan o no el workbook.
+    """
+    return openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+
+
+def dedup_columns(header) -> List[Any]:
+    """
+    Nombra las columnas como pd.read_excel: headers vacíos como "Unnamed: i" y
+    duplicados renombrados a "A.1", "A.2", ...
+    """
+    columns = [
+        value if value is not None else f"Unnamed: {index}"
+        for index, value in enumerate(header)
+    ]
+
+    counts = defaultdict(int)
+    for index, column in enumerate(columns):
+        count = counts[column]
+        while count > 0:
+            counts[column] = count + 1
+            column = f"{column}.{count}"
+            count = counts[column]
+        columns[index] = column
+        counts[column] = count + 1
+
+    return columns
+
+
+def _convert_cell(value):
+    """Igual que pd.read_excel: los float enteros (Excel guarda 3 como 3.0) pasan a int."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def sheet_to_dataframe(sheet) -> pd.DataFrame:
+    """
+    Arma un DataFrame desde una hoja de openpyxl (primera fila = headers).
+
+    Se recorre la hoja con iter_rows en lugar de pasar el workbook a
+    pd.read_excel, que cierra el workbook que recibe. Replica lo que hace
+    pd.read_excel con los headers, las filas vacías al final y los float enteros.
+    """
+    rows = sheet.iter_rows(values_only=True)
+    columns = dedup_columns(next(rows, ()))
+    width = len(columns)
+    data = [
+        tuple(_convert_cell(value) for value in row[:width]) + (None,) * (width - len(row))
+        for row in rows
+    ]
+
+    # Igual que pd.read_excel: descartar filas vacías al final de la hoja
+    while data and all(value is None for value in data[-1]):
+        data.pop()
+
+    return pd.DataFrame(data, columns=columns)
@@ -1,11 +1,12 @@
 """
 Extractor para datos de mecanización desde archivo Excel.
 """
-import openpyxl
 from datetime import datetime, date
 from typing import Iterator, List, Dict, Any, Optional
 from loguru import logger
 
+from src.extract.excel_workbook import open_workbook
+
 
 class MecanizacionExcelExtractor:
     """Extrae datos de mecanización desde archivo Excel."""
@@ -98,17 +99,36 @@ class MecanizacionExcelExtractor:
         Yields:
             Lista de diccionarios con los datos de cada lote
         """
-        logger.info(f"Extrayendo datos en lotes de {batch_size} registros")
+        # Cargar workbook en modo read_only: la hoja se parsea en streaming fila
+        # a fila en lugar de construir en memoria el árbol completo de celdas
+        workbook = open_workbook(self.excel_path)
+        try:
+            yield from self.extract_from_workbook(workbook, batch_size)
+        finally:
+            workbook.close()
+    
+    def extract_from_workbook(self, workbook, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Extrae datos en lotes desde un workbook ya abierto (no lo cierra).
+        
+        Permite abrir el Excel una sola vez y compartirlo entre extractores;
+        funciona también con workbooks abiertos en modo read_only.
         
-        # Cargar workbook
-        workbook = openpyxl.load_workbook(self.excel_path)
+        Args:
+            workbook: Workbook de openpyxl que contiene la pestaña
+            batch_size: Tamaño de lote
+            
+        Yields:
+            Lista de diccionarios con los datos de cada lote
+        """
+        logger.info(f"Extrayendo datos en lotes de {batch_size} registros")
         sheet = workbook[self.sheet_name]
         
         # Obtener headers
         headers = []
-        for cell in sheet[1]:
-            if cell.value is not None:
-                headers.append(str(cell.value).strip())
+        for value in next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ()):
+            if value is not None:
+                headers.append(str(value).strip())
             else:
                 break
         
@@ -118,14 +138,13 @@ class MecanizacionExcelExtractor:
         batch = []
         total_rows = 0
         
-        for row_num in range(2, sheet.max_row + 1):
+        # iter_rows recorre la hoja una vez (sheet.cell por celda es O(n) en read_only)
+        for row_values in sheet.iter_rows(min_row=2, max_col=len(headers), values_only=True):
             # Leer fila
             row_data = {}
             has_data = False
             
-            for col_num, header in enumerate(headers, 1):
-                cell_value = sheet.cell(row=row_num, column=col_num).value
-                
+            for header, cell_value in zip(headers, row_values):
                 if cell_value is not None and str(cell_value).strip():
                     has_data = True
                 
@@ -157,27 +176,18 @@ class MecanizacionExcelExtractor:
             logger.info(f"Enviando último lote con {len(batch)} registros (total procesadas: {total_rows} filas)")
             yield batch
         
-        workbook.close()
         logger.info(f"Extracción completada: {total_rows} registros totales")
     
     def get_total_rows(self) -> int:
         """Obtiene el total de filas con datos en el Excel."""
-        workbook = openpyxl.load_workbook(self.excel_path)
-        sheet = workbook[self.sheet_name]
-        
-        # Contar filas con datos (excluyendo header)
-        count = 0
-        for row_num in range(2, sheet.max_row + 1):
-            # Verificar si la fila tiene al menos un dato
-            has_data = False
-            for col_num in range(1, min(18, sheet.max_column + 1)):  # Máximo 17 columnas esperadas
-                cell_value = sheet.cell(row=row_num, column=col_num).value
-                if cell_value is not None and str(cell_value).strip():
-                    has_data = True
-                    break
+        workbook = open_workbook(self.excel_path)
+        try:
+            sheet = workbook[self.sheet_name]
             
-            if has_data:
-                count += 1
-        
-        workbook.close()
-        return count
\ No newline at end of file
+            # Contar filas con al menos un dato (excluyendo header); máximo 17 columnas esperadas
+            return sum(
+                1 for row_values in sheet.iter_rows(min_row=2, max_col=17, values_only=True)
+                if any(value is not None and str(value).strip() for value in row_values)
+            )
+        finally:
+            workbook.close()
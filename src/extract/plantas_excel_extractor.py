@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 from loguru import logger
 
+from src.extract.excel_workbook import sheet_to_dataframe
 from src.models.operational.staging.plantas_stg_model import StgPlantas
 
 
@@ -35,30 +36,54 @@ class PlantasExcelExtractor:
         try:
             # Leer Excel
             df = pd.read_excel(self.file_path, sheet_name=self.sheet_name)
-            logger.info(f"Excel leído: {len(df)} filas, {len(df.columns)} columnas")
+            return self._records_from_dataframe(df)
             
-            # Limpiar datos vacíos
-            df = df.dropna(how='all')
-            logger.info(f"Después de limpiar filas vacías: {len(df)} filas")
-            
-            # Convertir a objetos StgPlantas
-            plantas_records = []
-            
-            for index, row in df.iterrows():
-                try:
-                    plantas_record = self._row_to_staging_record(row)
-                    plantas_records.append(plantas_record)
-                except Exception as e:
-                    logger.error(f"Error procesando fila {index}: {str(e)}")
-                    continue
+        except Exception as e:
+            logger.error(f"Error durante la extracción: {str(e)}")
+            raise
+    
+    def extract_from_workbook(self, workbook) -> List[StgPlantas]:
+        """
+        Extrae datos de un workbook de openpyxl ya abierto (no lo cierra).
+        
+        Args:
+            workbook: Workbook de openpyxl que contiene la pestaña
             
-            logger.info(f"Extracción completada: {len(plantas_records)} registros válidos")
-            return plantas_records
+        Returns:
+            Lista de objetos StgPlantas
+        """
+        logger.info(f"Extrayendo datos de workbook abierto, pestaña: {self.sheet_name}")
+        
+        try:
+            df = sheet_to_dataframe(workbook[self.sheet_name])
+            return self._records_from_dataframe(df)
             
         except Exception as e:
             logger.error(f"Error durante la extracción: {str(e)}")
             raise
     
+    def _records_from_dataframe(self, df: pd.DataFrame) -> List[StgPlantas]:
+        """Convierte la pestaña leída en objetos StgPlantas."""
+        logger.info(f"Excel leído: {len(df)} filas, {len(df.columns)} columnas")
+        
+        # Limpiar datos vacíos
+        df = df.dropna(how='all')
+        logger.info(f"Después de limpiar filas vacías: {len(df)} filas")
+        
+        # Convertir a objetos StgPlantas
+        plantas_records = []
+        
+        for index, row in df.iterrows():
+            try:
+                plantas_record = self._row_to_staging_record(row)
+                plantas_records.append(plantas_record)
+            except Exception as e:
+                logger.error(f"Error procesando fila {index}: {str(e)}")
+                continue
+        
+        logger.info(f"Extracción completada: {len(plantas_records)} registros válidos")
+        return plantas_records
+    
     def _row_to_staging_record(self, row) -> StgPlantas:
         """
         Convierte una fila del DataFrame a un objeto StgPlantas.
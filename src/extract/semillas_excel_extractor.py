@@ -4,6 +4,8 @@ from typing import Iterator, Dict, Any
 from datetime import datetime
 from loguru import logger
 
+from src.extract.excel_workbook import sheet_to_dataframe
+
 
 class SemillasExcelExtractor:
     """Extrae datos de la pestaña SEMILLAS del archivo Excel."""
@@ -50,6 +52,20 @@ class SemillasExcelExtractor:
             logger.error(f"Error extrayendo Excel: {str(e)}")
             raise
             
+    def extract_from_workbook(self, workbook) -> pd.DataFrame:
+        """Lee la pestaña SEMILLAS de un workbook de openpyxl ya abierto (no lo cierra)."""
+        logger.info("Extrayendo datos de workbook abierto, pestaña: SEMILLAS")
+        
+        try:
+            df = sheet_to_dataframe(workbook['SEMILLAS'])
+            self.total_rows = len(df)
+            logger.info(f"Total de registros extraidos: {self.total_rows}")
+            return df
+            
+        except Exception as e:
+            logger.error(f"Error extrayendo Excel: {str(e)}")
+            raise
+            
     def extract_batches(self, excel_path: str) -> Iterator[pd.DataFrame]:
         """Lee el Excel en lotes para procesamiento eficiente."""
         logger.info(f"Extrayendo datos en lotes de {self.batch_size} registros")
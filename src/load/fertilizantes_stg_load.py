@@ -1,6 +1,8 @@
 """
 Loader para cargar datos de fertilizantes a staging desde Excel.
 """
+import csv
+import io
 from typing import List, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -11,6 +13,24 @@ from src.models.operational.staging.fertilizantes_stg_model import StgFertilizan
 from src.extract.fertilizantes_excel_extractor import FertilizantesExcelExtractor
 
 
+# Columnas que se cargan vía COPY (id y timestamps los asigna la base de datos)
+STG_FERTILIZANTE_COLUMNS = [
+    column.name for column in StgFertilizante.__table__.columns
+    if column.name not in ('id', 'created_at', 'updated_at')
+]
+
+# Defaults del lado de Python (p. ej. processed=False) que COPY no aplica por sí solo
+STG_FERTILIZANTE_DEFAULTS = {
+    column.name: column.default.arg for column in StgFertilizante.__table__.columns
+    if column.default is not None and column.default.is_scalar
+}
+
+COPY_STG_FERTILIZANTE_SQL = (
+    'COPY "etl-productivo".stg_fertilizante ({}) FROM STDIN '
+    "WITH (FORMAT csv, NULL '\\N')".format(', '.join(STG_FERTILIZANTE_COLUMNS))
+)
+
+
 class FertilizantesStgLoader:
     """Carga datos de fertilizantes desde Excel a staging."""
     
@@ -42,45 +62,59 @@ class FertilizantesStgLoader:
         Returns:
             Número de registros insertados
         """
-        inserted_count = 0
+        records = []
         
         for row_data in batch_data:
             try:
-                # Crear objeto StgFertilizante
-                stg_record = StgFertilizante(
-                    fecha_entrega=row_data.get('fecha_entrega'),
-                    asociaciones=row_data.get('asociaciones'),
-                    nombres_apellidos=row_data.get('nombres_apellidos'),
-                    cedula=row_data.get('cedula'),
-                    telefono=row_data.get('telefono'),
-                    genero=row_data.get('genero'),
-                    edad=row_data.get('edad'),
-                    canton=row_data.get('canton'),
-                    parroquia=row_data.get('parroquia'),
-                    recinto=row_data.get('recinto'),
-                    coord_x=row_data.get('coord_x'),
-                    coord_y=row_data.get('coord_y'),
-                    hectareas=row_data.get('hectareas'),
-                    fertilizante_nitrogenado=row_data.get('fertilizante_nitrogenado'),
-                    npk_elementos_menores=row_data.get('npk_elementos_menores'),
-                    organico_foliar=row_data.get('organico_foliar'),
-                    cultivo=row_data.get('cultivo'),
-                    precio_kit=row_data.get('precio_kit'),
-                    lugar_entrega=row_data.get('lugar_entrega'),
-                    observacion=row_data.get('observacion'),
-                    anio=row_data.get('anio', 2024)  # Default a 2024 si no viene
-                )
-                
-                session.add(stg_record)
-                inserted_count += 1
+                # Registro como dict: se inserta en bloque, sin objetos ORM
+                records.append({
+                    'fecha_entrega': row_data.get('fecha_entrega'),
+                    'asociaciones': row_data.get('asociaciones'),
+                    'nombres_apellidos': row_data.get('nombres_apellidos'),
+                    'cedula': row_data.get('cedula'),
+                    'telefono': row_data.get('telefono'),
+                    'genero': row_data.get('genero'),
+                    'edad': row_data.get('edad'),
+                    'canton': row_data.get('canton'),
+                    'parroquia': row_data.get('parroquia'),
+                    'recinto': row_data.get('recinto'),
+                    'coord_x': row_data.get('coord_x'),
+                    'coord_y': row_data.get('coord_y'),
+                    'hectareas': row_data.get('hectareas'),
+                    'fertilizante_nitrogenado': row_data.get('fertilizante_nitrogenado'),
+                    'npk_elementos_menores': row_data.get('npk_elementos_menores'),
+                    'organico_foliar': row_data.get('organico_foliar'),
+                    'cultivo': row_data.get('cultivo'),
+                    'precio_kit': row_data.get('precio_kit'),
+                    'lugar_entrega': row_data.get('lugar_entrega'),
+                    'observacion': row_data.get('observacion'),
+                    'anio': row_data.get('anio', 2024)  # Default a 2024 si no viene
+                })
                 
             except Exception as e:
-                logger.error(f"Error insertando registro: {str(e)}")
+                logger.error(f"Error preparando registro: {str(e)}")
                 logger.error(f"Datos del registro: {row_data}")
                 # Continuar con el siguiente registro
                 continue
         
-        return inserted_count
+        if records:
+            # Un solo COPY FROM STDIN dentro de la transacción de la sesión
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for record in records:
+                values = {**STG_FERTILIZANTE_DEFAULTS, **record}
+                writer.writerow([
+                    '\\N' if values.get(column) is None else values[column]
+                    for column in STG_FERTILIZANTE_COLUMNS
+                ])
+            buffer.seek(0)
+            cursor = session.connection().connection.cursor()
+            try:
+                cursor.copy_expert(COPY_STG_FERTILIZANTE_SQL, buffer)
+            finally:
+                cursor.close()
+        
+        return len(records)
     
     def load_excel_to_staging(self, excel_path: str, batch_size: int = 1000) -> Dict[str, Any]:
         """
@@ -1,6 +1,8 @@
 """
 Loader para cargar datos de mecanización a staging desde Excel.
 """
+import csv
+import io
 from typing import List, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -11,6 +13,24 @@ from src.models.operational.staging.mecanizacion_stg_model import StgMecanizacio
 from src.extract.mecanizacion_excel_extractor import MecanizacionExcelExtractor
 
 
+# Columnas que se cargan vía COPY (id y timestamps los asigna la base de datos)
+STG_MECANIZACION_COLUMNS = [
+    column.name for column in StgMecanizacion.__table__.columns
+    if column.name not in ('id', 'created_at', 'updated_at')
+]
+
+# Defaults del lado de Python (p. ej. processed=False) que COPY no aplica por sí solo
+STG_MECANIZACION_DEFAULTS = {
+    column.name: column.default.arg for column in StgMecanizacion.__table__.columns
+    if column.default is not None and column.default.is_scalar
+}
+
+COPY_STG_MECANIZACION_SQL = (
+    'COPY "etl-productivo".stg_mecanizacion ({}) FROM STDIN '
+    "WITH (FORMAT csv, NULL '\\N')".format(', '.join(STG_MECANIZACION_COLUMNS))
+)
+
+
 class MecanizacionStgLoader:
     """Carga datos de mecanización desde Excel a staging."""
     
@@ -42,41 +62,55 @@ class MecanizacionStgLoader:
         Returns:
             Número de registros insertados
         """
-        inserted_count = 0
+        records = []
         
         for row_data in batch_data:
             try:
-                # Crear objeto StgMecanizacion
-                stg_record = StgMecanizacion(
-                    nombres_apellidos=row_data.get('nombres_apellidos'),
-                    cedula=row_data.get('cedula'),
-                    telefono=row_data.get('telefono'),
-                    genero=row_data.get('genero'),
-                    edad=row_data.get('edad'),
-                    canton=row_data.get('canton'),
-                    agrupacion=row_data.get('agrupacion'),
-                    recinto=row_data.get('recinto'),
-                    coord_x=row_data.get('coord_x'),
-                    coord_y=row_data.get('coord_y'),
-                    hectareas_beneficiadas=row_data.get('hectareas_beneficiadas'),
-                    cultivo=row_data.get('cultivo'),
-                    estado=row_data.get('estado'),
-                    comentario=row_data.get('comentario'),
-                    cu_ha=row_data.get('cu_ha'),
-                    inversion=row_data.get('inversion'),
-                    anio=row_data.get('anio', 2024)  # Default a 2024 si no viene
-                )
-                
-                session.add(stg_record)
-                inserted_count += 1
+                # Registro como dict: se inserta en bloque, sin objetos ORM
+                records.append({
+                    'nombres_apellidos': row_data.get('nombres_apellidos'),
+                    'cedula': row_data.get('cedula'),
+                    'telefono': row_data.get('telefono'),
+                    'genero': row_data.get('genero'),
+                    'edad': row_data.get('edad'),
+                    'canton': row_data.get('canton'),
+                    'agrupacion': row_data.get('agrupacion'),
+                    'recinto': row_data.get('recinto'),
+                    'coord_x': row_data.get('coord_x'),
+                    'coord_y': row_data.get('coord_y'),
+                    'hectareas_beneficiadas': row_data.get('hectareas_beneficiadas'),
+                    'cultivo': row_data.get('cultivo'),
+                    'estado': row_data.get('estado'),
+                    'comentario': row_data.get('comentario'),
+                    'cu_ha': row_data.get('cu_ha'),
+                    'inversion': row_data.get('inversion'),
+                    'anio': row_data.get('anio', 2024)  # Default a 2024 si no viene
+                })
                 
             except Exception as e:
-                logger.error(f"Error insertando registro: {str(e)}")
+                logger.error(f"Error preparando registro: {str(e)}")
                 logger.error(f"Datos del registro: {row_data}")
                 # Continuar con el siguiente registro
                 continue
         
-        return inserted_count
+        if records:
+            # Un solo COPY FROM STDIN dentro de la transacción de la sesión
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for record in records:
+                values = {**STG_MECANIZACION_DEFAULTS, **record}
+                writer.writerow([
+                    '\\N' if values.get(column) is None else values[column]
+                    for column in STG_MECANIZACION_COLUMNS
+                ])
+            buffer.seek(0)
+            cursor = session.connection().connection.cursor()
+            try:
+                cursor.copy_expert(COPY_STG_MECANIZACION_SQL, buffer)
+            finally:
+                cursor.close()
+        
+        return len(records)
     
     def load_excel_to_staging(self, excel_path: str, batch_size: int = 1000) -> Dict[str, Any]:
         """
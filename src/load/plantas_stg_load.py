@@ -2,6 +2,7 @@
 Loader para datos de plantas de cacao a la tabla staging.
 """
 from typing import List
+from sqlalchemy import insert, inspect
 from sqlalchemy.orm import Session
 from loguru import logger
 
@@ -9,6 +10,11 @@ from config.connections.database import db_connection
 from src.models.operational.staging.plantas_stg_model import StgPlantas
 
 
+# Construido una vez: SQLAlchemy reutiliza su forma compilada (compiled_cache)
+# en cada lote en lugar de armar y compilar un INSERT nuevo
+INSERT_STG_PLANTAS = insert(StgPlantas)
+
+
 class PlantasStagingLoader:
     """Carga datos de plantas de cacao en la tabla staging."""
     
@@ -50,8 +56,8 @@ class PlantasStagingLoader:
                     batch = plantas_records[i:i + self.batch_size]
                     
                     try:
-                        # Insertar lote
-                        session.add_all(batch)
+                        # Insertar lote como dicts en un executemany, sin unit of work
+                        session.execute(INSERT_STG_PLANTAS, self._to_records(batch))
                         session.commit()
                         
                         stats['loaded_records'] += len(batch)
@@ -74,6 +80,15 @@ class PlantasStagingLoader:
         
         return stats
     
+    @staticmethod
+    def _to_records(batch: List[StgPlantas]) -> List[dict]:
+        """Convierte objetos StgPlantas transitorios en dicts con sus columnas asignadas."""
+        columns = {attr.key for attr in inspect(StgPlantas).column_attrs}
+        return [
+            {key: value for key, value in vars(record).items() if key in columns}
+            for record in batch
+        ]
+    
     def _truncate_staging_table(self, session: Session):
         """Limpia la tabla staging antes de cargar nuevos datos."""
         try:
@@ -1,4 +1,6 @@
 """Loader para cargar datos a la tabla staging."""
+import csv
+import io
 import pandas as pd
 from datetime import datetime
 from typing import Tuple, List, Dict, Any
@@ -10,6 +12,24 @@ from config.connections.database import db_connection
 from src.models.operational.staging.semillas_stg_model import StgSemilla
 
 
+# Columnas que se cargan vía COPY (id y timestamps los asigna la base de datos)
+STG_SEMILLA_COLUMNS = [
+    column.name for column in StgSemilla.__table__.columns
+    if column.name not in ('id', 'created_at', 'updated_at')
+]
+
+# Defaults del lado de Python (p. ej. processed=False) que COPY no aplica por sí solo
+STG_SEMILLA_DEFAULTS = {
+    column.name: column.default.arg for column in StgSemilla.__table__.columns
+    if column.default is not None and column.default.is_scalar
+}
+
+COPY_STG_SEMILLA_SQL = (
+    'COPY "etl-productivo".stg_semilla ({}) FROM STDIN '
+    "WITH (FORMAT csv, NULL '\\N')".format(', '.join(STG_SEMILLA_COLUMNS))
+)
+
+
 class SemillasStgLoader:
     """Carga datos a la tabla staging de semillas."""
     
@@ -30,29 +50,42 @@ class SemillasStgLoader:
             raise
     
     def load_batch(self, batch_data: List[Dict[str, Any]], session: Session) -> int:
-        """Carga un lote de datos a staging."""
-        batch_records = []
+        """Carga un lote de datos a staging usando COPY FROM STDIN."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        loaded = 0
         
         for data in batch_data:
-            try:
-                record = StgSemilla(**data)
-                batch_records.append(record)
-            except Exception as e:
+            unknown = set(data) - set(STG_SEMILLA_COLUMNS)
+            if unknown:
                 self.error_count += 1
-                error_msg = f"Error creando registro: {str(e)}"
+                error_msg = f"Error creando registro: campos desconocidos {sorted(unknown)}"
                 self.errors.append(error_msg)
                 logger.error(error_msg)
+                continue
+            
+            values = {**STG_SEMILLA_DEFAULTS, **data}
+            writer.writerow([
+                '\\N' if values.get(column) is None else values[column]
+                for column in STG_SEMILLA_COLUMNS
+            ])
+            loaded += 1
         
-        # Insertar lote
-        if batch_records:
+        # Insertar lote en una sola operación COPY dentro de la transacción de la sesión
+        if loaded:
             try:
-                session.bulk_save_objects(batch_records)
+                buffer.seek(0)
+                cursor = session.connection().connection.cursor()
+                try:
+                    cursor.copy_expert(COPY_STG_SEMILLA_SQL, buffer)
+                finally:
+                    cursor.close()
                 session.commit()
-                return len(batch_records)
+                return loaded
             except Exception as e:
                 session.rollback()
                 logger.error(f"Error insertando lote: {str(e)}")
-                self.error_count += len(batch_records)
+                self.error_count += loaded
                 raise
                 
         return 0
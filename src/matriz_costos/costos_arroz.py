@@ -3,9 +3,12 @@
 Matriz de costos de produccion de arroz por hectarea.
 Basado en la matriz de costos de AGRIPAC para el sistema semi-tecnificado.
 """
-from typing import Dict, List, Any
+import copy
+from typing import Dict, FrozenSet, List, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from functools import cache
+import numpy as np
 import pandas as pd
 
 
@@ -25,9 +28,9 @@ class CategoriaInsumo(Enum):
     ADMINISTRATIVO = "ADMINISTRATIVO"
 
 
-@dataclass
+@dataclass(frozen=True)
 class ItemCosto:
-    """Representa un item individual de costo en la matriz."""
+    """Representa un item individual de costo en la matriz (inmutable)."""
     concepto: str
     cantidad: float
     unidad: str
@@ -42,13 +45,31 @@ class ItemCosto:
         return self.cantidad * self.precio_unitario
 
 
+# Codigo entero de cada categoria, para agregar con np.bincount
+_CATEGORIAS = list(CategoriaInsumo)
+_CODIGO_CATEGORIA = {categoria: codigo for codigo, categoria in enumerate(_CATEGORIAS)}
+
+
 class MatrizCostosArroz:
     """Matriz de costos de produccion de arroz por hectarea."""
     
     def __init__(self):
         """Inicializa la matriz con todos los costos."""
-        self.items_costo: List[ItemCosto] = []
+        self._items_costo: List[ItemCosto] = []
         self._inicializar_costos()
+        # Los items no cambian tras __init__: tupla de ItemCosto inmutables
+        self._items_costo = tuple(self._items_costo)
+        
+        # Resultados de aplicar_subsidios_gad por (programa, rendimiento_sacas, precio_saca)
+        self._cache_subsidios: Dict[Tuple[FrozenSet[Tuple[CategoriaInsumo, float]], float, float], Dict[str, Any]] = {}
+        
+        # Columnas (codigo de categoria, costo total) para agregaciones vectorizadas
+        self._codigos_categoria = np.array(
+            [_CODIGO_CATEGORIA[item.categoria] for item in self.items_costo], dtype=np.intp
+        )
+        self._costos_totales = np.array(
+            [item.costo_total for item in self.items_costo], dtype=np.float64
+        )
         
         # Parametros de produccion
         self.rendimiento_sacas = 60
@@ -72,7 +93,7 @@ class MatrizCostosArroz:
         ]
         
         for concepto, cantidad, unidad, precio in mano_obra_items:
-            self.items_costo.append(ItemCosto(
+            self._items_costo.append(ItemCosto(
                 concepto=concepto,
                 cantidad=cantidad,
                 unidad=unidad,
@@ -83,7 +104,7 @@ class MatrizCostosArroz:
             ))
         
         # SEMILLA - Subsidiable
-        self.items_costo.append(ItemCosto(
+        self._items_costo.append(ItemCosto(
             concepto="SEMILLA SFL-011",
             cantidad=2,
             unidad="Quintal",
@@ -100,7 +121,7 @@ class MatrizCostosArroz:
         ]
         
         for concepto, cantidad, unidad, precio in fertilizantes_items:
-            self.items_costo.append(ItemCosto(
+            self._items_costo.append(ItemCosto(
                 concepto=concepto,
                 cantidad=cantidad,
                 unidad=unidad,
@@ -122,7 +143,7 @@ class MatrizCostosArroz:
         ]
         
         for concepto, cantidad, unidad, precio in fitosanitarios_items:
-            self.items_costo.append(ItemCosto(
+            self._items_costo.append(ItemCosto(
                 concepto=concepto,
                 cantidad=cantidad,
                 unidad=unidad,
@@ -145,7 +166,7 @@ class MatrizCostosArroz:
         ]
         
         for concepto, cantidad, unidad, precio in maquinaria_items:
-            self.items_costo.append(ItemCosto(
+            self._items_costo.append(ItemCosto(
                 concepto=concepto,
                 cantidad=cantidad,
                 unidad=unidad,
@@ -163,7 +184,7 @@ class MatrizCostosArroz:
         ]
         
         for concepto, monto in costos_indirectos:
-            self.items_costo.append(ItemCosto(
+            self._items_costo.append(ItemCosto(
                 concepto=concepto,
                 cantidad=1,
                 unidad="Ha",
@@ -173,6 +194,11 @@ class MatrizCostosArroz:
                 subsidiable=False
             ))
     
+    @property
+    def items_costo(self) -> Tuple[ItemCosto, ...]:
+        """Items de costo de la matriz (solo lectura)."""
+        return self._items_costo
+    
     def obtener_costos_directos(self) -> List[ItemCosto]:
         """Retorna solo los costos directos."""
         return [item for item in self.items_costo if item.tipo_costo == TipoCosto.DIRECTO]
@@ -197,15 +223,20 @@ class MatrizCostosArroz:
         """Calcula el costo total de produccion."""
         return sum(item.costo_total for item in self.items_costo)
     
+    def sumar_por_categoria(self) -> Dict[CategoriaInsumo, float]:
+        """Suma el costo total por categoria (0.0 si no tiene items) en una sola pasada."""
+        totales = np.bincount(
+            self._codigos_categoria, weights=self._costos_totales, minlength=len(_CATEGORIAS)
+        )
+        return dict(zip(_CATEGORIAS, totales.tolist()))
+    
     def obtener_resumen_por_categoria(self) -> Dict[CategoriaInsumo, float]:
         """Retorna un resumen de costos por categoria."""
-        resumen = {}
-        for categoria in CategoriaInsumo:
-            total = sum(item.costo_total for item in self.items_costo 
-                       if item.categoria == categoria)
-            if total > 0:
-                resumen[categoria] = total
-        return resumen
+        return {
+            categoria: total
+            for categoria, total in self.sumar_por_categoria().items()
+            if total > 0
+        }
     
     def calcular_costos_indirectos_dinamicos(self, costos_directos_base: float) -> float:
         """
@@ -232,8 +263,22 @@ class MatrizCostosArroz:
                               (ej: {CategoriaInsumo.SEMILLA: 1.0, CategoriaInsumo.FERTILIZANTE: 0.5})
         
         Returns:
-            Dict con informacion detallada de costos originales, ahorros y costos finales
+            Dict con informacion detallada de costos originales, ahorros y costos finales.
+            El calculo se cachea por programa; cada llamada retorna una copia.
         """
+        programa = frozenset(programa_subsidios.items())
+        # Los items son inmutables; los parametros de produccion son atributos
+        # publicos reasignables, asi que forman parte de la clave
+        clave = (programa, self.rendimiento_sacas, self.precio_saca)
+        if clave not in self._cache_subsidios:
+            self._cache_subsidios[clave] = self._aplicar_subsidios_gad(programa)
+        return copy.deepcopy(self._cache_subsidios[clave])
+    
+    def _aplicar_subsidios_gad(
+        self, programa: FrozenSet[Tuple[CategoriaInsumo, float]]
+    ) -> Dict[str, Any]:
+        """Calculo de aplicar_subsidios_gad para un programa."""
+        programa_subsidios = dict(programa)
         costos_originales = {
             'directos': self.calcular_total_costos_directos(),
             'indirectos': self.calcular_total_costos_indirectos(),
@@ -388,6 +433,18 @@ class CalculadoraSubsidiosGAD:
         }
 
 
+@cache
+def get_matriz() -> MatrizCostosArroz:
+    """
+    Retorna una matriz compartida por todo el proceso (se construye una sola vez).
+    
+    La instancia es compartida (origen_ahorro_productores calcula con ella
+    AHORRO_POR_HECTAREA al importarse): no modificar sus atributos. Para otros
+    parametros de produccion crear una MatrizCostosArroz propia.
+    """
+    return MatrizCostosArroz()
+
+
 # Funcion de utilidad para crear y validar la matriz
 def crear_matriz_arroz() -> MatrizCostosArroz:
     """
@@ -1,11 +1,20 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, Index, text
 from sqlalchemy.sql import func
 from src.models.base import Base
 
 
 class DimPersona(Base):
     __tablename__ = 'dim_persona'
-    __table_args__ = {'schema': 'etl-productivo'}
+    __table_args__ = (
+        # Índices parciales para los conteos de calidad de datos (index-only scan)
+        Index('idx_dim_persona_cedula_ok', 'persona_key',
+              postgresql_where=text("cedula IS NOT NULL AND cedula <> ''")),
+        Index('idx_dim_persona_telefono_ok', 'persona_key',
+              postgresql_where=text("telefono IS NOT NULL AND telefono <> ''")),
+        Index('idx_dim_persona_genero_ok', 'persona_key',
+              postgresql_where=text("genero NOT IN ('NO ESPECIFICADO', '')")),
+        {'schema': 'etl-productivo'}
+    )
     
     persona_key = Column(Integer, primary_key=True, autoincrement=True)
     persona_id = Column(Integer, nullable=False, unique=True)
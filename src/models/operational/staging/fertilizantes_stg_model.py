@@ -1,5 +1,5 @@
 """Modelo de staging para fertilizantes actualizado para Excel."""
-from sqlalchemy import Column, Integer, String, DECIMAL, Date, Text, Boolean
+from sqlalchemy import Index, func, true, Column, Integer, String, DECIMAL, Date, Text, Boolean
 from src.models.operational.staging.base_stg import StagingBase, TimestampMixin
 
 
@@ -38,4 +38,13 @@ class StgFertilizante(StagingBase, TimestampMixin):
     error_message = Column(Text)
     
     def __repr__(self):
-        return f"<StgFertilizante(id={self.id}, nombres='{self.nombres_apellidos}', cultivo='{self.cultivo}')>"
\ No newline at end of file
+        return f"<StgFertilizante(id={self.id}, nombres='{self.nombres_apellidos}', cultivo='{self.cultivo}')>"
+
+
+# Índice de expresión para los filtros UPPER(TRIM(cultivo)) = '...' de los
+# scripts de análisis, que solo leen registros ya procesados
+Index(
+    'ix_stg_fertilizante_cultivo_upper',
+    func.upper(func.trim(StgFertilizante.cultivo)),
+    postgresql_where=StgFertilizante.processed == true()
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, Date, Boolean, Text
+from sqlalchemy import Index, func, true, Column, Integer, String, DECIMAL, Date, Boolean, Text
 from src.models.operational.staging.base_stg import StagingBase, TimestampMixin
 
 
@@ -51,4 +51,13 @@ class StgSemilla(StagingBase, TimestampMixin):
     error_message = Column(Text)
     
     def __repr__(self):
-        return f"<StgSemilla(id={self.id}, numero_acta='{self.numero_acta}', beneficiario='{self.nombres_apellidos}')>"
\ No newline at end of file
+        return f"<StgSemilla(id={self.id}, numero_acta='{self.numero_acta}', beneficiario='{self.nombres_apellidos}')>"
+
+
+# Índice de expresión para los filtros UPPER(TRIM(cultivo)) = '...' de los
+# scripts de análisis, que solo leen registros ya procesados
+Index(
+    'ix_stg_semilla_cultivo_upper',
+    func.upper(func.trim(StgSemilla.cultivo)),
+    postgresql_where=StgSemilla.processed == true()
+)